@@ -1,61 +1,160 @@
 import threading
 import time
 import hashlib
-import hmac
-import base64
-import json
-from typing import Any, Dict, Optional, Callable
-import requests
-
-import asyncio
-from websockets.client import WebSocketClientProtocol # type: ignore
-import websockets
-import ssl
-import os
+import contextvars
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, List, NamedTuple, Optional, Callable,
+    Sequence, Set, Tuple
+)
+
 import logging
 
-import urllib3
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from transport import HTTPTransport, AsyncHTTPTransport
+from rate_limit import RateLimiter, Priority
+from errors import APIError, AuthError, DeadlineExceeded, error_for_status
+from resilience import CircuitBreakers, RetryPolicy
+from singleflight import SingleFlight, flight_key
+from clock_sync import ClockSync
+from signing import Signer
+from subscriptions import MAX_SYMBOLS_PER_MESSAGE, chunked
+from ws_dispatch import Dispatcher, Overflow, WSMessage
+from response_cache import ResponseCache
+from codec import Codec, default_codec
+from models import TERMINAL_STATUSES, page_items
+from session import SessionKeeper, jwt_expiry
+from token_store import DEFAULT_TOKEN_FILE, TokenStore
+from log_setup import log_policy
 
-logging.basicConfig(
-    filename='logs.log',          
-    filemode='w',                       
-    level=logging.INFO,
-    format='%(asctime)s %(name)s %(levelname)s: %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+# asyncio, websockets, ssl ve concurrent.futures yalnizca AsyncAPI/WebSocket kullanilinca yuklenir;
+# senkron API'yi import etmek bu modullerin maliyetini odemez.
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Future, ThreadPoolExecutor
+    from websockets.client import WebSocketClientProtocol  # type: ignore
 
+# Loglama import sirasinda yapilandirilmaz; uygulama log_setup.configure_logging() cagirir
 logger = logging.getLogger("api_client")
+logger.addHandler(logging.NullHandler())
+
+# request_options() ile verilen, o anki thread/task'a ozel istek ayarlari
+_REQUEST_OPTIONS: contextvars.ContextVar[Dict[str, Any]] = \
+    contextvars.ContextVar("request_options", default={})
+
+
+class Call(NamedTuple):
+    """batch() icin tek bir endpoint cagrisi: Call("get_cash_balance", (123,))."""
+    method: str
+    args: Tuple[Any, ...] = ()
+    kwargs: Optional[Dict[str, Any]] = None
+
 
-class API:
+class BatchResult(NamedTuple):
+    """batch() sonucunda her cagri icin deger ya da hata."""
+    value: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class CancelResult(NamedTuple):
+    """cancel_all() sonucunda tek bir emrin iptal sonucu."""
+    market: str                        # "stock" | "future"
+    order_ref: str
+    order: Dict[str, Any]              # listelemede gorulen hali
+    value: Any = None                  # silme yaniti
+    error: Optional[BaseException] = None
+    latency: float = 0.0               # silme isteginin suresi (sn)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class CancelReport:
     """
-    Singleton HMAC‐imzali REST API istemcisi.
+    cancel_all() raporu.
+
+      results     : Iptal istegi gonderilen her emir icin CancelResult
+      list_errors : Listelenemeyen piyasa → hata ("stock" / "future")
+      scanned     : Listelemede gorulen emir sayisi (acik olmayanlar dahil)
+      elapsed     : Listeleme + tum silmelerin toplam suresi (sn)
     """
-    TOKEN_FILE = "api_settings.json"
-    _instance: Optional["API"] = None
-    _lock = threading.Lock()
-    
-    @classmethod
-    def get_api(
-        cls,
-        *,
-        api_url: str,
-        api_key: str,
-        secret_key: str,
-        verbose: bool = True
-    ) -> "API":
-        """
-        Tekil API nesnesini doner. İlk cagrida api_url, api_key, secret_key zorunludur.
-        """
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = cls(
-                    api_url=api_url,
-                    api_key=api_key,
-                    secret_key=secret_key,
-                    verbose=verbose
-                )
-            return cls._instance
+
+    def __init__(self):
+        self.results: List[CancelResult] = []
+        self.list_errors: Dict[str, BaseException] = {}
+        self.scanned = 0
+        self.elapsed = 0.0
+
+    @property
+    def cancelled(self) -> List[CancelResult]:
+        return [r for r in self.results if r.ok]
+
+    @property
+    def failed(self) -> List[CancelResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def complete(self) -> bool:
+        """Tum piyasalar listelendi ve her iptal basarili oldu mu?"""
+        return not self.list_errors and all(r.ok for r in self.results)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "scanned":     self.scanned,
+            "sent":        len(self.results),
+            "cancelled":   len(self.cancelled),
+            "failed":      len(self.failed),
+            "list_errors": {m: str(e) for m, e in self.list_errors.items()},
+            "elapsed":     self.elapsed,
+        }
+
+    def __repr__(self) -> str:
+        return f"CancelReport({self.summary()})"
+
+
+# API(validate=...) secenekleri: kaydedilmis token'in sunucuda ne zaman dogrulanacagi
+VALIDATE_MODES = ("sync", "background", "lazy")
+
+# Basarili olunca ilgili portfoyun onbellegini gecersiz kilan yazma endpoint'leri
+_WRITE_SUFFIXES = ("CreateOrder", "ReplaceOrder", "DeleteOrder")
+
+
+# cancel_all() icin iptal edilecek bir sey kalmamis emir durumlari
+_NOT_CANCELLABLE = TERMINAL_STATUSES | {"CANCEL_REQUESTED"}
+
+# cancel_all(): vadeli emir listesinde yalnizca bekleyen emirler istenir
+_OPEN_FUTURE_FILTERS: Dict[str, Any] = {
+    **dict.fromkeys((
+        "order_validity_date", "contract_code", "contract_type", "long_short",
+        "untransmitted_orders", "partially_executed_orders", "cancelled_orders",
+        "after_hour_session_valid")),
+    "pending_orders": True,
+}
+
+CANCEL_MARKETS = ("stock", "future")
+
+
+def _priority_for(endpoint: str) -> Priority:
+    """Endpoint adina gore varsayilan kuyruk onceligi."""
+    if endpoint.endswith("DeleteOrder"):
+        return Priority.CANCEL
+    if endpoint.endswith(("CreateOrder", "ReplaceOrder")) or "Identity/" in endpoint:
+        return Priority.ORDER
+    return Priority.READ
+
+class _BaseAPI:
+    """
+    API ve AsyncAPI icin ortak taban: token saklama, HMAC imzalama,
+    istek hazirlama ve endpoint tanimlari.
+
+    Endpoint metotlari yalnizca `self._post(...)` sonucunu doner; senkron
+    sinifta bu bir sozluk, asenkron sinifta ise beklenecek bir coroutine olur.
+    """
+    TOKEN_FILE = DEFAULT_TOKEN_FILE
 
     def __init__(
         self,
@@ -63,155 +162,343 @@ class API:
         api_url: str,
         api_key: str,
         secret_key: str,
-        verbose: bool
+        verbose: bool,
+        limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        codec: Optional[Codec] = None,
+        token_store: Optional[TokenStore] = None,
+        retry: Optional[RetryPolicy] = None,
+        breakers: Optional[CircuitBreakers] = None,
+        clock: Optional[ClockSync] = None
     ):
         self.verbose      = verbose
+        self.codec        = codec or default_codec
         self._api_url     = api_url.rstrip("/")
         self._client_key  = api_key
         self._secret_key  = secret_key
-        self._last_req = 0.0
-        self.interval = 1 # İstekler arasinda kac saniye olsun
-        
+        # Onceden anahtarlanmis HMAC ve endpoint bazli istek sablonlari
+        self.signer       = Signer(api_key, secret_key)
+        self._jwt_token = ""
+        # Token dosyasi: verilmezse calisma dizinindeki TOKEN_FILE
+        self.tokens = token_store or TokenStore(self.TOKEN_FILE)
+        # validate="lazy": ilk kimlikli yanit token'in gecerliligine karar verir
+        self._validate_pending = False
 
-        # --- Token yukleme ve gecerlilik kontrolu (evvelden ekledigimiz) ---
-        self._jwt_token = self._load_saved_token()
-        if self._jwt_token:
-            if self.verbose:
-                logger.info(f"✅ Yuklendi: {self.TOKEN_FILE}")
-            resp = self.get_subaccounts()
-            stat = resp.get("statusCode", "status")
-            
-            if stat == 200:
-                if self.verbose:
-                    logger.info("✅ Kaydedilmis token gecerli.")
-            else:
-                if self.verbose:
-                    logger.warning(f"❌ Kaydedilmis token gecersiz ({stat}), temizleniyor.")
-                self._jwt_token = ""
-                self._clear_saved_token()
+        # Endpoint grubu bazinda token bucket; thread ve coroutine'ler ortak kullanabilir
+        self.limiter = limiter or RateLimiter()
 
-        # --- AUTO SESSION REFRESH baslat ---
-        self._start_session_refresher()
+        # Salt-okunur Portfolio yanitlari icin TTL/LRU onbellek
+        self.cache = cache if cache is not None else ResponseCache()
+
+        # Yanit Date header'larindan sunucu saat farki; X-Timestamp buna gore duzeltilir
+        self.clock = clock or ClockSync()
+
+        # Ayni anda yapilan ozdes okumalar tek ag istegini paylasir
+        self.inflight = SingleFlight()
 
-    # ————— HELPERS —————
-        # ————— AUTO-SESSION REFRESH MEKANİZMASI —————
-    def _start_session_refresher(self):
+        # Yeniden denenebilir hatalar icin geri cekilme ve endpoint bazli devre kesici
+        self.retry = retry or RetryPolicy()
+        self.breakers = breakers or CircuitBreakers()
+
+        # Son kimlikli istegi izleyen, gerektiginde oturumu yenileyen yonetici
+        self.session = SessionKeeper(self)
+
+    # ——— Token helper’lari ———
+    def _load_saved_token(self) -> str:
+        return self.tokens.load()
+
+    def _save_token(self):
+        self.tokens.save(self._jwt_token)
+
+    def _token_expired(self) -> bool:
+        """JWT `exp` claim'i gecmisse True; sunucuya istek atilmaz."""
+        exp = jwt_expiry(self._jwt_token)
+        return exp is not None and exp <= time.time()
+
+    def _drop_token(self, reason: Any):
         """
-        Arka planda daemon thread ile her 60 saniyede bir
-        get_subaccounts() cagirip session'i yeniler.
+        Gecersiz token'i birakir. Dosya yalnizca hala bu token'i iceriyorsa
+        silinir; baska bir surec yeni token kaydettiyse o devralinir.
         """
-        thread = threading.Thread(target=self._session_refresher_loop, daemon=True)
-        thread.start()
+        if self.verbose:
+            logger.warning("❌ Kaydedilmis token gecersiz (%s), temizleniyor.", reason)
+        self._jwt_token = self.tokens.clear(expected=self._jwt_token)
+        if self._jwt_token:
+            # Devralinan token ilk kimlikli yanitta dogrulanir
+            self._validate_pending = True
+            if self.verbose:
+                logger.info("🔁 Baska surecin kaydettigi token devralindi: %s", self.tokens.path)
 
-    def _session_refresher_loop(self):
-        while True:
-            time.sleep(60)
-            if not self._jwt_token:
-                # Henuz login olunmadiysa atla
-                continue
-            try:
-                self.get_subaccounts()
-                if self.verbose:
-                    logger.info("🔄 Session refreshed via get_subaccounts()")
-            except Exception as e:
-                if self.verbose:
-                    logger.warning(f"❌ Session refresh failed: {e}")
+    def refresh_token(self, login: Callable[[], Any]) -> str:
+        """
+        Token'i surecler arasi kilit altinda yeniler. Kilidi bekleyen surecler,
+        bu arada dosyaya yeni token yazildiysa `login` cagirmadan onu kullanir;
+        bir filo yeniden basladiginda yalnizca tek surec login olur.
 
-    # ——— Token helper’lari ———
-    @classmethod
-    def _load_saved_token(cls) -> str:
-        # Dosya yoksa olustur ve bos token dondur
-        if not os.path.isfile(cls.TOKEN_FILE):
-            with open(cls.TOKEN_FILE, "w", encoding="utf-8") as f:
-                json.dump({"jwtToken": ""}, f, ensure_ascii=False)
-            return ""
-        # Var olan dosyayi oku
-        try:
-            with open(cls.TOKEN_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data.get("jwtToken", "")
-        except Exception as e:
-            # Hata varsa dosyayi sifirla
-            logger.warning(f"Hata olustu: {e}. Token dosyasi sifirlaniyor.")
-            with open(cls.TOKEN_FILE, "w", encoding="utf-8") as f:
-                json.dump({"jwtToken": ""}, f, ensure_ascii=False)
-            return ""
+            api.refresh_token(lambda: api.login(otp_token, sms_code))
 
-    @classmethod
-    def _clear_saved_token(cls):
-        try:
-            import os
-            os.remove(cls.TOKEN_FILE)
-        except FileNotFoundError:
-            pass
+        `login` senkron olmali ve self._jwt_token'i ayarlamalidir (API.login gibi).
+        """
+        def fetch() -> str:
+            login()
+            return self._jwt_token
+
+        self._jwt_token = self.tokens.refresh(self._jwt_token, fetch)
+        return self._jwt_token
+
+    def _check_first_auth(self, require_auth: bool, status_code: int):
+        """Ertelenmis dogrulama: ilk kimlikli yanit 401/403 ise token silinir."""
+        if require_auth and self._validate_pending:
+            self._validate_pending = False
+            if status_code in (401, 403):
+                self._drop_token(status_code)
 
-    def _save_token(self):
-        with open(self.TOKEN_FILE, "w", encoding="utf-8") as f:
-            json.dump({"jwtToken": self._jwt_token}, f, ensure_ascii=False)
-        
     def _timestamp(self) -> str:
-        return str(int(time.time()))
+        return self.clock.timestamp()
+
+    def _observe_clock(self, sent: float, resp: Any):
+        self.clock.observe(sent, time.time(), resp.headers.get("Date"))
 
     def _make_signature(
         self,
         path: str,
-        body_str: str,
+        body: bytes,
         timestamp: str
     ) -> str:
-        raw = f"{self._client_key}|{path}|{body_str}|{timestamp}"
-        mac = hmac.new(
-            self._secret_key.encode("utf-8"),
-            raw.encode("utf-8"),
-            digestmod=hashlib.sha256
-        ).digest()
-        return base64.b64encode(mac).decode("utf-8")
-
-    def _throttle(self):
-        wait = (self._last_req + self.interval) - time.time()
-        if wait > 0:
-            time.sleep(wait)
-        self._last_req = time.time()
-        
-    # ————— CORE REQUEST —————
-    def _post(
+        # Govde zaten UTF-8 bayt; tekrar str'e cevrilmeden imzalanir
+        return self.signer.sign(path, body, timestamp)
+
+    # ————— İSTEK AYARLARI —————
+    @contextmanager
+    def request_options(
+        self,
+        *,
+        priority: Optional[Priority] = None,
+        deadline: Optional[float] = None,
+        cache: Optional[bool] = None,
+        coalesce: Optional[bool] = None
+    ) -> Iterator[None]:
+        """
+        Blok icindeki isteklerin kuyruk onceligini ve deadline'ini belirler.
+        `deadline` sn cinsindendir ve endpoint cagrisindan itibaren sayilir;
+        tekrar denemeler ayni sureyi paylasir. Sure dolduysa ya da tekrar
+        deneme beklemesi sureyi asacaksa istek gonderilmez ve
+        errors.DeadlineExceeded firlatilir. `cache=False` yanit
+        onbellegini atlar (yanit yine de onbellege yazilir). `coalesce=False`
+        devam eden ozdes okumaya katilmak yerine ayri istek atar.
+
+            with api.request_options(deadline=0.5):
+                api.get_stock_delete_order(p, ref)
+        """
+        opts = dict(_REQUEST_OPTIONS.get())
+        if priority is not None:
+            opts["priority"] = priority
+        if deadline is not None:
+            opts["deadline"] = deadline
+        if cache is not None:
+            opts["cache"] = cache
+        if coalesce is not None:
+            opts["coalesce"] = coalesce
+        token = _REQUEST_OPTIONS.set(opts)
+        try:
+            yield
+        finally:
+            _REQUEST_OPTIONS.reset(token)
+
+    @staticmethod
+    def _queue_priority(endpoint: str) -> Priority:
+        return _REQUEST_OPTIONS.get().get("priority", _priority_for(endpoint))
+
+    @staticmethod
+    def _expires_at() -> Optional[float]:
+        """request_options deadline'i; cagri basinda bir kez mutlak monotonic zamana cevrilir."""
+        deadline = _REQUEST_OPTIONS.get().get("deadline")
+        return None if deadline is None else time.monotonic() + deadline
+
+    @staticmethod
+    def _remaining(path: str, expires: Optional[float]) -> Optional[float]:
+        """Deadline'a kalan sure; dolduysa istek gonderilmeden DeadlineExceeded."""
+        if expires is None:
+            return None
+        remaining = expires - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(
+                f"{path}: deadline {-remaining:.3f} sn once doldu, gonderilmedi", path=path
+            )
+        return remaining
+
+    # ————— YANIT ONBELLEGI —————
+    def _cache_lookup(self, path: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not self.cache.ttl_for(path) or not _REQUEST_OPTIONS.get().get("cache", True):
+            return None
+        return self.cache.get(path, payload)
+
+    def _cache_generation(self, path: str, payload: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+        """Onbelleklenen okumalar icin istek oncesi portfoy nesli."""
+        if not self.cache.ttl_for(path):
+            return None
+        return self.cache.generation(payload.get("portfolioNumber"))
+
+    def _cache_update(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        result: Optional[Dict[str, Any]],
+        generation: Optional[Tuple[int, int]]
+    ):
+        """
+        Basarili okuma yanitini onbellege yazar; yazma endpoint'lerinde
+        (basarili olsun olmasin) ilgili portfoyun kayitlarini siler. Okuma
+        suresince portfoyde yazma olduysa (nesil degisti) yanit yazilmaz.
+        """
+        if path.endswith(_WRITE_SUFFIXES):
+            self.cache.invalidate(payload.get("portfolioNumber"))
+        elif result is not None:
+            self.cache.put(path, payload, result, generation)
+
+    @staticmethod
+    def _coalescable(path: str) -> bool:
+        """Okuma istekleri birlestirilir; emir yazma ve Identity istekleri asla."""
+        return (not path.endswith(_WRITE_SUFFIXES) and "Identity/" not in path
+                and _REQUEST_OPTIONS.get().get("coalesce", True))
+
+    # ————— TOPLU IPTAL —————
+    @staticmethod
+    def _cancel_ref(
+        order: Dict[str, Any],
+        filters: Optional[Dict[str, Any]],
+        predicate: Optional[Callable[[Dict[str, Any]], bool]]
+    ) -> Optional[str]:
+        """Emir acik ve filtrelere uyuyorsa orderRef'i, degilse None doner."""
+        if order.get("orderStatus") in _NOT_CANCELLABLE:
+            return None
+        for field, wanted in (filters or {}).items():
+            value = order.get(field)
+            if isinstance(wanted, (set, frozenset, list, tuple)):
+                if value not in wanted:
+                    return None
+            elif value != wanted:
+                return None
+        if predicate is not None and not predicate(order):
+            return None
+        ref = order.get("orderRef")
+        return None if ref in (None, "") else str(ref)
+
+    @staticmethod
+    def _check_markets(markets: Sequence[str]):
+        unknown = set(markets) - set(CANCEL_MARKETS)
+        if unknown:
+            raise ValueError(f"Bilinmeyen piyasa: {sorted(unknown)}; {CANCEL_MARKETS} olmali")
+
+    def _cancel_options(self):
+        """Toplu iptal: listeleme dahil en yuksek oncelik, taze (onbelleksiz) veri."""
+        return self.request_options(priority=Priority.CANCEL, cache=False, coalesce=False)
+
+    def _log_cancel_report(self, portfolio_number: int, report: CancelReport):
+        if report.list_errors or report.failed:
+            logger.warning("[CANCEL_ALL] %s: %s", portfolio_number, report.summary())
+        elif self.verbose:
+            logger.info("[CANCEL_ALL] %s: %s", portfolio_number, report.summary())
+
+    # ————— SAYFALAMA —————
+    _page_items = staticmethod(page_items)
+
+    def _order_page_fetcher(
+        self,
+        portfolio_number: int,
+        order_status: Optional[str] = None,
+        order_direction: Optional[str] = None,
+        order_method: Optional[str] = None,
+        order_duration: Optional[str] = None,
+        equity_code: Optional[str] = None,
+        equity_type: Optional[str] = None,
+        descending_order: Optional[bool] = None
+    ) -> Callable[[int], Any]:
+        """iter_stock_orders icin sayfa numarasi alan get_stock_order_list cagricisi."""
+        def fetch(page_number: int) -> Any:
+            return self.get_stock_order_list(
+                portfolio_number, order_status, order_direction, order_method,
+                order_duration, equity_code, equity_type, page_number, descending_order
+            )
+        return fetch
+
+    def _resolve_call(
+        self, call: Sequence[Any]
+    ) -> Tuple[Callable[..., Any], Tuple[Any, ...], Dict[str, Any]]:
+        call = Call(*call)
+        if call.method.startswith("_") or call.method in ("batch", "close", "aclose"):
+            raise ValueError(f"batch icin gecersiz endpoint: {call.method}")
+        func = getattr(self, call.method, None)
+        if not callable(func):
+            raise ValueError(f"Bilinmeyen endpoint: {call.method}")
+        return func, tuple(call.args), dict(call.kwargs or {})
+
+    # ————— İSTEK HAZIRLAMA —————
+    @staticmethod
+    def _path(endpoint: str) -> str:
+        return endpoint if endpoint.startswith("/") else f"/{endpoint}"
+
+    def _prepare(
         self,
         endpoint: str,
         payload: Dict[str, Any],
-        *,
-        require_auth: bool = True
-    ) -> Dict[str, Any]:
+        require_auth: bool
+    ) -> Tuple[str, str, bytes, Dict[str, str]]:
         """
-        Tum POST istekleri bu metot uzerinden gider.
-        `require_auth=False` ise JWT header eklenmez.
+        Istek yolunu, URL'yi, govdeyi ve imzali header'lari hazirlar.
+        Govde yalnizca bir kez encode edilir; ayni baytlar hem imzalanir
+        hem gonderilir. Path, URL ve sabit header'lar endpoint sablonundan
+        gelir. Donus: (path, url, body, headers)
         """
-        path     = endpoint if endpoint.startswith("/") else f"/{endpoint}"
-        ts       = self._timestamp()
-        body_str = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
-        sig      = self._make_signature(path, body_str, ts)
+        tpl  = self.signer.template(self._path(endpoint), self._api_url)
+        ts   = self._timestamp()
+        body = self.codec.dumps(payload)
+        headers = tpl.headers(body, ts, self._jwt_token if require_auth else "")
+        return tpl.path, tpl.url, body, headers
 
-        headers = {
-            "X-ClientKey": self._client_key,
-            "X-Timestamp": ts,
-            "X-Signature": sig,
-            "Content-Type": "application/json; charset=utf-8",
-            "Accept":       "application/json; charset=utf-8",
-        }
-        if require_auth and self._jwt_token:
-            headers["Authorization"] = f"Bearer {self._jwt_token}"
+    def _handle_response(self, path: str, body: bytes, resp: Any) -> Dict[str, Any]:
+        """
+        HTTP yanitini sozluge cevirir; yanit yalnizca bir kez decode edilir.
+        200 disindaki yanitlar icin govdeyi tasiyan siniflandirilmis hata
+        (AuthError, ClientError, RateLimitError, ServerError) firlatilir.
+        """
+        if resp.status_code == 200:
+            data = self.codec.loads(resp.content)
+            if self.verbose and log_policy.enabled(logger, path, logging.INFO):
+                logger.info("[POST] %s  --> status %s, body=%s",
+                            path, resp.status_code, body.decode("utf-8"))
+                logger.info("[RESP] %s", data)
+            return data
+        logger.error("[POST] %s  --> status=%s, resp=%s", path, resp.status_code, resp.content)
+        try:
+            data = self.codec.loads(resp.content) if resp.content else None
+        except ValueError:
+            data = None
+        raise error_for_status(path, resp.status_code, resp.content, data, resp.headers)
+
+    def _retry_delay(
+        self, path: str, error: APIError, attempt: int, expires: Optional[float]
+    ) -> Optional[float]:
+        """
+        Tekrar denenecekse beklenecek sure, denenmeyecekse None. Bekleme
+        deadline'i asacaksa tekrar denenmez, DeadlineExceeded firlatilir.
+        """
+        error.attempts = attempt
+        delay = self.retry.backoff(path, error, attempt)
+        if delay is not None and expires is not None and time.monotonic() + delay >= expires:
+            raise DeadlineExceeded(
+                f"{path}: deneme {attempt} basarisiz ({error}); tekrar deneme deadline'i asar",
+                path=path
+            ) from error
+        if delay is not None:
+            logger.warning("[RETRY] %s deneme %d basarisiz (%s); %.2f sn sonra tekrar",
+                           path, attempt, error, delay)
+        return delay
+
+    def _on_success(self, require_auth: bool):
+        if require_auth:
+            self.session.touch()
 
-        self._throttle()
-        url = f"{self._api_url}{path}"
-        resp = requests.post(url, data=body_str.encode("utf-8"),
-                             headers=headers, timeout=60)
-        
-        if self.verbose and resp.status_code == 200:
-            logger.info(f"[POST] {path}  --> status {resp.status_code}, body={body_str}")
-            logger.info(f"[RESP] {resp.json()}")            
-            return resp.json()
-        else:
-            logger.error(f"[POST] {path}  --> status={resp.status_code}, resp={resp.content}")
-            return {"status": resp.status_code}
-        
     # ————— Authentication —————
     def send_otp(self, internet_user: str, password: str) -> Dict[str, Any]:
         """
@@ -221,19 +508,6 @@ class API:
                           {"internetUser": internet_user, "password": password},
                           require_auth=False)
 
-    def login(self, token: str, otp: str) -> Dict[str, Any]:
-        """
-        SMS koduyla login olur ve JWT token’i kaydeder.
-        """
-        resp = self._post("Identity/Login",
-                          {"token": token, "otp": otp},
-                          require_auth=False)
-        self._jwt_token = resp["data"]["jwtToken"]
-        self._save_token()
-        if self.verbose:
-            logger.info("✅ Login successful, JWT token stored.")
-        return resp
-
     # ————— Portfolio Endpoints —————
     def get_subaccounts(self) -> Dict[str, Any]:
         return self._post("Portfolio/SubAccounts", {})
@@ -449,15 +723,876 @@ class API:
         return self._post("Future/FuturePositions", {
             "portfolioNumber": portfolio_number
         })
-              
+
+
+class API(_BaseAPI):
+    """
+    HMAC‐imzali REST API istemcisi.
+
+    Ayni kimlik bilgisi icin tek nesne kullanmak uzere `API.get_api` ya da
+    `ClientRegistry` tercih edilmelidir.
+    """
+
+    @classmethod
+    def get_api(
+        cls,
+        *,
+        api_url: str,
+        api_key: str,
+        secret_key: str,
+        verbose: bool = True,
+        transport: Optional[HTTPTransport] = None,
+        limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        codec: Optional[Codec] = None,
+        validate: str = "sync"
+    ) -> "API":
+        """
+        (api_url, api_key) icin varsayilan `ClientRegistry`'deki istemciyi doner;
+        yoksa olusturur. Farkli kimlik bilgileri farkli istemciler alir; hepsi
+        ayni baglanti havuzunu ve batch worker'larini paylasir, token dosyasi
+        ve limiter ise istemciye ozeldir.
+        `transport`, `limiter`, `cache`, `codec` ve `validate` yalnizca istemci
+        ilk kez olusturulurken kullanilir (bkz. API.__init__).
+        """
+        return default_registry.get(
+            api_url=api_url,
+            api_key=api_key,
+            secret_key=secret_key,
+            verbose=verbose,
+            transport=transport,
+            limiter=limiter,
+            cache=cache,
+            codec=codec,
+            validate=validate
+        )
+
+    def __init__(
+        self,
+        *,
+        api_url: str,
+        api_key: str,
+        secret_key: str,
+        verbose: bool,
+        transport: Optional[HTTPTransport] = None,
+        limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        codec: Optional[Codec] = None,
+        validate: str = "sync",
+        token_store: Optional[TokenStore] = None,
+        executor: Optional["ThreadPoolExecutor"] = None,
+        retry: Optional[RetryPolicy] = None,
+        breakers: Optional[CircuitBreakers] = None,
+        clock: Optional[ClockSync] = None
+    ):
+        """
+        `transport` ve `executor` verilirse paylasilan kaynak sayilir ve
+        close() ile kapatilmaz. `token_store` verilmezse TOKEN_FILE kullanilir.
+        `retry` verilmezse RetryPolicy() (3 deneme), tekrar denemeyi kapatmak
+        icin resilience.NO_RETRY verilebilir.
+
+        `validate`, kaydedilmis token'in sunucuda ne zaman dogrulanacagini secer.
+        Her modda suresi (JWT exp) gecmis token istek atilmadan silinir.
+          "sync"       : get_subaccounts() ile hemen dogrular (varsayilan)
+          "background" : dogrulama arka plan thread'inde yapilir, __init__ beklemez
+          "lazy"       : ayri istek atilmaz; ilk kimlikli yanit 401/403 ise token silinir
+        """
+        if validate not in VALIDATE_MODES:
+            raise ValueError(f"validate {VALIDATE_MODES} degerlerinden biri olmali")
+        super().__init__(api_url=api_url, api_key=api_key, secret_key=secret_key,
+                         verbose=verbose, limiter=limiter, cache=cache, codec=codec,
+                         token_store=token_store, retry=retry, breakers=breakers,
+                         clock=clock)
+
+        # Kalici baglanti havuzu: disaridan verilmediyse API'ye aittir
+        self._owns_transport = transport is None
+        self._transport = transport or HTTPTransport()
+
+        # batch() icin worker havuzu: verilmediyse ilk kullanimda olusturulur
+        self._owns_executor = executor is None
+        self._executor: Optional["ThreadPoolExecutor"] = executor
+        self._executor_lock = threading.Lock()
+
+        # --- Token yukleme ve gecerlilik kontrolu (evvelden ekledigimiz) ---
+        self._jwt_token = self._load_saved_token()
+        if self._jwt_token:
+            if self.verbose:
+                logger.info("✅ Yuklendi: %s", self.tokens.path)
+            if self._token_expired():
+                self._drop_token("exp")
+            elif validate == "sync":
+                self.validate_token()
+            elif validate == "background":
+                threading.Thread(target=self.validate_token, name="token-validate",
+                                 daemon=True).start()
+            else:
+                self._validate_pending = True
+
+        # --- AUTO SESSION REFRESH baslat ---
+        # Oturum yalnizca bosta kaldiginda yenilenir (bkz. session.SessionKeeper)
+        self.session.start()
+
+    def validate_token(self) -> bool:
+        """
+        Kayitli token'i sunucuya karsi dogrular; gecersizse temizler.
+        """
+        if not self._jwt_token:
+            return False
+        self._validate_pending = False
+        try:
+            with self.request_options(cache=False):
+                self.get_subaccounts()
+        except AuthError as e:
+            self._drop_token(e.status)
+            return False
+        except APIError as e:
+            # 429, diger 4xx ve sunucu/baglanti sorunlari token'in gecersiz oldugunu gostermez
+            logger.warning("Token dogrulanamadi (%s); token korunuyor.", e)
+            return False
+        if self.verbose:
+            logger.info("✅ Kaydedilmis token gecerli.")
+        return True
+
+    # ————— CORE REQUEST —————
+    def _post(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        *,
+        require_auth: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Tum POST istekleri bu metot uzerinden gider.
+        `require_auth=False` ise JWT header eklenmez. Istek, oncelik
+        sirasina gore limiter kuyrugunda bekler; deadline dolarsa
+        errors.DeadlineExceeded firlatilir. Hatalar errors.APIError alt siniflari
+        olarak firlatilir; idempotent istekler `self.retry` politikasina
+        gore tekrar denenir. Ayni anda yapilan ozdes okumalar tek istegi
+        paylasir (`self.inflight`).
+        """
+        path = self._path(endpoint)
+        cached = self._cache_lookup(path, payload)
+        if cached is not None:
+            return cached
+        expires = self._expires_at()
+        if self._coalescable(path):
+            key = flight_key(path, payload, self._queue_priority(path))
+            return self.inflight.do(key, lambda: self._fetch(path, payload, require_auth, expires),
+                                    expires)
+        return self._fetch(path, payload, require_auth, expires)
+
+    def _fetch(
+        self, path: str, payload: Dict[str, Any], require_auth: bool, expires: Optional[float]
+    ) -> Dict[str, Any]:
+        """Tekrar denemeli istek; basarili okuma onbellege yazilir."""
+        generation = self._cache_generation(path, payload)
+        result: Optional[Dict[str, Any]] = None
+        try:
+            attempt = 1
+            while True:
+                try:
+                    result = self._send(path, payload, require_auth, expires)
+                    return result
+                except APIError as e:
+                    delay = self._retry_delay(path, e, attempt, expires)
+                    if delay is None:
+                        raise
+                time.sleep(delay)
+                attempt += 1
+        finally:
+            self._cache_update(path, payload, result, generation)
+
+    def _send(
+        self, path: str, payload: Dict[str, Any], require_auth: bool, expires: Optional[float]
+    ) -> Dict[str, Any]:
+        """Tek deneme: devre kesici → limiter → imza → HTTP → yanit."""
+        breaker = self.breakers.get(path)
+        breaker.before()
+        try:
+            # Imza zaman damgasi beklemeden sonra alinsin diye once token alinir
+            priority = self._queue_priority(path)
+            waited = self.limiter.acquire(path, priority, self._remaining(path, expires))
+            if waited > 0.05:
+                logger.debug("[LIMIT] %s %.3f sn bekledi", path, waited)
+            path, url, body, headers = self._prepare(path, payload, require_auth)
+            sent = time.time()
+            resp = self._transport.post(url, body, headers)
+            self._observe_clock(sent, resp)
+            self._check_first_auth(require_auth, resp.status_code)
+            response = self._handle_response(path, body, resp)
+        except BaseException as e:
+            breaker.failure(e)
+            raise
+        breaker.success()
+        self._on_success(require_auth)
+        return response
+
+    # ————— BATCH —————
+    def _get_executor(self) -> "ThreadPoolExecutor":
+        with self._executor_lock:
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                workers = getattr(self._transport, "pool_maxsize", 8)
+                self._executor = ThreadPoolExecutor(max_workers=workers,
+                                                    thread_name_prefix="api-batch")
+            return self._executor
+
+    def batch(self, calls: Sequence[Sequence[Any]]) -> List[BatchResult]:
+        """
+        Birden fazla endpoint cagrisini es zamanli calistirir. Istekler yine
+        limiter butcesine ve oncelik sirasina tabidir; sonuclar girdi
+        sirasiyla, her cagri icin ayri hata bilgisiyle doner.
+
+            results = api.batch([Call("get_account_summary", (p,)),
+                                 Call("get_cash_balance", (p,))])
+        """
+        executor = self._get_executor()
+        futures = []
+        for call in calls:
+            try:
+                func, args, kwargs = self._resolve_call(call)
+            except ValueError as e:
+                futures.append(e)
+                continue
+            # request_options() ayarlari worker thread'lerine de tasinsin
+            ctx = contextvars.copy_context()
+            futures.append(executor.submit(ctx.run, func, *args, **kwargs))
+
+        results: List[BatchResult] = []
+        for fut in futures:
+            if isinstance(fut, BaseException):
+                results.append(BatchResult(error=fut))
+                continue
+            try:
+                results.append(BatchResult(value=fut.result()))
+            except Exception as e:
+                results.append(BatchResult(error=e))
+        return results
+
+    # ————— SAYFALAMA —————
+    def iter_stock_orders(
+        self,
+        portfolio_number: int,
+        *,
+        stop_when: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        start_page: int = 1,
+        **filters: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        get_stock_order_list sayfalarini tek tek emir olarak doner.
+
+        Cagiran N. sayfayi tuketirken N+1. sayfa arka planda istenir; ilk bos
+        sayfada durur. `stop_when(order)` True donerse o emir verilmeden
+        durulur (or. "T'den eski emirlere gelince dur"). `filters`:
+        order_status, order_direction, order_method, order_duration,
+        equity_code, equity_type, descending_order.
+
+            for order in api.iter_stock_orders(p, descending_order=True,
+                                               stop_when=lambda o: o["orderDate"] < since):
+                ...
+        """
+        fetch = self._order_page_fetcher(portfolio_number, **filters)
+        executor = self._get_executor()
+        page = start_page
+        future = executor.submit(contextvars.copy_context().run, fetch, page)
+        try:
+            while True:
+                items = self._page_items(future.result())
+                if not items:
+                    return
+                page += 1
+                future = executor.submit(contextvars.copy_context().run, fetch, page)
+                for order in items:
+                    if stop_when is not None and stop_when(order):
+                        return
+                    yield order
+        finally:
+            future.cancel()
+
+    # ————— TOPLU IPTAL —————
+    def cancel_all(
+        self,
+        portfolio_number: int,
+        filters: Optional[Dict[str, Any]] = None,
+        *,
+        markets: Sequence[str] = CANCEL_MARKETS,
+        predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> CancelReport:
+        """
+        Portfoydeki acik pay ve vadeli emirlerini iptal eder ("flatten").
+
+        Pay emirleri iter_stock_orders ile sayfa sayfa akarken, vadeli emirler
+        (pendingOrders=True) ayni anda listelenir; her acik emrin silme istegi
+        listelemenin bitmesi beklenmeden batch worker'larina verilir. Tum
+        istekler CANCEL onceliginde gider, hiz limiter'in izin verdigi en
+        yuksek hizdir. Hatalar firlatilmaz, raporda doner.
+
+        `filters` emir alanlarina gore istemci tarafinda eslesir; deger bir
+        kume/liste ise uyelik aranir. `predicate(order)` ek filtredir.
+
+            report = api.cancel_all(123, {"equityCode": {"GARAN", "AKBNK"}})
+            for r in report.failed:
+                print(r.market, r.order_ref, r.error)
+        """
+        self._check_markets(markets)
+        started = time.monotonic()
+        report = CancelReport()
+        executor = self._get_executor()
+        seen: Set[Tuple[str, str]] = set()
+        pending: List["Future[CancelResult]"] = []
+
+        def delete(market: str, ref: str, order: Dict[str, Any]) -> CancelResult:
+            method = (self.get_stock_delete_order if market == "stock"
+                      else self.get_future_delete_order)
+            t0 = time.monotonic()
+            try:
+                value = method(portfolio_number, ref)
+            except Exception as e:
+                return CancelResult(market, ref, order, error=e, latency=time.monotonic() - t0)
+            return CancelResult(market, ref, order, value=value, latency=time.monotonic() - t0)
+
+        def submit(market: str, order: Dict[str, Any]):
+            report.scanned += 1
+            ref = self._cancel_ref(order, filters, predicate)
+            if ref is None or (market, ref) in seen:
+                return
+            seen.add((market, ref))
+            context = contextvars.copy_context()
+            pending.append(executor.submit(context.run, delete, market, ref, order))
+
+        with self._cancel_options():
+            future_list = None
+            if "future" in markets:
+                future_list = executor.submit(contextvars.copy_context().run,
+                                              self.get_future_order_list, portfolio_number,
+                                              **_OPEN_FUTURE_FILTERS)
+            if "stock" in markets:
+                try:
+                    for order in self.iter_stock_orders(portfolio_number, descending_order=True):
+                        submit("stock", order)
+                except Exception as e:
+                    report.list_errors["stock"] = e
+            if future_list is not None:
+                try:
+                    for order in self._page_items(future_list.result()):
+                        submit("future", order)
+                except Exception as e:
+                    report.list_errors["future"] = e
+            report.results = [f.result() for f in pending]
+
+        report.elapsed = time.monotonic() - started
+        self._log_cancel_report(portfolio_number, report)
+        return report
+
+    def close(self):
+        """
+        Session yenileyiciyi durdurur; API'ye ait baglanti havuzunu ve batch
+        worker'larini kapatir.
+        """
+        self.session.stop()
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+        if self._owns_transport:
+            self._transport.close()
+
+    # ————— Authentication —————
+    def login(self, token: str, otp: str) -> Dict[str, Any]:
+        """
+        SMS koduyla login olur ve JWT token’i kaydeder.
+        """
+        resp = self._post("Identity/Login",
+                          {"token": token, "otp": otp},
+                          require_auth=False)
+        self._jwt_token = resp["data"]["jwtToken"]
+        self._save_token()
+        self.session.touch()
+        if self.verbose:
+            logger.info("✅ Login successful, JWT token stored.")
+        return resp
+
+
+class AsyncAPI(_BaseAPI):
+    """
+    asyncio tabanli HMAC‐imzali REST API istemcisi.
+
+    `API` ile ayni endpoint metotlarini (get_stock_create_order,
+    get_account_summary, get_future_positions, ...) coroutine olarak sunar.
+    Tum istekler tek bir `AsyncHTTPTransport` havuzunu paylasir; yuzlerce
+    istek, istek basina thread acmadan ayni event loop'tan yurutulebilir.
+
+    Kullanim:
+        async with AsyncAPI(api_url=..., api_key=..., secret_key=...) as api:
+            await api.validate_token()
+            summary = await api.get_account_summary(123)
+    """
+
+    def __init__(
+        self,
+        *,
+        api_url: str,
+        api_key: str,
+        secret_key: str,
+        verbose: bool = True,
+        transport: Optional[AsyncHTTPTransport] = None,
+        limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        codec: Optional[Codec] = None,
+        token_store: Optional[TokenStore] = None,
+        retry: Optional[RetryPolicy] = None,
+        breakers: Optional[CircuitBreakers] = None,
+        clock: Optional[ClockSync] = None
+    ):
+        super().__init__(api_url=api_url, api_key=api_key, secret_key=secret_key,
+                         verbose=verbose, limiter=limiter, cache=cache, codec=codec,
+                         token_store=token_store, retry=retry, breakers=breakers,
+                         clock=clock)
+
+        # Tek baglanti havuzu: disaridan verilmediyse AsyncAPI'ye aittir
+        self._owns_transport = transport is None
+        self._transport = transport or AsyncHTTPTransport()
+
+        # Token dosyadan yuklenir; suresi gecmisse hemen silinir. Sunucu
+        # dogrulamasi validate_token() ile ya da ilk kimlikli yanitta yapilir.
+        self._jwt_token = self._load_saved_token()
+        if self._jwt_token:
+            if self._token_expired():
+                self._drop_token("exp")
+            else:
+                self._validate_pending = True
+
+    async def validate_token(self) -> bool:
+        """
+        Kayitli token'i sunucuya karsi dogrular; gecersizse temizler.
+        """
+        if not self._jwt_token:
+            return False
+        self._validate_pending = False
+        try:
+            with self.request_options(cache=False):
+                await self.get_subaccounts()
+        except AuthError as e:
+            self._drop_token(e.status)
+            return False
+        except APIError as e:
+            # 429, diger 4xx ve sunucu/baglanti sorunlari token'in gecersiz oldugunu gostermez
+            logger.warning("Token dogrulanamadi (%s); token korunuyor.", e)
+            return False
+        if self.verbose:
+            logger.info("✅ Kaydedilmis token gecerli.")
+        return True
+
+    # ————— CORE REQUEST —————
+    async def _post(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        *,
+        require_auth: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Tum POST istekleri bu coroutine uzerinden gider.
+        `require_auth=False` ise JWT header eklenmez. Hata ve tekrar deneme
+        davranisi API._post ile aynidir.
+        """
+        path = self._path(endpoint)
+        cached = self._cache_lookup(path, payload)
+        if cached is not None:
+            return cached
+        expires = self._expires_at()
+        if self._coalescable(path):
+            key = flight_key(path, payload, self._queue_priority(path))
+            return await self.inflight.do_async(
+                key, lambda: self._fetch(path, payload, require_auth, expires), expires
+            )
+        return await self._fetch(path, payload, require_auth, expires)
+
+    async def _fetch(
+        self, path: str, payload: Dict[str, Any], require_auth: bool, expires: Optional[float]
+    ) -> Dict[str, Any]:
+        """Tekrar denemeli istek; basarili okuma onbellege yazilir."""
+        generation = self._cache_generation(path, payload)
+        import asyncio
+        result: Optional[Dict[str, Any]] = None
+        try:
+            attempt = 1
+            while True:
+                try:
+                    result = await self._send(path, payload, require_auth, expires)
+                    return result
+                except APIError as e:
+                    delay = self._retry_delay(path, e, attempt, expires)
+                    if delay is None:
+                        raise
+                await asyncio.sleep(delay)
+                attempt += 1
+        finally:
+            self._cache_update(path, payload, result, generation)
+
+    async def _send(
+        self, path: str, payload: Dict[str, Any], require_auth: bool, expires: Optional[float]
+    ) -> Dict[str, Any]:
+        """Tek deneme: devre kesici → limiter → imza → HTTP → yanit."""
+        breaker = self.breakers.get(path)
+        breaker.before()
+        try:
+            # Imza zaman damgasi beklemeden sonra alinsin diye once token alinir
+            priority = self._queue_priority(path)
+            remaining = self._remaining(path, expires)
+            waited = await self.limiter.acquire_async(path, priority, remaining)
+            if waited > 0.05:
+                logger.debug("[LIMIT] %s %.3f sn bekledi", path, waited)
+            path, url, body, headers = self._prepare(path, payload, require_auth)
+            sent = time.time()
+            resp = await self._transport.post(url, body, headers)
+            self._observe_clock(sent, resp)
+            self._check_first_auth(require_auth, resp.status_code)
+            response = self._handle_response(path, body, resp)
+        except BaseException as e:
+            breaker.failure(e)
+            raise
+        breaker.success()
+        self._on_success(require_auth)
+        return response
+
+    # ————— BATCH —————
+    async def batch(self, calls: Sequence[Sequence[Any]]) -> List[BatchResult]:
+        """
+        `API.batch` ile ayni; cagrilar ayni event loop'ta es zamanli calisir.
+        """
+        async def run(call: Sequence[Any]) -> BatchResult:
+            try:
+                func, args, kwargs = self._resolve_call(call)
+                return BatchResult(value=await func(*args, **kwargs))
+            except Exception as e:
+                return BatchResult(error=e)
+
+        import asyncio
+        return list(await asyncio.gather(*(run(c) for c in calls)))
+
+    # ————— SAYFALAMA —————
+    async def iter_stock_orders(
+        self,
+        portfolio_number: int,
+        *,
+        stop_when: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        start_page: int = 1,
+        **filters: Any
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        `API.iter_stock_orders` ile ayni; sonraki sayfa ayri bir task olarak
+        onceden istenir.
+        """
+        import asyncio
+        fetch = self._order_page_fetcher(portfolio_number, **filters)
+        page = start_page
+        task = asyncio.ensure_future(fetch(page))
+        try:
+            while True:
+                items = self._page_items(await task)
+                if not items:
+                    return
+                page += 1
+                task = asyncio.ensure_future(fetch(page))
+                for order in items:
+                    if stop_when is not None and stop_when(order):
+                        return
+                    yield order
+        finally:
+            if not task.done():
+                task.cancel()
+
+    # ————— TOPLU IPTAL —————
+    async def cancel_all(
+        self,
+        portfolio_number: int,
+        filters: Optional[Dict[str, Any]] = None,
+        *,
+        markets: Sequence[str] = CANCEL_MARKETS,
+        predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> CancelReport:
+        """`API.cancel_all` ile ayni; silmeler ayni event loop'ta task olarak calisir."""
+        import asyncio
+        self._check_markets(markets)
+        started = time.monotonic()
+        report = CancelReport()
+        seen: Set[Tuple[str, str]] = set()
+        pending: List["asyncio.Task[CancelResult]"] = []
+
+        async def delete(market: str, ref: str, order: Dict[str, Any]) -> CancelResult:
+            method = (self.get_stock_delete_order if market == "stock"
+                      else self.get_future_delete_order)
+            t0 = time.monotonic()
+            try:
+                value = await method(portfolio_number, ref)
+            except Exception as e:
+                return CancelResult(market, ref, order, error=e, latency=time.monotonic() - t0)
+            return CancelResult(market, ref, order, value=value, latency=time.monotonic() - t0)
+
+        def submit(market: str, order: Dict[str, Any]):
+            report.scanned += 1
+            ref = self._cancel_ref(order, filters, predicate)
+            if ref is None or (market, ref) in seen:
+                return
+            seen.add((market, ref))
+            pending.append(asyncio.ensure_future(delete(market, ref, order)))
+
+        with self._cancel_options():
+            future_list = None
+            if "future" in markets:
+                future_list = asyncio.ensure_future(
+                    self.get_future_order_list(portfolio_number, **_OPEN_FUTURE_FILTERS))
+            if "stock" in markets:
+                try:
+                    orders = self.iter_stock_orders(portfolio_number, descending_order=True)
+                    async for order in orders:
+                        submit("stock", order)
+                except Exception as e:
+                    report.list_errors["stock"] = e
+            if future_list is not None:
+                try:
+                    for order in self._page_items(await future_list):
+                        submit("future", order)
+                except Exception as e:
+                    report.list_errors["future"] = e
+            report.results = list(await asyncio.gather(*pending))
+
+        report.elapsed = time.monotonic() - started
+        self._log_cancel_report(portfolio_number, report)
+        return report
+
+    async def aclose(self):
+        """Session yenileyiciyi durdurur; AsyncAPI'ye ait baglanti havuzunu kapatir."""
+        self.session.stop()
+        if self._owns_transport:
+            await self._transport.aclose()
+
+    async def __aenter__(self) -> "AsyncAPI":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    # ————— Authentication —————
+    async def login(self, token: str, otp: str) -> Dict[str, Any]:
+        """
+        SMS koduyla login olur ve JWT token’i kaydeder.
+        """
+        resp = await self._post("Identity/Login",
+                                {"token": token, "otp": otp},
+                                require_auth=False)
+        self._jwt_token = resp["data"]["jwtToken"]
+        self._save_token()
+        self.session.touch()
+        if self.verbose:
+            logger.info("✅ Login successful, JWT token stored.")
+        return resp
+
+
+class ClientRegistry:
+    """
+    Kimlik bilgisi (api_url, api_key) bazinda istemci kayit defteri.
+
+    Her istemcinin kendi token dosyasi (`TokenStore.for_credential`),
+    limiter'i ve yanit onbellegi vardir. Baglanti havuzu, batch worker'lari
+    ve (AsyncAPI icin) asenkron havuz tum istemciler arasinda paylasilir;
+    N hesaba tek surecten hizmet verilebilir.
+
+        registry = ClientRegistry(limits={"Stock": (5, 5)})
+        a = registry.get(api_url=URL, api_key=K1, secret_key=S1)
+        b = registry.get(api_url=URL, api_key=K2, secret_key=S2)
+
+    Parametreler:
+      transport       : Paylasilan HTTPTransport (verilmezse ilk istemcide olusturulur)
+      async_transport : Paylasilan AsyncHTTPTransport
+      limits          : Her istemcinin RateLimiter'i icin grup limitleri
+      token_dir       : Kimlik bazli token dosyalarinin dizini (varsayilan: calisma dizini)
+    """
+
+    def __init__(
+        self,
+        *,
+        transport: Optional[HTTPTransport] = None,
+        async_transport: Optional[AsyncHTTPTransport] = None,
+        limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        token_dir: Optional[str] = None
+    ):
+        self.limits = limits
+        self.token_dir = token_dir
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple[str, str, str], _BaseAPI] = {}
+        self._secrets: Dict[Tuple[str, str], str] = {}
+
+        self._owns_transport = transport is None
+        self._transport = transport
+        self._owns_async_transport = async_transport is None
+        self._async_transport = async_transport
+        self._executor: Optional["ThreadPoolExecutor"] = None
+
+    @staticmethod
+    def _credential(api_url: str, api_key: str) -> Tuple[str, str]:
+        return api_url.rstrip("/"), api_key
+
+    def _check_secret(self, cred: Tuple[str, str], secret_key: str):
+        digest = hashlib.sha256(secret_key.encode("utf-8")).hexdigest()
+        known = self._secrets.setdefault(cred, digest)
+        if known != digest:
+            raise ValueError(f"{cred[0]} icin bu api_key farkli bir secret_key ile kayitli")
+
+    def _shared(self) -> Tuple[HTTPTransport, "ThreadPoolExecutor"]:
+        with self._lock:
+            if self._transport is None:
+                self._transport = HTTPTransport()
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._executor = ThreadPoolExecutor(max_workers=self._transport.pool_maxsize,
+                                                    thread_name_prefix="api-batch")
+            return self._transport, self._executor
+
+    def _shared_async(self) -> AsyncHTTPTransport:
+        with self._lock:
+            if self._async_transport is None:
+                self._async_transport = AsyncHTTPTransport()
+            return self._async_transport
+
+    def _lookup(self, kind: str, cred: Tuple[str, str], secret_key: str) -> Optional[Any]:
+        with self._lock:
+            self._check_secret(cred, secret_key)
+            return self._clients.get((kind,) + cred)
+
+    def _register(self, kind: str, cred: Tuple[str, str], client: _BaseAPI) -> Any:
+        """Es zamanli olusturmada ilk kaydedilen kazanir; digeri kapatilir."""
+        with self._lock:
+            existing = self._clients.setdefault((kind,) + cred, client)
+        if existing is not client:
+            if isinstance(client, API):
+                client.close()
+            else:
+                client.session.stop()
+        return existing
+
+    def get(
+        self,
+        *,
+        api_url: str,
+        api_key: str,
+        secret_key: str,
+        verbose: bool = True,
+        transport: Optional[HTTPTransport] = None,
+        limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        codec: Optional[Codec] = None,
+        validate: str = "sync"
+    ) -> API:
+        """Kimlik bilgisinin API istemcisini doner; yoksa olusturur."""
+        cred = self._credential(api_url, api_key)
+        client = self._lookup("sync", cred, secret_key)
+        if client is not None:
+            return client
+        shared_transport, executor = self._shared()
+        client = API(
+            api_url=api_url,
+            api_key=api_key,
+            secret_key=secret_key,
+            verbose=verbose,
+            transport=transport or shared_transport,
+            limiter=limiter or RateLimiter(self.limits),
+            cache=cache,
+            codec=codec,
+            validate=validate,
+            token_store=TokenStore.for_credential(api_url, api_key, self.token_dir),
+            executor=executor
+        )
+        return self._register("sync", cred, client)
+
+    def get_async(
+        self,
+        *,
+        api_url: str,
+        api_key: str,
+        secret_key: str,
+        verbose: bool = True,
+        limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        codec: Optional[Codec] = None
+    ) -> AsyncAPI:
+        """
+        Kimlik bilgisinin AsyncAPI istemcisini doner; tum istemciler tek
+        asenkron havuzu paylasir.
+        """
+        cred = self._credential(api_url, api_key)
+        client = self._lookup("async", cred, secret_key)
+        if client is not None:
+            return client
+        client = AsyncAPI(
+            api_url=api_url,
+            api_key=api_key,
+            secret_key=secret_key,
+            verbose=verbose,
+            transport=self._shared_async(),
+            limiter=limiter or RateLimiter(self.limits),
+            cache=cache,
+            codec=codec,
+            token_store=TokenStore.for_credential(api_url, api_key, self.token_dir)
+        )
+        return self._register("async", cred, client)
+
+    def clients(self) -> List[_BaseAPI]:
+        with self._lock:
+            return list(self._clients.values())
+
+    def remove(self, api_url: str, api_key: str):
+        """Kimlik bilgisinin istemcilerini kayittan cikarir ve session yenileyicilerini durdurur."""
+        cred = self._credential(api_url, api_key)
+        with self._lock:
+            removed = [self._clients.pop((kind,) + cred, None) for kind in ("sync", "async")]
+            self._secrets.pop(cred, None)
+        for client in removed:
+            if isinstance(client, API):
+                client.close()
+            elif client is not None:
+                client.session.stop()
+
+    def close(self):
+        """Tum istemcileri ve registry'ye ait senkron kaynaklari kapatir."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._secrets.clear()
+            executor, self._executor = self._executor, None
+        for client in clients:
+            if isinstance(client, API):
+                client.close()
+            else:
+                client.session.stop()
+        if executor is not None:
+            executor.shutdown(wait=False)
+        if self._owns_transport and self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    async def aclose(self):
+        """close() ve ardindan paylasilan asenkron havuzu kapatir."""
+        self.close()
+        if self._owns_async_transport and self._async_transport is not None:
+            await self._async_transport.aclose()
+            self._async_transport = None
+
+
+# API.get_api tarafindan kullanilan surec geneli kayit defteri
+default_registry = ClientRegistry()
+
+
 class WebSocket:
     """
     HMAC imzali WebSocket baglantisi saglayan ve periyodik 'heartbeat' mesaji
     atan bir istemci sinifi.
 
     ozellikler:
-      - Baglanti acildiginda otomatik reconnect.
+      - Baglanti koparsa denetci task'i full jitter ustel geri cekilmeyle
+        yeniden baglanir; el sikismasi her seferinde yeniden imzalanir ve
+        AddT/AddY/AddD abonelikleri kanal basina tek mesajla tekrar gonderilir.
       - Belirlenen aralikla ('heartbeat_interval') H tipi heartbeat gonderimi.
+      - Yeniden baglanma suresi ve kor kalinan mesaj boslugu: `stats()`.
       - Gelen mesajlari istersen on_message callback’ine, istersen verbose modda console'a yazdirma.
     """
 
@@ -468,7 +1603,12 @@ class WebSocket:
         secret_key: str,
         jwt_token: str,
         heartbeat_interval: int = 300,
-        verbose: bool = True
+        verbose: bool = True,
+        codec: Optional[Codec] = None,
+        clock: Optional[ClockSync] = None,
+        dispatcher: Optional[Dispatcher] = None,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0
     ):
         """
         Parametreler:
@@ -478,6 +1618,13 @@ class WebSocket:
           jwt_token         : Yetkili JWT token (Bearer olmadan)
           heartbeat_interval: Kac saniyede bir heartbeat atilacagi
           verbose           : True ise loglama acik olur
+          codec             : JSON codec (varsayilan: orjson varsa orjson)
+          clock             : Saat farki tahmincisi; REST istemcisinin `api.clock`'u
+                              verilirse ayni duzeltme kullanilir
+          dispatcher        : Gelen mesajlarin kuyrugu ve handler havuzu
+                              (varsayilan: Dispatcher(), BLOCK politikasi)
+          reconnect_delay   : Ilk yeniden baglanma beklemesinin ust siniri (sn)
+          max_reconnect_delay: Yeniden baglanma beklemesi ust siniri (sn)
         """
         # HTTP → WebSocket URL donusumu (wss/ws)
         self.ws_url = api_url.rstrip('/') \
@@ -486,40 +1633,78 @@ class WebSocket:
 
         self._client_key = api_key
         self._secret_key = secret_key
+        self.signer = Signer(api_key, secret_key)
         self._jwt_token = jwt_token
         self.heartbeat_interval = heartbeat_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
         self.verbose = verbose
+        self.codec = codec or default_codec
+        self.clock = clock or ClockSync()
 
-        # callback placeholder
+        # callback placeholder: on_message ham metni, on_data decode edilmis mesaji alir.
+        # Ikisi de okuma dongusunde degil, dispatcher'in thread havuzunda calisir.
         self.on_message: Optional[Callable[[str], None]] = None
+        self.on_data: Optional[Callable[[Any], None]] = None
+
+        # Okuma dongusu mesajlari kuyruga birakir; yavas tuketici soketi durdurmaz
+        self.dispatcher = dispatcher or Dispatcher()
+        self.dispatcher.subscribe(self._deliver)
 
         # İc durum
         self._last_heartbeat = 0.0
-        self._ws: Optional[WebSocketClientProtocol] = None
+        self._ws: Optional["WebSocketClientProtocol"] = None
+        self._supervisor: Optional["asyncio.Task[None]"] = None
+        self._closing = False
+        self._subscriptions: Dict[str, Set[str]] = {}
+        self._last_message_at: Optional[float] = None
+        self._gap_start: Optional[float] = None
+
+        # Istatistikler (sureler sn)
+        self.connects = 0
+        self.disconnects = 0
+        self.reconnects = 0
+        self.reconnect_failures = 0
+        self.last_reconnect_time: Optional[float] = None
+        self.total_reconnect_time = 0.0
+        self.last_gap: Optional[float] = None
+        self.max_gap = 0.0
+        self.total_gap = 0.0
 
     def _timestamp(self) -> str:
-        """su anki Unix timestamp'ini saniye cinsinden string olarak doner."""
-        return str(int(time.time()))
+        """Sunucu saatine gore duzeltilmis Unix timestamp'i (sn, string)."""
+        return self.clock.timestamp()
 
     def _make_signature(self, path: str, body_str: str, timestamp: str) -> str:
         """
         HMAC-SHA256 imzasi olusturur ve base64 ile kodlar.
 
-        İmza girdisi: "{client_key}|{path}|{body}|{timestamp}"
+        İmza girdisi: "{client_key}|{path}|{body}|{timestamp}"; REST ile ayni
+        signing.Signer kullanilir.
         """
-        raw = f"{self._client_key}|{path}|{body_str}|{timestamp}"
-        mac = hmac.new(
-            self._secret_key.encode('utf-8'),
-            raw.encode('utf-8'),
-            digestmod=hashlib.sha256
-        ).digest()
-        return base64.b64encode(mac).decode('utf-8')
+        return self.signer.sign(path, body_str.encode('utf-8'), timestamp)
 
     async def connect(self):
         """
-        WebSocket baglantisini baslatir, header'lari ekler ve
-        alici/gonderici dongulerini tetikler.
+        Ilk baglantiyi kurar (basarisizsa hatayi firlatir) ve baglanti
+        denetcisini baslatir. Denetci tek bir okuma ve tek bir heartbeat
+        task'i calistirir; baglanti koparsa geri cekilmeyle yeniden baglanir
+        ve abonelikleri tekrar gonderir. Zaten bagliysa bir sey yapmaz.
         """
+        import asyncio
+        if self._supervisor is not None and not self._supervisor.done():
+            return
+        self._closing = False
+        await self._open()
+        self.connects += 1
+        self.dispatcher.start()
+        self._supervisor = asyncio.ensure_future(self._supervise())
+
+    async def _open(self):
+        """Her seferinde yeniden imzalanan el sikismasiyla baglantiyi acar."""
+        import ssl
+        import websockets
+
         path = '/ws'
         ts = self._timestamp()
         sig = self._make_signature(path, '', ts)
@@ -531,69 +1716,278 @@ class WebSocket:
             'X-Timestamp': ts,
         }
 
-        # Ara sertifikayı içeren dosyanın yolu
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = True
+        options: Dict[str, Any] = {}
+        if self.ws_url.startswith('wss://'):
+            ssl_context = ssl.create_default_context()
+            ssl_context.check_hostname = True
+            options['ssl'] = ssl_context
 
-        # Baglantiyi ac
-        self._ws = await websockets.connect(self.ws_url, ssl=ssl_context, additional_headers=headers)
+        # Baglantiyi ac; el sikismasi yanitinin Date header'i da saat ornegi olur
+        sent = time.time()
+        self._ws = await websockets.connect(self.ws_url, additional_headers=headers, **options)
+        response = getattr(self._ws, "response", None)
+        if response is not None:
+            self.clock.observe(sent, time.time(), response.headers.get("Date"))
         if self.verbose:
-            logger.info(f"✅ WebSocket baglantisi kuruldu: {self.ws_url}")
-        # Gelen mesajlari dinlemeye basla
-        asyncio.create_task(self._receive_loop())
-        # Periyodik heartbeat dongusunu baslat
-        asyncio.create_task(self._send_loop())
+            logger.info("✅ WebSocket baglantisi kuruldu: %s", self.ws_url)
+
+    @staticmethod
+    def _network_errors() -> Tuple[type, ...]:
+        """Yeniden baglanarak atlatilan hatalar; digerleri denetciyi durdurur."""
+        import asyncio
+        import websockets
+        return OSError, asyncio.TimeoutError, websockets.WebSocketException
+
+    async def _check_loop_results(self, results: Sequence[Any]):
+        """
+        Biten okuma/heartbeat task'larinin sonuclari. Ag hatasi yeniden
+        baglanmayla atlatilir; beklenmedik hata traceback ile loglanir,
+        baglanti kapatilir ve hata denetcinin sonucu olarak yukselir.
+        """
+        import asyncio
+        for result in results:
+            if not isinstance(result, BaseException) or isinstance(result, asyncio.CancelledError):
+                continue
+            if isinstance(result, self._network_errors()):
+                logger.warning("WebSocket baglanti hatasi: %r", result)
+                continue
+            logger.error("WebSocket dongusu beklenmedik hatayla durdu; yeniden baglanilmayacak",
+                         exc_info=result)
+            await self._close_socket()
+            raise result
+
+    async def _supervise(self):
+        """
+        Baglanti denetcisi: okuma ve heartbeat task'larindan biri bitince
+        (baglanti kapandi / gonderim hatasi) digerini iptal eder, yeniden
+        baglanir ve abonelikleri tek seferde tekrar gonderir. Ag disi bir
+        hata loglanir ve denetci o hatayla durur.
+        """
+        import asyncio
+        while True:
+            tasks = (asyncio.ensure_future(self._receive_loop()),
+                     asyncio.ensure_future(self._send_loop()))
+            try:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+            if self._closing:
+                return
+            await self._check_loop_results(results)
+
+            down = time.monotonic()
+            # Kor kalinan sure kopmadan onceki son mesajdan olculur
+            self._gap_start = self._last_message_at or down
+            self.disconnects += 1
+            if self.verbose:
+                logger.info("🔄 Baglanti kapandi, yeniden baglaniliyor...")
+            await self._close_socket()
+            await self._reconnect()
+            self.last_reconnect_time = time.monotonic() - down
+            self.total_reconnect_time += self.last_reconnect_time
+            self.reconnects += 1
+            if self.verbose:
+                logger.info("WebSocket %.2f sn sonra yeniden baglandi", self.last_reconnect_time)
+
+    async def _reconnect(self):
+        """
+        Baglanti kurulana kadar full jitter ustel geri cekilmeyle dener. Ag
+        disi bir hata loglanir ve yukselir (denetci durur).
+        """
+        import asyncio
+        import random
+        network_errors = self._network_errors()
+        attempt = 0
+        while True:
+            cap = min(self.max_reconnect_delay, self.reconnect_delay * 2 ** attempt)
+            await asyncio.sleep(random.uniform(0.0, cap))
+            attempt += 1
+            try:
+                await self._open()
+            except network_errors as e:
+                self.reconnect_failures += 1
+                logger.warning("WebSocket yeniden baglanma denemesi %d basarisiz: %s", attempt, e)
+                continue
+            except Exception:
+                logger.exception("WebSocket yeniden baglanma denemesi %d beklenmedik hatayla "
+                                 "durdu", attempt)
+                raise
+            try:
+                await self._resubscribe()
+            except network_errors:
+                # Okuma dongusu kapanisi gorur, denetci yeniden dener
+                pass
+            except Exception:
+                logger.exception("Abonelikler yeniden gonderilemedi")
+                await self._close_socket()
+                raise
+            return
+
+    async def _resubscribe(self):
+        """
+        Izlenen abonelikleri kanal basina tek mesajla (sembol cok ise
+        MAX_SYMBOLS_PER_MESSAGE'lik parcalarla) ard arda gonderir.
+        """
+        payloads = [
+            {"Token": self._jwt_token, "Type": f"Add{channel}", "Symbols": part}
+            for channel, symbols in self._subscriptions.items()
+            for part in chunked(sorted(symbols), MAX_SYMBOLS_PER_MESSAGE)
+        ]
+        for payload in payloads:
+            await self._send_raw(payload)
+        if payloads and self.verbose:
+            logger.info("Abonelikler yenilendi: %s",
+                        {f"Add{c}": len(s) for c, s in self._subscriptions.items() if s})
+
+    async def _close_socket(self):
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            try:
+                await ws.close()
+            except Exception:
+                pass
+
+    async def close(self):
+        """Denetciyi ve task'larini durdurur, baglantiyi kapatir, kuyrugu bosaltir."""
+        import asyncio
+        self._closing = True
+        supervisor, self._supervisor = self._supervisor, None
+        if supervisor is not None:
+            supervisor.cancel()
+            await asyncio.gather(supervisor, return_exceptions=True)
+        await self._close_socket()
+        await self.dispatcher.stop()
+
+    def _needs_decode(self) -> bool:
+        return (self.on_data is not None or self.dispatcher.policy is Overflow.CONFLATE
+                or self.dispatcher.handler_count > 1)
 
     async def _receive_loop(self):
         """
-        WebSocket uzerinden gelen her mesaji alir.
-        Eger on_message callback atanmissa oraya, degilse verbose modda logger.info'e yollar.
-        Baglanti kapanirsa otomatik reconnect dener.
+        WebSocket uzerinden gelen her mesaji alir ve dispatcher kuyruguna
+        birakir; handler'lari beklemez. Mesaj, gereken bir tuketici varsa
+        (on_data, conflation, ek handler) burada bir kez decode edilir.
+        Baglanti kapaninca doner; yeniden baglanma denetcinin isidir.
         """
+        import websockets
         assert self._ws is not None
+        put = self.dispatcher.put
         try:
             async for msg in self._ws:
-                if callable(self.on_message):
-                    self.on_message(msg)
-                elif self.verbose:
-                    logger.info("Gelen mesaj: %s", msg)
+                now = time.monotonic()
+                if self._gap_start is not None:
+                    self.last_gap = now - self._gap_start
+                    self.total_gap += self.last_gap
+                    self.max_gap = max(self.max_gap, self.last_gap)
+                    self._gap_start = None
+                self._last_message_at = now
+                data = None
+                if self._needs_decode():
+                    try:
+                        data = self.codec.loads(msg)
+                    except ValueError:
+                        logger.warning("JSON olmayan mesaj: %s", msg)
+                await put(WSMessage(msg, data))
         except websockets.ConnectionClosed:
-            if self.verbose:
-                logger.info("🔄 Baglanti kapandi, yeniden baglaniliyor...")
-            await self.connect()
+            pass
+
+    def _deliver(self, message: WSMessage):
+        """Dispatcher thread'inde: on_data'ya icerigi, on_message'a ham metni verir."""
+        if self.on_data is not None and message.data is not None:
+            self.on_data(message.data)
+        if callable(self.on_message):
+            self.on_message(message.raw)
+        elif self.on_data is None and self.verbose:
+            logger.info("Gelen mesaj: %s", message.raw)
+
+    def add_handler(self, handler: Callable[[WSMessage], Any]):
+        """
+        Ek mesaj handler'i; WSMessage(raw, data) alir. `async def` handler'lar
+        WS event loop'unda beklenir, digerleri dispatcher thread'lerinde calisir.
+        """
+        self.dispatcher.subscribe(handler)
 
     async def _send_loop(self):
         """
-        Belirlenen interval kadar bekleyip her seferinde
-        sadece H tipi heartbeat mesaji yollar.
+        Son heartbeat'ten `heartbeat_interval` sn gecince H tipi heartbeat
+        yollar; gonderim hatasi denetciye baglantinin koptugunu bildirir.
         """
-        assert self._ws is not None
+        import asyncio
         while True:
-            now = time.time()
-            if now - self._last_heartbeat >= self.heartbeat_interval:
-                self._last_heartbeat = now
-                # Heartbeat mesaji
-                await self._send({
-                    "Token": self._jwt_token,
-                    "Type": "H",
-                    "Symbols": []
-                })
-            # CPU kullanimini sinirlamak icin kisa uyku
-            await asyncio.sleep(1)
+            wait = self._last_heartbeat + self.heartbeat_interval - time.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            self._last_heartbeat = time.time()
+            # Heartbeat mesaji
+            await self._send_raw({
+                "Token": self._jwt_token,
+                "Type": "H",
+                "Symbols": []
+            })
+
+    def _track(self, payload: dict):
+        """AddX / RemoveX mesajlarini kanal (T, Y, D) bazli abonelik kumesine isler."""
+        typ = payload.get("Type")
+        if not isinstance(typ, str):
+            return
+        if typ.startswith("Add"):
+            self._subscriptions.setdefault(typ[3:], set()).update(payload.get("Symbols") or ())
+        elif typ.startswith("Remove"):
+            self._subscriptions.get(typ[6:], set()).difference_update(payload.get("Symbols") or ())
+
+    @property
+    def subscriptions(self) -> Dict[str, Set[str]]:
+        """Kanal → abone olunan semboller; yeniden baglanınca bu kume gonderilir."""
+        return {channel: set(symbols)
+                for channel, symbols in self._subscriptions.items() if symbols}
 
     async def _send(self, payload: dict):
         """
         Verilen sozlugu JSON'a cevirir ve WebSocket uzerinden gonderir.
+        Abonelik mesajlari izlenir; baglanti o an kopuksa abonelik kaydedilir
+        ve yeniden baglaninca gonderilir.
         """
-        assert self._ws is not None
-        msg = json.dumps(payload)
+        import websockets
+        self._track(payload)
+        try:
+            await self._send_raw(payload)
+        except (websockets.ConnectionClosed, ConnectionError):
+            if not str(payload.get("Type", "")).startswith(("Add", "Remove")):
+                raise
+            logger.info("Baglanti kopuk; abonelik yeniden baglaninca gonderilecek: %s",
+                        payload.get("Type"))
+
+    async def _send_raw(self, payload: dict):
+        if self._ws is None:
+            raise ConnectionError("WebSocket bagli degil")
+        msg = self.codec.dumps_str(payload)
         await self._ws.send(msg)
         if self.verbose:
             logger.info("Gönderilen mesaj: %s", msg)
 
+    def stats(self) -> Dict[str, Any]:
+        """Baglanti sayaclari; sureler sn cinsinden."""
+        return {
+            "connected":            self._ws is not None and self._supervisor is not None,
+            "connects":             self.connects,
+            "disconnects":          self.disconnects,
+            "reconnects":           self.reconnects,
+            "reconnect_failures":   self.reconnect_failures,
+            "last_reconnect_time":  self.last_reconnect_time,
+            "total_reconnect_time": self.total_reconnect_time,
+            "last_gap":             self.last_gap,
+            "max_gap":              self.max_gap,
+            "total_gap":            self.total_gap,
+            "subscriptions":        {c: len(s) for c, s in self._subscriptions.items() if s},
+        }
+
 
     def start(self):
         """
         Senkron olarak event loop baslatir ve connect() metodunu calistirir.
         """
+        import asyncio
         asyncio.get_event_loop().run_until_complete(self.connect())
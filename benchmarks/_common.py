@@ -0,0 +1,25 @@
+"""
+Benchmark scriptleri icin ortak yardimcilar.
+
+Depo kok dizinini `sys.path`'e ekler (api_client, transport ... dogrudan
+import edilebilsin diye) ve gecikme ornekleri icin ozet istatistik verir.
+"""
+
+import os
+import statistics
+import sys
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def summarize(name: str, samples: List[float]) -> str:
+    """Saniye cinsinden orneklerden ms bazli tek satirlik ozet uretir."""
+    ordered = sorted(samples)
+    p50 = ordered[len(ordered) // 2]
+    p90 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+    return (f"{name:<24} n={len(samples):<5} "
+            f"mean={statistics.fmean(samples) * 1e3:8.3f} ms  "
+            f"p50={p50 * 1e3:8.3f} ms  p90={p90 * 1e3:8.3f} ms")
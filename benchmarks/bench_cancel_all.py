@@ -0,0 +1,148 @@
+"""
+bench_cancel_all.py
+
+Acik emirlerin hepsini iptal etmenin uctan uca suresi, yerel MockServer'a
+karsi:
+
+- sirali  : get_stock_order_list sayfalari ve get_future_order_list tek tek
+            alinir, sonra her emir icin silme istegi sirayla gonderilir
+- API.cancel_all / AsyncAPI.cancel_all : listeleme akarken silmeler es
+            zamanli, CANCEL onceliginde gonderilir
+
+Iki yol da ayni limiter ayarlariyla calisir (`--rate`, `--burst`); emir
+defteri her turda yeniden olusturulur.
+
+    python benchmarks/bench_cancel_all.py [--stock 120] [--future 30] [--latency 0.02]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+
+import _common  # noqa: F401  (sys.path ayari)
+from api_client import API, AsyncAPI
+from mock_server import MockServer
+from rate_limit import RateLimiter
+from token_store import TokenStore
+
+PAGE_SIZE = 25
+STATUSES = ("NEW", "SUBMITTED", "PARTIALLY_REALIZED", "REALIZED", "CANCELLED")
+
+
+class OrderBook:
+    """MockServer route'lari: sayfali pay emir listesi, vadeli liste ve silme."""
+
+    def __init__(self, stock: int, future: int):
+        self.lock = threading.Lock()
+        self.stock = [self._order(f"S{i}", i) for i in range(stock)]
+        self.future = [self._order(f"F{i}", i) for i in range(future)]
+        self.deleted: List[str] = []
+
+    @staticmethod
+    def _order(ref: str, i: int) -> Dict[str, Any]:
+        return {"orderRef": ref, "equityCode": "GARAN", "quantity": 10,
+                "price": 100.0 + i, "orderStatus": STATUSES[i % len(STATUSES)]}
+
+    def open_count(self) -> int:
+        return sum(o["orderStatus"] not in ("REALIZED", "CANCELLED")
+                   for o in self.stock + self.future)
+
+    def routes(self):
+        def stock_list(payload):
+            page = int(payload.get("pageNumber") or 1)
+            items = self.stock[(page - 1) * PAGE_SIZE: page * PAGE_SIZE]
+            return 200, {"statusCode": 200, "data": items}
+
+        def future_list(payload):
+            items = [o for o in self.future
+                     if not payload.get("pendingOrders") or o["orderStatus"] != "CANCELLED"]
+            return 200, {"statusCode": 200, "data": items}
+
+        def delete(payload):
+            with self.lock:
+                self.deleted.append(payload["orderRef"])
+            return 200, {"statusCode": 200, "data": {"orderRef": payload["orderRef"]}}
+
+        return {
+            "/Stock/StockOrderList":     stock_list,
+            "/Future/FutureOrderList":   future_list,
+            "/Stock/StockDeleteOrder":   delete,
+            "/Future/FutureDeleteOrder": delete,
+        }
+
+
+def sequential(api: API, portfolio: int) -> int:
+    """Eski yontem: once tum liste, sonra tek tek silme."""
+    stock: List[Dict[str, Any]] = []
+    fetch = api._order_page_fetcher(portfolio)
+    page = 1
+    while True:
+        items = api._page_items(fetch(page))
+        if not items:
+            break
+        stock.extend(items)
+        page += 1
+    future = api._page_items(api.get_future_order_list(
+        portfolio, None, None, None, None, True, None, None, None, None))
+    sent = 0
+    for market, orders in (("stock", stock), ("future", future)):
+        for order in orders:
+            if api._cancel_ref(order, None, None) is None:
+                continue
+            if market == "stock":
+                api.get_stock_delete_order(portfolio, order["orderRef"])
+            else:
+                api.get_future_delete_order(portfolio, order["orderRef"])
+            sent += 1
+    return sent
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stock", type=int, default=120, help="pay emir sayisi")
+    parser.add_argument("--future", type=int, default=30, help="vadeli emir sayisi")
+    parser.add_argument("--latency", type=float, default=0.02, help="sunucu gecikmesi (sn)")
+    parser.add_argument("--rate", type=float, default=50.0, help="grup basina istek/sn")
+    parser.add_argument("--burst", type=int, default=10)
+    parser.add_argument("-n", type=int, default=3, help="tekrar sayisi")
+    args = parser.parse_args()
+
+    limits = {g: (args.rate, args.burst) for g in ("Stock", "Future", "Portfolio")}
+    with tempfile.TemporaryDirectory() as token_dir:
+        store = TokenStore(os.path.join(token_dir, "api_settings.json"))
+        common = dict(api_key="k", secret_key="s", verbose=False, token_store=store)
+
+        for name in ("sirali", "API.cancel_all", "AsyncAPI.cancel_all"):
+            samples = []
+            for _ in range(args.n):
+                book = OrderBook(args.stock, args.future)
+                with MockServer(routes=book.routes(), latency=args.latency) as server:
+                    t0 = time.perf_counter()
+                    if name == "AsyncAPI.cancel_all":
+                        async def run():
+                            async with AsyncAPI(api_url=server.url, limiter=RateLimiter(limits),
+                                                **common) as api:
+                                return await api.cancel_all(1)
+                        report = asyncio.run(run())
+                        sent = len(report.results)
+                    else:
+                        api = API(api_url=server.url, validate="lazy",
+                                  limiter=RateLimiter(limits), **common)
+                        if name == "sirali":
+                            sent = sequential(api, 1)
+                        else:
+                            report = api.cancel_all(1)
+                            sent = len(report.results)
+                            assert report.complete, report
+                        api.close()
+                    samples.append(time.perf_counter() - t0)
+                    assert sent == book.open_count() == len(book.deleted), (sent, book.open_count())
+            print(_common.summarize(name, samples), f"iptal={sent}")
+
+
+if __name__ == "__main__":
+    main()
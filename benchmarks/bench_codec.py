@@ -0,0 +1,71 @@
+"""
+bench_codec.py
+
+JSON codec mikro-benchmark'i: stdlib `json` ile `orjson` karsilastirmasi.
+
+- encode : tipik bir emir govdesi (StockCreateOrder)
+- decode : buyuk bir StockOrderList yaniti
+- _post  : eski yol (yanit iki kez parse) ile tek parse karsilastirmasi
+
+    python benchmarks/bench_codec.py [-n 20000]
+"""
+
+import argparse
+import timeit
+
+import _common  # noqa: F401  (sys.path ayari)
+
+from codec import JSONCodec, OrjsonCodec, orjson
+
+ORDER = {
+    "portfolioNumber": 123456,
+    "equityCode": "GARAN",
+    "quantity": 100,
+    "direction": "BUY",
+    "price": 112.45,
+    "orderMethod": "LIMIT",
+    "orderDuration": "DAILY",
+    "marketRiskApproval": True,
+}
+
+
+def order_list(n: int) -> bytes:
+    rows = [dict(ORDER, orderRef=f"REF{i:08d}", orderStatus="REALIZED",
+                 realizedQuantity=100, orderDate="2026-10-16T10:15:00")
+            for i in range(n)]
+    return JSONCodec().dumps({"statusCode": 200, "data": rows})
+
+
+def bench(label: str, stmt, number: int):
+    best = min(timeit.repeat(stmt, number=number, repeat=5))
+    print(f"{label:<34} {number / best:>12,.0f} ops/s   {best / number * 1e6:9.2f} us/op")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=20000)
+    args = parser.parse_args()
+
+    codecs = [JSONCodec()]
+    if orjson is not None:
+        codecs.append(OrjsonCodec())
+    else:
+        print("(orjson kurulu degil; yalnizca stdlib olculuyor)")
+
+    big = order_list(500)
+    print(f"StockOrderList yaniti: {len(big) / 1024:.0f} KiB, 500 emir\n")
+
+    for c in codecs:
+        bench(f"{c.name}: encode order", lambda: c.dumps(ORDER), args.n)
+    for c in codecs:
+        bench(f"{c.name}: decode order list", lambda: c.loads(big), max(1, args.n // 200))
+
+    print()
+    for c in codecs:
+        bench(f"{c.name}: _post eski (2x parse)", lambda: (c.loads(big), c.loads(big)),
+              max(1, args.n // 200))
+        bench(f"{c.name}: _post yeni (1x parse)", lambda: c.loads(big), max(1, args.n // 200))
+
+
+if __name__ == "__main__":
+    main()
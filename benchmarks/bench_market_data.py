@@ -0,0 +1,84 @@
+"""
+bench_market_data.py
+
+Sembol basina son deger okumasi: eski yol (sembol → son ham mesaj sozlugu,
+okurken JSON'u cozup fiyati cekmek) ile `market_data.MarketData` (yazarken
+bir kez cozulur, sutunlara yazilir; okuma seqlock ile kilitsiz). Yazma
+maliyeti ve `snapshot` da olculur. Ag yoktur; yalnizca CPU olculur.
+
+    python benchmarks/bench_market_data.py [--symbols 2000] [-n 200000]
+"""
+
+import argparse
+import random
+import time
+
+import _common  # noqa: F401  (sys.path ayari)
+from codec import default_codec
+from market_data import MarketData
+from ws_dispatch import WSMessage
+
+
+def messages(symbols, n):
+    rnd = random.Random(7)
+    for i in range(n):
+        yield default_codec.dumps_str({
+            "Type": "T", "Symbol": rnd.choice(symbols), "Price": round(100 + rnd.random() * 10, 2),
+            "Quantity": rnd.randint(1, 1000), "Side": rnd.choice(("BUY", "SELL")), "Seq": i,
+        })
+
+
+def rate(name, count, elapsed, unit):
+    print(f"{name:<28} {count / elapsed:>12,.0f} {unit}/sn  {elapsed / count * 1e6:6.2f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=2000)
+    parser.add_argument("-n", type=int, default=200_000, help="mesaj / okuma sayisi")
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i:04d}" for i in range(args.symbols)]
+    raw = list(messages(symbols, args.n))
+    decoded = [WSMessage(m, default_codec.loads(m)) for m in raw]
+    reads = [random.Random(11).choice(symbols) for _ in range(args.n)]
+
+    # Eski yol: son ham mesaji sakla, okurken coz
+    latest = {}
+    t0 = time.perf_counter()
+    for m in raw:
+        latest[m[m.index('"Symbol":"') + 10:].split('"', 1)[0]] = m
+    rate("dict[ham] yazma", args.n, time.perf_counter() - t0, "mesaj")
+    t0 = time.perf_counter()
+    for s in reads:
+        float(default_codec.loads(latest[s])["Price"])
+    rate("dict[ham] okuma (loads)", args.n, time.perf_counter() - t0, "okuma")
+
+    market = MarketData()
+    t0 = time.perf_counter()
+    for m in decoded:
+        market.on_message(m)
+    rate("MarketData yazma", args.n, time.perf_counter() - t0, "mesaj")
+    t0 = time.perf_counter()
+    for s in reads:
+        market.last_price(s)
+    rate("MarketData.last_price", args.n, time.perf_counter() - t0, "okuma")
+    t0 = time.perf_counter()
+    for s in reads:
+        market.get_last(s)
+    rate("MarketData.get_last", args.n, time.perf_counter() - t0, "okuma")
+
+    rounds = max(1, args.n // args.symbols // 10)
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        market.snapshot()
+    elapsed = time.perf_counter() - t0
+    print(f"{'MarketData.snapshot':<28} {elapsed / rounds * 1e3:12.3f} ms / {len(symbols)} sembol")
+
+    for s in symbols[:50]:
+        assert market.last_price(s) == float(default_codec.loads(latest[s])["Price"]), s
+    print(market.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+bench_models.py
+
+Buyuk bir StockOrderList yaniti icin ham sozluk, model ve sutunlu tablo
+karsilastirmasi.
+
+- bellek : yanit decode edildikten sonra tutulan veri (tracemalloc)
+- tarama : tum emirler uzerinde `price * quantity` toplami
+- erisim : tek alan okuma (ilk erisim ve onbellekten)
+
+    python benchmarks/bench_models.py [-n 20000]
+"""
+
+import argparse
+import gc
+import timeit
+import tracemalloc
+
+import _common  # noqa: F401  (sys.path ayari)
+
+from codec import default_codec
+from models import Order, Table
+
+STATUSES = ("NEW", "SUBMITTED", "REALIZED", "CANCELLED")
+
+
+def order_list(n: int) -> bytes:
+    rows = [{
+        "orderRef": f"REF{i:08d}",
+        "portfolioNumber": 123456,
+        "equityCode": ("GARAN", "THYAO", "ASELS", "AKBNK")[i % 4],
+        "direction": "BUY" if i % 2 else "SELL",
+        "quantity": 100 + i % 50,
+        "realizedQuantity": i % 100,
+        "price": 10.0 + (i % 1000) / 100,
+        "orderMethod": "LIMIT",
+        "orderDuration": "DAILY",
+        "orderStatus": STATUSES[i % 4],
+        "orderDate": "2026-10-16T10:15:00",
+    } for i in range(n)]
+    return default_codec.dumps({"statusCode": 200, "data": rows})
+
+
+def retained(build) -> int:
+    """`build()` sonucunun ayakta tuttugu bellek (byte)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def bench(label: str, stmt, number: int):
+    best = min(timeit.repeat(stmt, number=number, repeat=5))
+    print(f"{label:<34} {best / number * 1e3:9.3f} ms/op")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=20000, help="emir sayisi")
+    args = parser.parse_args()
+
+    payload = order_list(args.n)
+    print(f"StockOrderList yaniti: {len(payload) / 1024:.0f} KiB, {args.n} emir "
+          f"(codec={default_codec.name})\n")
+
+    columns = ["orderRef", "equityCode", "quantity", "price", "orderStatus"]
+    print("Bellek (decode sonrasi tutulan):")
+    raw_size = retained(lambda: default_codec.loads(payload)["data"])
+    model_size = retained(lambda: Order.list_from(default_codec.loads(payload)))
+    table_size = retained(lambda: Table.from_response(default_codec.loads(payload)))
+    narrow_size = retained(lambda: Table.from_response(default_codec.loads(payload), columns))
+    for label, size in (("ham sozluk", raw_size), ("Order modelleri", model_size),
+                        ("Table (tum sutunlar)", table_size),
+                        (f"Table ({len(columns)} sutun)", narrow_size)):
+        print(f"  {label:<32} {size / 1024 / 1024:8.2f} MiB")
+
+    rows = default_codec.loads(payload)["data"]
+    orders = Order.list_from({"data": rows})
+    table = Table.from_rows(rows)
+    number = max(1, 200000 // args.n)
+
+    print("\nTarama (sum price*quantity):")
+    bench("ham sozluk", lambda: sum(r["price"] * r["quantity"] for r in rows), number)
+    bench("Order (ilk erisim)", lambda: sum(
+        o.price * o.quantity for o in Order.list_from({"data": rows})), number)
+    bench("Order (onbellekten)", lambda: sum(o.price * o.quantity for o in orders), number)
+    bench("Table sutunlari", lambda: sum(
+        p * q for p, q in zip(table["price"], table["quantity"])), number)
+
+    print("\nKurulum:")
+    bench("Order.list_from", lambda: Order.list_from({"data": rows}), number)
+    bench("Table.from_rows", lambda: Table.from_rows(rows), number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+bench_resilience.py
+
+Hata enjekte edilen MockServer'a karsi okuma isteklerinin basari orani ve
+gecikmesi: tekrar denemesiz (NO_RETRY) ve varsayilan RetryPolicy.
+
+Ikinci bolumde endpoint tamamen 503 donerken devre kesicinin etkisi olculur:
+kesici olmadan her istek tum denemeleri harcar; kesici acildiktan sonra
+istekler sunucuya gitmeden CircuitOpenError ile hemen reddedilir.
+
+    python benchmarks/bench_resilience.py [-n 300] [--error-rate 0.2] [--drop-rate 0.05]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from _common import summarize
+from api_client import API
+from errors import APIError
+from mock_server import MockServer
+from rate_limit import RateLimiter
+from resilience import NO_RETRY, CircuitBreakers, RetryPolicy
+from token_store import TokenStore
+from transport import HTTPTransport
+
+
+# Sunucu tarafi hatalar olculsun diye istemci limiti pratikte kapatilir
+LIMITS = {"Portfolio": (1e6, 1000)}
+
+
+def make_api(url: str, token_dir: str, retry: RetryPolicy, breakers: CircuitBreakers) -> API:
+    return API(api_url=url, api_key="k", secret_key="s", verbose=False, validate="lazy",
+               limiter=RateLimiter(LIMITS),
+               transport=HTTPTransport(verify=False, connect_timeout=1.0, read_timeout=1.0),
+               token_store=TokenStore(os.path.join(token_dir, "api_settings.json")),
+               retry=retry, breakers=breakers)
+
+
+def run(api: API, n: int):
+    samples, failures = [], 0
+    for i in range(n):
+        t0 = time.perf_counter()
+        try:
+            with api.request_options(cache=False):
+                api.get_account_summary(portfolio_number=i)
+        except APIError:
+            failures += 1
+        samples.append(time.perf_counter() - t0)
+    return samples, failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=300)
+    parser.add_argument("--error-rate", type=float, default=0.2, help="503 orani")
+    parser.add_argument("--drop-rate", type=float, default=0.05, help="kopan baglanti orani")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    faults = {503: args.error_rate, "drop": args.drop_rate}
+    # Devre kesici bu bolumde devreye girmesin diye esik yuksek tutulur
+    loose = dict(failure_threshold=10 ** 6)
+    with tempfile.TemporaryDirectory() as token_dir:
+        for name, policy in (("no retry", NO_RETRY), ("RetryPolicy()", RetryPolicy())):
+            with MockServer(faults=faults, seed=args.seed) as server:
+                api = make_api(server.url, token_dir, policy, CircuitBreakers(**loose))
+                samples, failures = run(api, args.n)
+                api.close()
+                print(summarize(name, samples),
+                      f"ok={1 - failures / args.n:6.1%}  server_requests={server.requests}")
+
+        print()
+        n = max(20, args.n // 10)
+        for name, breakers in (("503, kesici yok", CircuitBreakers(**loose)),
+                               ("503, kesici (5 hata)", CircuitBreakers(failure_threshold=5))):
+            with MockServer(faults={503: 1.0}) as server:
+                api = make_api(server.url, token_dir, RetryPolicy(base_delay=0.05), breakers)
+                samples, _ = run(api, n)
+                stats = breakers.get(api._path("Portfolio/AccountSummary")).stats()
+                api.close()
+                print(summarize(name, samples),
+                      f"server_requests={server.requests}  rejected={stats['rejected']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+bench_signing.py
+
+Istek basina imzalama maliyeti: eski yol (secret encode + `hmac.new` +
+header sozlugu + URL formatlama her istekte) ile `signing.Signer` /
+`RequestTemplate` (onceden anahtarlanmis HMAC'in kopyasi, hazir path/URL/
+sabit header'lar). Ag yoktur; yalnizca CPU olculur.
+
+    python benchmarks/bench_signing.py [-n 200000]
+"""
+
+import argparse
+import base64
+import hashlib
+import hmac
+import time
+
+import _common  # noqa: F401  (sys.path ayari)
+from codec import default_codec
+from signing import Signer
+
+API_URL = "https://api.codyalgo.com"
+API_KEY = "api-key-0123456789abcdef"
+SECRET = "secret-0123456789abcdef0123456789abcdef"
+JWT = "eyJhbGciOiJIUzI1NiJ9.eyJleHAiOjE4MDAwMDAwMDB9.sig"
+PATH = "/Stock/CreateOrder"
+PAYLOAD = {
+    "portfolioNumber": 123456, "equityCode": "GARAN", "quantity": 100,
+    "direction": "BUY", "price": 112.5, "orderMethod": "LMT", "orderDuration": "DAY",
+}
+
+
+def legacy(body: bytes, ts: str):
+    raw = f"{API_KEY}|{PATH}|".encode("utf-8") + body + f"|{ts}".encode("utf-8")
+    mac = hmac.new(SECRET.encode("utf-8"), raw, digestmod=hashlib.sha256).digest()
+    sig = base64.b64encode(mac).decode("utf-8")
+    headers = {
+        "X-ClientKey": API_KEY,
+        "X-Timestamp": ts,
+        "X-Signature": sig,
+        "Content-Type": "application/json; charset=utf-8",
+        "Accept":       "application/json; charset=utf-8",
+        "Authorization": f"Bearer {JWT}",
+    }
+    return f"{API_URL}{PATH}", headers
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=200_000)
+    args = parser.parse_args()
+
+    body = default_codec.dumps(PAYLOAD)
+    ts = str(int(time.time()))
+    signer = Signer(API_KEY, SECRET)
+
+    def templated(body: bytes, ts: str):
+        tpl = signer.template(PATH, API_URL)
+        return tpl.url, tpl.headers(body, ts, JWT)
+
+    old_url, old_headers = legacy(body, ts)
+    assert templated(body, ts) == (old_url, old_headers), "imzalar farkli"
+
+    results = {}
+    for name, fn in (("legacy hmac.new", legacy), ("Signer template", templated)):
+        t0 = time.perf_counter()
+        for _ in range(args.n):
+            fn(body, ts)
+        elapsed = time.perf_counter() - t0
+        results[name] = args.n / elapsed
+        print(f"{name:<18} {results[name]:>12,.0f} imza/sn  {elapsed / args.n * 1e6:6.2f} us/istek")
+    print(f"hizlanma: {results['Signer template'] / results['legacy hmac.new']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+bench_startup.py
+
+Istemcinin acilis maliyeti: `import api_client` suresi ve kaydedilmis token
+ile `API(...)` olusturma suresi (validate="sync" | "background" | "lazy").
+
+Her olcum temiz bir Python sureci icinde yapilir; token dosyasi gecici bir
+dizinde olusturulur. Sunucu gecikmesi `--latency` ile taklit edilir.
+
+    python benchmarks/bench_startup.py [-n 10] [--latency 0.05]
+"""
+
+import argparse
+import base64
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from _common import ROOT, summarize
+from mock_server import MockServer
+
+IMPORT_SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+import api_client
+print(time.perf_counter() - t0)
+"""
+
+CONSTRUCT_SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+import api_client
+t0 = time.perf_counter()
+api = api_client.API(api_url={url!r}, api_key="k", secret_key="s",
+                     verbose=False, validate={mode!r})
+print(time.perf_counter() - t0)
+api.close()
+"""
+
+
+def fake_jwt(ttl: float = 3600) -> str:
+    """Yalnizca `exp` claim'i olan, imzasiz test token'i."""
+    claims = json.dumps({"exp": int(time.time() + ttl)}).encode()
+    payload = base64.urlsafe_b64encode(claims).decode().rstrip("=")
+    return f"eyJhbGciOiJIUzI1NiJ9.{payload}.sig"
+
+
+def run(script: str, cwd: str, n: int) -> list:
+    samples = []
+    for _ in range(n):
+        with open(os.path.join(cwd, "api_settings.json"), "w", encoding="utf-8") as f:
+            json.dump({"jwtToken": fake_jwt()}, f)
+        out = subprocess.run([sys.executable, "-c", script], cwd=cwd, check=True,
+                             capture_output=True, text=True).stdout
+        samples.append(float(out.strip().splitlines()[-1]))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="sunucu yanit gecikmesi (sn)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cwd, MockServer(latency=args.latency) as server:
+        print(summarize("import api_client", run(IMPORT_SCRIPT.format(root=ROOT), cwd, args.n)))
+        for mode in ("sync", "background", "lazy"):
+            script = CONSTRUCT_SCRIPT.format(root=ROOT, url=server.url, mode=mode)
+            print(summarize(f"API validate={mode}", run(script, cwd, args.n)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+bench_tick_recorder.py
+
+Tick kaydinin alma yolundaki maliyeti ve geri okuma suresi:
+
+- JSONL    : her ham mesaj bir satir olarak dosyaya yazilir (ws_logger
+             pipe'ina benzer en basit cikis); okurken her satir cozulur
+- Recorder : `tick_recorder.TickRecorder` sutunlu mmap segmentlerine yazar;
+             okuma `load_columns` ile kopyasiz
+
+JSONL yalnizca string yazar; recorder her tick'te alanlari float'a cevirir,
+bu yuzden ortalama tick maliyeti JSONL'den yuksektir. WS loop'u icin asil
+olcu cagri basina en kotu gecikmedir (p99.9 / max): segment olusturma ve
+kapatma yazici thread'de oldugundan rollover tick'leri sicrama yapmamali.
+`--max-open` sembol sayisindan kucukse LRU kapatma yolu da olculur.
+
+Okuma icin NumPy gerekir.
+
+    python benchmarks/bench_tick_recorder.py [--symbols 200] [-n 300000] [--max-open 256]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import _common  # noqa: F401  (sys.path ayari)
+from codec import default_codec
+from tick_recorder import TickRecorder, load_columns, segments
+
+
+def rate(name, count, elapsed):
+    print(f"{name:<26} {count / elapsed:>12,.0f} tick/sn  {elapsed / count * 1e6:6.2f} us")
+
+
+def timed(name, fn, items):
+    """Cagri basina sure; ortalama ile birlikte p99.9 ve max basilir."""
+    clock = time.perf_counter
+    laps = []
+    add = laps.append
+    start = clock()
+    for item in items:
+        t0 = clock()
+        fn(item)
+        add(clock() - t0)
+    elapsed = clock() - start
+    laps.sort()
+    p999 = laps[min(len(laps) - 1, int(len(laps) * 0.999))]
+    rate(name, len(laps), elapsed)
+    print(f"{'':<26} p99.9 {p999 * 1e6:8.1f} us  max {laps[-1] * 1e6:8.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("-n", type=int, default=300_000, help="tick sayisi")
+    parser.add_argument("--segment-rows", type=int, default=1 << 14)
+    parser.add_argument("--max-open", type=int, default=256)
+    args = parser.parse_args()
+
+    import numpy
+
+    rnd = random.Random(3)
+    symbols = [f"SYM{i:03d}" for i in range(args.symbols)]
+    ticks = [{"Type": "T", "Symbol": rnd.choice(symbols), "Price": round(100 + rnd.random(), 2),
+              "Quantity": rnd.randint(1, 500), "Side": rnd.choice(("BUY", "SELL"))}
+             for _ in range(args.n)]
+    raw = [default_codec.dumps_str(t) for t in ticks]
+    probe = symbols[0]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ticks.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            timed("JSONL yazma", lambda line: f.write(line + "\n"), raw)
+
+        t0 = time.perf_counter()
+        with open(path, encoding="utf-8") as f:
+            rows = [default_codec.loads(line) for line in f]
+        prices = numpy.array([r["Price"] for r in rows if r["Symbol"] == probe])
+        jsonl_read = time.perf_counter() - t0
+
+        root = os.path.join(tmp, "rec")
+        recorder = TickRecorder(root, segment_rows=args.segment_rows, rollover=None,
+                                max_open=args.max_open)
+        timed("TickRecorder.record", recorder.record, ticks)
+        t0 = time.perf_counter()
+        recorder.close()
+        elapsed = time.perf_counter() - t0
+        print(f"{'TickRecorder.close':<26} {elapsed * 1e3:12.1f} ms  {recorder.stats()}")
+
+        t0 = time.perf_counter()
+        cols = [load_columns(p) for p in segments(root, probe)]
+        price = numpy.concatenate([c["price"] for c in cols])
+        recorder_read = time.perf_counter() - t0
+
+        assert numpy.array_equal(price, prices), "kayit farkli"
+        print(f"tek sembol okuma: JSONL {jsonl_read * 1e3:.1f} ms, "
+              f"recorder {recorder_read * 1e3:.2f} ms ({len(price)} tick)")
+
+
+if __name__ == "__main__":
+    main()
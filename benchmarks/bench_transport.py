@@ -0,0 +1,68 @@
+"""
+bench_transport.py
+
+Soguk baglanti (her istekte yeni TCP/TLS) ile sicak havuz (HTTPTransport)
+gecikmesini yerel MockServer'a karsi karsilastirir.
+
+    python benchmarks/bench_transport.py [-n 200] [--no-tls]
+"""
+
+import argparse
+import time
+
+import _common  # noqa: F401  (sys.path ayari)
+import requests
+import urllib3
+
+from mock_server import MockServer
+from transport import HTTPTransport
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+BODY = b'{"portfolioNumber":1}'
+HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+
+
+def cold(url: str, n: int) -> list:
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        requests.post(url, data=BODY, headers=HEADERS, timeout=10, verify=False)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def warm(url: str, n: int) -> list:
+    samples = []
+    with HTTPTransport(verify=False) as transport:
+        transport.post(url, BODY, HEADERS)  # havuzu isit
+        for _ in range(n):
+            t0 = time.perf_counter()
+            transport.post(url, BODY, HEADERS)
+            samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=200)
+    parser.add_argument("--no-tls", action="store_true")
+    args = parser.parse_args()
+
+    with MockServer(tls=not args.no_tls) as srv:
+        url = f"{srv.url}/Portfolio/AccountSummary"
+
+        before = srv.connections
+        cold_samples = cold(url, args.n)
+        cold_conns = srv.connections - before
+
+        before = srv.connections
+        warm_samples = warm(url, args.n)
+        warm_conns = srv.connections - before
+
+    print(_common.summarize("cold (requests.post)", cold_samples), f"conns={cold_conns}")
+    print(_common.summarize("warm (HTTPTransport)", warm_samples), f"conns={warm_conns}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+mock_server.py
+
+Benchmark'lar icin api.codyalgo.com yerine gecen yerel HTTP sunucusu.
+
+HTTP/1.1 keep-alive destekler; istege bagli olarak kendinden imzali bir
+sertifika ile TLS acar (sistemde `openssl` varsa). Her POST istegine
+`{"statusCode": 200, "data": ...}` seklinde yanit verir; yol bazli
+yanitlar `routes` ile ozellestirilebilir.
+
+Dayaniklilik testleri icin `faults` ile hata enjekte edilebilir:
+
+    MockServer(faults={503: 0.2, "drop": 0.05, "stall": 0.01}, seed=1)
+
+- HTTP kodu (or. 500, 503, 429): istek bu kodla yanitlanir
+- "drop"  : baglanti yanit verilmeden kapatilir
+- "stall" : yanit `stall_time` sn geciktirilir (istemci zaman asimi)
+
+Oranlar istek basina olasiliktir; `faults` calisirken degistirilebilir.
+"""
+
+import json
+import os
+import random
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+Route = Callable[[Dict[str, Any]], Tuple[int, Any]]
+Fault = Union[int, str]
+
+
+def _default_route(payload: Dict[str, Any]) -> Tuple[int, Any]:
+    return 200, {"statusCode": 200, "data": {"echo": payload}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            payload = json.loads(raw) if raw else {}
+        except ValueError:
+            payload = {}
+        with self.server.stats_lock:
+            self.server.requests += 1
+            fault = self.server.pick_fault()
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if fault == "drop":
+            self.close_connection = True
+            self.connection.close()
+            return
+        if fault == "stall":
+            time.sleep(self.server.stall_time)
+
+        if isinstance(fault, int):
+            status, body = fault, {"statusCode": fault, "message": "injected fault"}
+        else:
+            route = self.server.routes.get(self.path, _default_route)
+            status, body = route(payload)
+        data = json.dumps(body).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+    routes: Dict[str, Route]
+    latency: float
+    connections: int
+    requests: int
+    stats_lock: threading.Lock
+    faults: Dict[Fault, float]
+    stall_time: float
+    rng: random.Random
+    injected: Dict[Fault, int]
+
+    def pick_fault(self) -> Optional[Fault]:
+        """Bu istege enjekte edilecek hatayi secer (stats_lock altinda cagrilir)."""
+        roll = self.rng.random()
+        for fault, rate in self.faults.items():
+            if roll < rate:
+                self.injected[fault] = self.injected.get(fault, 0) + 1
+                return fault
+            roll -= rate
+        return None
+
+
+def _self_signed_cert(directory: str) -> Tuple[str, str]:
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+         "-keyout", key, "-out", cert, "-days", "1", "-subj", "/CN=localhost"],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return cert, key
+
+
+class MockServer:
+    """
+    Arka plan thread'inde calisan yerel sunucu.
+
+    Kullanim:
+        with MockServer(tls=True) as srv:
+            api = API(api_url=srv.url, ...)
+    """
+
+    def __init__(
+        self,
+        *,
+        routes: Optional[Dict[str, Route]] = None,
+        latency: float = 0.0,
+        tls: bool = False,
+        faults: Optional[Dict[Fault, float]] = None,
+        stall_time: float = 2.0,
+        seed: Optional[int] = None
+    ):
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.routes = dict(routes or {})
+        self._server.latency = latency
+        self._server.connections = 0
+        self._server.requests = 0
+        self._server.stats_lock = threading.Lock()
+        self._server.faults = dict(faults or {})
+        self._server.stall_time = stall_time
+        self._server.rng = random.Random(seed)
+        self._server.injected = {}
+        self._tmpdir: Optional[str] = None
+
+        scheme = "http"
+        if tls:
+            if shutil.which("openssl") is None:
+                raise RuntimeError("tls=True icin 'openssl' komutu gerekli")
+            self._tmpdir = tempfile.mkdtemp(prefix="mock_server_")
+            cert, key = _self_signed_cert(self._tmpdir)
+            ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            ctx.load_cert_chain(cert, key)
+            self._server.socket = ctx.wrap_socket(self._server.socket, server_side=True)
+            scheme = "https"
+
+        host, port = self._server.server_address[:2]
+        self.url = f"{scheme}://{host}:{port}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def routes(self) -> Dict[str, Route]:
+        return self._server.routes
+
+    @property
+    def faults(self) -> Dict[Fault, float]:
+        """Hata turu → olasilik; calisirken degistirilebilir."""
+        return self._server.faults
+
+    @property
+    def injected(self) -> Dict[Fault, int]:
+        """Tur bazinda enjekte edilen hata sayisi."""
+        return self._server.injected
+
+    @property
+    def connections(self) -> int:
+        """Sunucunun kabul ettigi toplam TCP baglantisi."""
+        return self._server.connections
+
+    @property
+    def requests(self) -> int:
+        """Sunucunun isledigi toplam istek."""
+        return self._server.requests
+
+    def start(self) -> "MockServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._tmpdir:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
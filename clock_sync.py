@@ -0,0 +1,142 @@
+"""
+clock_sync.py
+
+Sunucu saatine gore yerel saat farkinin (offset) tahmini.
+
+`X-Timestamp` imzanin parcasidir; yerel saat kaymissa sunucu imzayi
+reddeder. `ClockSync` her yanittaki `Date` header'indan bir ornek alir:
+
+- Sunucu yaniti, istegin gonderildigi (`sent`) ve yanitin alindigi
+  (`received`) yerel anlar arasinda uretmistir. `Date` saniye
+  cozunurlugundedir; sunucu saati [D, D + 1) araligindadir. Buradan
+  offset = sunucu - yerel icin bir aralik cikar:
+      [D - received, D + 1 - sent]
+- Son `max_samples` ornegin araliklari kesistirilir; her yeni ornek araligi
+  daraltir ve offset kesisimin orta noktasidir. RTT'si dusuk ornekler en dar
+  araligi verir.
+- Kesisim bossa (saat atladi, proxy eski `Date` dondu ...) orta noktalarin
+  medyanindan `outlier_limit` sn'den uzak ornekler disarida birakilir ve
+  kalanlar tekrar kesistirilir; o da bossa medyan kullanilir.
+
+    api.clock.stats()
+    # {'offset': -2.41, 'uncertainty': 0.04, 'rtt': 0.012, 'samples': 16, 'outliers': 0}
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+_Sample = Tuple[float, float, float]  # (alt sinir, ust sinir, rtt)
+
+
+def _median(values: List[float]) -> float:
+    # statistics modulu import'ta decimal/fractions yukler; acilis suresi icin elle
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def _intersect(samples: List[_Sample]) -> Optional[Tuple[float, float]]:
+    lo = max(s[0] for s in samples)
+    hi = min(s[1] for s in samples)
+    return (lo, hi) if lo <= hi else None
+
+
+class ClockSync:
+    """
+    Thread-safe saat farki tahmincisi.
+
+    Parametreler:
+      max_samples   : Tahminde kullanilan son ornek sayisi
+      outlier_limit : Kesisim bossa medyandan bu kadar sn uzak ornekler tahmine katilmaz
+    """
+
+    def __init__(self, max_samples: int = 16, outlier_limit: float = 1.5):
+        self.max_samples = max_samples
+        self.outlier_limit = outlier_limit
+        self._lock = threading.Lock()
+        self._samples: Deque[_Sample] = deque(maxlen=max_samples)
+        self._offset = 0.0
+        self._uncertainty: Optional[float] = None
+
+        # Date header'i saniyede bir degisir; son cozumleme saklanir
+        self._last_date: Optional[str] = None
+        self._last_epoch = 0.0
+
+        # Istatistikler: son tahminde disarida birakilan ve cozulemeyen ornekler
+        self.outliers = 0
+        self.invalid = 0
+
+    def _parse(self, date: str) -> Optional[float]:
+        if date == self._last_date:
+            return self._last_epoch
+        from email.utils import parsedate_to_datetime
+        try:
+            epoch = parsedate_to_datetime(date).timestamp()
+        except (TypeError, ValueError, IndexError):
+            self.invalid += 1
+            return None
+        self._last_date, self._last_epoch = date, epoch
+        return epoch
+
+    def observe(self, sent: float, received: float, date: Optional[str]):
+        """
+        Bir yanittan ornek ekler. `sent` / `received`: istegin gonderildigi ve
+        yanitin alindigi yerel `time.time()` degerleri; `date`: yanitin `Date`
+        header'i (yoksa ornek alinmaz).
+        """
+        if not date or received < sent:
+            return
+        with self._lock:
+            server = self._parse(date)
+            if server is None:
+                return
+            self._samples.append((server - received, server + 1.0 - sent, received - sent))
+            self._estimate()
+
+    def _estimate(self):
+        samples = list(self._samples)
+        bounds = _intersect(samples)
+        if bounds is None:
+            mids = [(lo + hi) / 2 for lo, hi, _ in samples]
+            median = _median(mids)
+            kept = [s for s, m in zip(samples, mids) if abs(m - median) <= self.outlier_limit]
+            # Ornekler pencerede kalir; saat gercekten atladiysa yeni ornekler
+            # cogunluga gectiginde medyan onlara kayar
+            self.outliers = len(samples) - len(kept)
+            bounds = _intersect(kept) if kept else None
+            if bounds is None:
+                self._offset, self._uncertainty = median, None
+                return
+        else:
+            self.outliers = 0
+        lo, hi = bounds
+        self._offset = (lo + hi) / 2
+        self._uncertainty = (hi - lo) / 2
+
+    # ——— Kullanim ———
+    @property
+    def offset(self) -> float:
+        """Sunucu saati - yerel saat (sn); ornek yoksa 0."""
+        return self._offset
+
+    def now(self) -> float:
+        """Sunucu saatine gore duzeltilmis Unix zamani."""
+        return time.time() + self._offset
+
+    def timestamp(self) -> str:
+        """Imza icin saniye cozunurluklu duzeltilmis zaman damgasi."""
+        return str(int(time.time() + self._offset))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rtts = [s[2] for s in self._samples]
+            return {
+                "offset":      self._offset,
+                "uncertainty": self._uncertainty,
+                "rtt":         _median(rtts) if rtts else None,
+                "samples":     len(rtts),
+                "outliers":    self.outliers,
+                "invalid":     self.invalid,
+            }
@@ -0,0 +1,64 @@
+"""
+codec.py
+
+REST govdeleri, WebSocket mesajlari ve ws_logger icin JSON codec katmani.
+
+`orjson` kuruluysa varsayilan olarak o kullanilir, degilse stdlib `json`.
+Iki codec de ayni cikti bicimini uretir: bosluksuz ayiricilar ve ASCII'ye
+kacirilmamis UTF-8 (`ensure_ascii=False`).
+
+    from codec import default_codec
+    body = default_codec.dumps({"portfolioNumber": 1})   # bytes
+    data = default_codec.loads(resp.content)
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - opsiyonel bagimlilik
+    orjson = None
+
+
+class JSONCodec:
+    """stdlib `json` tabanli codec."""
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def dumps_str(self, obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+    def dumps_pretty(self, obj: Any) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+    def loads(self, data: Union[bytes, bytearray, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """`orjson` tabanli codec; encode/decode stdlib'e gore birkac kat hizli."""
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("OrjsonCodec icin 'orjson' paketi gerekli: pip install orjson")
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def dumps_str(self, obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    def dumps_pretty(self, obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+
+    def loads(self, data: Union[bytes, bytearray, str]) -> Any:
+        return orjson.loads(data)
+
+
+Codec = Union[JSONCodec, OrjsonCodec]
+
+default_codec: Codec = OrjsonCodec() if orjson is not None else JSONCodec()
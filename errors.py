@@ -0,0 +1,134 @@
+"""
+errors.py
+
+REST istemcisinin siniflandirilmis hata tipleri.
+
+    APIError
+    ├── TransportError        baglanti kurulamadi / koptu (yeniden denenebilir)
+    │   └── RequestTimeout    baglanti ya da okuma zaman asimi
+    ├── HTTPStatusError       sunucu 200 disinda bir kod dondu
+    │   ├── ClientError       4xx
+    │   │   ├── AuthError     401 / 403
+    │   │   └── RateLimitError 429 (yeniden denenebilir, Retry-After okunur)
+    │   └── ServerError       5xx (yeniden denenebilir)
+    ├── CircuitOpenError      endpoint'in devre kesicisi acik; istek gonderilmedi
+    └── DeadlineExceeded      istek deadline'i icinde gonderilemedi
+
+`retryable` sinif ozelligi, hatanin ayni istegin tekrar gonderilmesiyle
+gecebilecek turden olup olmadigini belirtir; tekrar denenip denenmeyecegine
+`resilience.RetryPolicy` karar verir.
+"""
+
+from typing import Any, Mapping, Optional
+
+
+class APIError(Exception):
+    """Tum istemci hatalarinin tabani."""
+    retryable = False
+
+    def __init__(self, message: str, *, path: Optional[str] = None):
+        super().__init__(message)
+        self.path = path
+        # Hata firlatilana kadar yapilan deneme sayisi (_post doldurur)
+        self.attempts = 1
+
+
+class TransportError(APIError):
+    """Baglanti kurulamadi, koptu ya da yanit okunamadi."""
+    retryable = True
+
+
+class RequestTimeout(TransportError):
+    """Baglanti ya da yanit okuma zaman asimina ugradi."""
+
+
+class HTTPStatusError(APIError):
+    """
+    Sunucu 200 disinda bir kodla yanit verdi.
+
+    status : HTTP durum kodu
+    body   : Ham yanit govdesi (bytes)
+    data   : Govde JSON ise decode edilmis hali, degilse None
+    """
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        path: Optional[str] = None,
+        status: int = 0,
+        body: bytes = b"",
+        data: Any = None
+    ):
+        super().__init__(message, path=path)
+        self.status = status
+        self.body = body
+        self.data = data
+
+
+class ClientError(HTTPStatusError):
+    """4xx: istek gecersiz; ayni istegi tekrar gondermek sonucu degistirmez."""
+
+
+class AuthError(ClientError):
+    """401 / 403: token gecersiz ya da yetki yok."""
+
+
+class RateLimitError(ClientError):
+    """429: sunucu tarafinda hiz siniri asildi."""
+    retryable = True
+
+    def __init__(self, message: str, *, retry_after: Optional[float] = None, **kwargs: Any):
+        super().__init__(message, **kwargs)
+        self.retry_after = retry_after
+
+
+class ServerError(HTTPStatusError):
+    """5xx: sunucu tarafinda hata."""
+    retryable = True
+
+
+class CircuitOpenError(APIError):
+    """Endpoint'in devre kesicisi acik; istek gonderilmeden reddedildi."""
+
+    def __init__(self, message: str, *, path: Optional[str] = None, retry_after: float = 0.0):
+        super().__init__(message, path=path)
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(APIError):
+    """
+    Istek deadline'i icinde gonderilemedi: kuyrukta sure doldu, sure
+    onceki denemelerde tukendi ya da tekrar deneme beklemesi sureyi asiyordu.
+    """
+
+
+def _retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    if not headers:
+        return None
+    value = headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def error_for_status(
+    path: str,
+    status: int,
+    body: bytes,
+    data: Any = None,
+    headers: Optional[Mapping[str, str]] = None
+) -> HTTPStatusError:
+    """HTTP durum koduna uygun hata nesnesini olusturur."""
+    message = f"{path}: HTTP {status}"
+    kwargs = {"path": path, "status": status, "body": body, "data": data}
+    if status in (401, 403):
+        return AuthError(message, **kwargs)
+    if status == 429:
+        return RateLimitError(message, retry_after=_retry_after(headers), **kwargs)
+    if 400 <= status < 500:
+        return ClientError(message, **kwargs)
+    if status >= 500:
+        return ServerError(message, **kwargs)
+    return HTTPStatusError(message, **kwargs)
@@ -0,0 +1,153 @@
+"""
+log_setup.py
+
+Istege bagli, arka plan thread'inde yazan loglama kurulumu.
+
+api_client import edildiginde loglama yapilandirilmaz; uygulama isterse
+`configure_logging()` cagirir. Cagiran thread yalnizca mesaj metnini olusturur
+(`args` sonradan degisebilecek yanit sozlukleri tutabilir); zaman damgasi,
+Formatter ve dosyaya yazma `QueueListener` thread'inde yapilir. Boylece buyuk
+yanit loglari emir yolunda disk I/O gecikmesi yaratmaz.
+
+Endpoint bazinda seviye ve ornekleme `log_policy` ile ayarlanir:
+
+    configure_logging(
+        "logs.log",
+        endpoint_levels={"/Stock/StockOrderList": logging.WARNING},
+        sample_rates={"/Portfolio/AccountSummary": 0.1},
+    )
+"""
+
+import atexit
+import logging
+import random
+from typing import TYPE_CHECKING, Dict, Optional
+
+# logging.handlers (socket, pickle ...) yalnizca configure_logging() ile yuklenir
+if TYPE_CHECKING:
+    from logging.handlers import QueueHandler, QueueListener
+
+DEFAULT_FORMAT = "%(asctime)s %(name)s %(levelname)s: %(message)s"
+DEFAULT_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+
+class EndpointLogPolicy:
+    """
+    Endpoint bazli log seviyesi ve ornekleme.
+
+    levels       : path → en dusuk seviye (or. WARNING ise INFO loglari atlanir)
+    sample_rates : path → 0..1 arasi oran; WARNING altindaki kayitlarin
+                   yalnizca bu orani yazilir. Uyari ve hatalar orneklenmez.
+    """
+
+    def __init__(
+        self,
+        levels: Optional[Dict[str, int]] = None,
+        sample_rates: Optional[Dict[str, float]] = None
+    ):
+        self.levels = dict(levels or {})
+        self.sample_rates = dict(sample_rates or {})
+
+    def enabled(self, logger: logging.Logger, path: str, level: int) -> bool:
+        """Bu endpoint icin `level` seviyesinde kayit uretilmeli mi?"""
+        if not logger.isEnabledFor(level):
+            return False
+        min_level = self.levels.get(path)
+        if min_level is not None and level < min_level:
+            return False
+        if level < logging.WARNING:
+            rate = self.sample_rates.get(path)
+            if rate is not None and random.random() >= rate:
+                return False
+        return True
+
+
+# api_client tarafindan okunan ortak politika
+log_policy = EndpointLogPolicy()
+
+
+def _deferred_queue_handler(log_queue) -> "QueueHandler":
+    """
+    Kaydi Formatter'dan gecirmeden kuyruga atan handler. (Standart
+    QueueHandler.prepare cagiran thread'de tum kaydi format eder.)
+    """
+    from logging.handlers import QueueHandler
+
+    class _DeferredQueueHandler(QueueHandler):
+        def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+            # log_policy ornekleme kontrolunden gecen kayit buraya gelir. `args`
+            # canli yanit sozluklerine referans tutar; listener yazana kadar
+            # cagiran onlari degistirebilir, bu yuzden mesaj burada sabitlenir.
+            record.msg = record.getMessage()
+            record.args = None
+            return record
+
+    return _DeferredQueueHandler(log_queue)
+
+
+_listener: Optional["QueueListener"] = None
+_handler: Optional["QueueHandler"] = None
+_target: Optional[logging.Logger] = None
+
+
+def configure_logging(
+    filename: Optional[str] = "logs.log",
+    *,
+    filemode: str = "w",
+    level: int = logging.INFO,
+    fmt: str = DEFAULT_FORMAT,
+    datefmt: str = DEFAULT_DATEFMT,
+    logger_name: str = "",
+    endpoint_levels: Optional[Dict[str, int]] = None,
+    sample_rates: Optional[Dict[str, float]] = None,
+    handler: Optional[logging.Handler] = None
+) -> "QueueListener":
+    """
+    Kuyruk tabanli loglamayi kurar ve listener'i doner.
+
+    `handler` verilmezse `filename` dosyasina yazan bir FileHandler
+    olusturulur. Tekrar cagrilirsa onceki kurulum kapatilir.
+    """
+    import queue
+    from logging.handlers import QueueListener
+
+    global _listener, _handler, _target
+    shutdown_logging()
+
+    if handler is None:
+        if filename is None:
+            handler = logging.StreamHandler()
+        else:
+            handler = logging.FileHandler(filename, mode=filemode, encoding="utf-8")
+    if handler.formatter is None:
+        handler.setFormatter(logging.Formatter(fmt, datefmt))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _handler = _deferred_queue_handler(log_queue)
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+
+    _target = logging.getLogger(logger_name)
+    _target.addHandler(_handler)
+    _target.setLevel(level)
+
+    log_policy.levels = dict(endpoint_levels or {})
+    log_policy.sample_rates = dict(sample_rates or {})
+
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Kuyrukta kalan kayitlari yazar ve listener'i durdurur."""
+    global _listener, _handler, _target
+    if _handler is not None and _target is not None:
+        _target.removeHandler(_handler)
+    _handler = _target = None
+    if _listener is not None:
+        _listener.stop()
+        for h in _listener.handlers:
+            h.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
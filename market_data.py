@@ -0,0 +1,424 @@
+"""
+market_data.py
+
+WebSocket akisindan beslenen, sembol basina son deger onbellegi (`MarketData`):
+- T / D / Y mesajlarini `Trade` / `Quote` / `Summary` kayitlarina cevirir
+- Semboller tamsayi kimliklere intern edilir, alanlar kanal basina
+  `array('d')` sutunlarinda tutulur
+- Yazici WS event loop'udur; okumalar herhangi bir thread'den kilitsizdir (seqlock)
+"""
+
+import sys
+import threading
+import time
+from array import array
+from typing import (
+    TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Type
+)
+
+from codec import Codec, default_codec
+from ws_dispatch import WSMessage
+
+if TYPE_CHECKING:
+    from api_client import WebSocket
+    from clock_sync import ClockSync
+
+NAN = float("nan")
+
+
+# ——————————————————————————————————————————————————————————————————————————————
+# Kayitlar
+# ——————————————————————————————————————————————————————————————————————————————
+
+class Trade(NamedTuple):
+    """T: son islem. `side`: 1 alis, -1 satis, nan bilinmiyor."""
+    symbol: str
+    seq: int
+    time: float
+    price: float
+    size: float
+    side: float
+
+
+class Quote(NamedTuple):
+    """D: en iyi alis / satis kademesi."""
+    symbol: str
+    seq: int
+    time: float
+    bid: float
+    bid_size: float
+    ask: float
+    ask_size: float
+
+
+class Summary(NamedTuple):
+    """Y: gunluk ozet."""
+    symbol: str
+    seq: int
+    time: float
+    last: float
+    open: float
+    high: float
+    low: float
+    volume: float
+    change: float
+
+
+Record = Any  # Trade | Quote | Summary
+
+# Kanal → (kayit sinifi, alan → denenecek mesaj anahtarlari)
+DEFAULT_FIELDS: Dict[str, Tuple[Type[Any], Dict[str, Tuple[str, ...]]]] = {
+    "T": (Trade, {
+        "price": ("Price", "LastPrice", "Last", "price", "p"),
+        "size":  ("Quantity", "Size", "Volume", "Qty", "quantity", "q"),
+        "side":  ("Side", "Direction", "side"),
+    }),
+    "D": (Quote, {
+        "bid":      ("Bid", "BidPrice", "bid"),
+        "bid_size": ("BidSize", "BidQuantity", "bidSize"),
+        "ask":      ("Ask", "AskPrice", "ask"),
+        "ask_size": ("AskSize", "AskQuantity", "askSize"),
+    }),
+    "Y": (Summary, {
+        "last":   ("Last", "LastPrice", "Price", "last"),
+        "open":   ("Open", "open"),
+        "high":   ("High", "high"),
+        "low":    ("Low", "low"),
+        "volume": ("Volume", "TotalVolume", "volume"),
+        "change": ("Change", "ChangePercent", "change"),
+    }),
+}
+
+_SIDES = {"B": 1.0, "BUY": 1.0, "A": 1.0, "ALIS": 1.0, "ALIŞ": 1.0,
+          "S": -1.0, "SELL": -1.0, "SATIS": -1.0, "SATIŞ": -1.0}
+
+
+def _float(value: Any) -> float:
+    if value.__class__ is float:
+        return value
+    if value is None:
+        return NAN
+    if isinstance(value, str):
+        side = _SIDES.get(value.upper())
+        if side is not None:
+            return side
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NAN
+
+
+# ——————————————————————————————————————————————————————————————————————————————
+# Sembol tablosu
+# ——————————————————————————————————————————————————————————————————————————————
+
+class SymbolTable:
+    """Sembol → ardisik tamsayi kimlik. Kimlikler silinmez; okuma kilitsizdir."""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+
+    def intern(self, symbol: str) -> int:
+        sid = self._ids.get(symbol)
+        if sid is None:
+            with self._lock:
+                sid = self._ids.get(symbol)
+                if sid is None:
+                    symbol = sys.intern(symbol)
+                    sid = len(self._names)
+                    self._names.append(symbol)
+                    # Kimlik, isim listesine eklendikten sonra gorunur olur
+                    self._ids[symbol] = sid
+        return sid
+
+    def get(self, symbol: str) -> Optional[int]:
+        return self._ids.get(symbol)
+
+    def name(self, sid: int) -> str:
+        return self._names[sid]
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+# ——————————————————————————————————————————————————————————————————————————————
+# Sutunlu depo
+# ——————————————————————————————————————————————————————————————————————————————
+
+class FieldReader:
+    """
+    Bir kayit sinifinin alanlarini mesajdan float olarak okur. Alan basina
+    anahtarlar sirayla denenir; son eslesen anahtar hatirlanir, akistaki
+    mesajlar ayni semayi kullandigindan sonraki mesajlarda ilk denemede bulunur.
+    """
+
+    __slots__ = ("names", "keys", "hits")
+
+    def __init__(self, record: Type[Any], fields: Dict[str, Tuple[str, ...]]):
+        names = record._fields[3:]
+        missing = set(names) - set(fields)
+        if missing:
+            raise ValueError(f"{record.__name__} icin alan anahtari eksik: {sorted(missing)}")
+        self.names: Tuple[str, ...] = names
+        self.keys = [fields[name] for name in names]
+        self.hits = [keys[0] for keys in self.keys]
+
+    def read(self, data: Dict[str, Any]) -> List[float]:
+        values = [data.get(key) for key in self.hits]
+        for i, value in enumerate(values):
+            if value is None:
+                value = self._lookup(i, data)
+            values[i] = _float(value)
+        return values
+
+    def _lookup(self, i: int, data: Dict[str, Any]) -> Any:
+        for key in self.keys[i]:
+            value = data.get(key)
+            if value is not None:
+                self.hits[i] = key
+                return value
+        return None
+
+
+class _Store:
+    """Tek kanalin sutunlari: alan basina array('d'), zaman ve seqlock sayaci."""
+
+    __slots__ = ("record", "names", "reader", "columns", "time", "seq", "updates")
+
+    def __init__(self, record: Type[Any], fields: Dict[str, Tuple[str, ...]]):
+        self.record = record
+        self.reader = FieldReader(record, fields)
+        self.names = self.reader.names
+        self.columns = [array("d") for _ in self.names]
+        self.time = array("d")
+        # Cift: kararli, tek: yaziliyor; seq // 2 = guncelleme sayisi
+        self.seq = array("Q")
+        self.updates = 0
+
+    def grow(self, capacity: int):
+        extra = capacity - len(self.seq)
+        if extra <= 0:
+            return
+        nan = array("d", [NAN]) * extra
+        for column in self.columns:
+            column.extend(nan)
+        self.time.extend(nan)
+        # seq en son buyur; okuyucu sid < len(seq) gordugunde sutunlar hazirdir
+        self.seq.extend(array("Q", bytes(8 * extra)))
+
+    def write(self, sid: int, data: Dict[str, Any], ts: float):
+        values = self.reader.read(data)
+        # Seqlock penceresi yalnizca dizi atamalarini kapsar
+        seq = self.seq
+        seq[sid] += 1
+        for column, value in zip(self.columns, values):
+            column[sid] = value
+        self.time[sid] = ts
+        seq[sid] += 1
+        self.updates += 1
+
+
+class MarketData:
+    """
+    Seqlock: yazici sembolun sira numarasini yazmadan once tek, yazdiktan sonra
+    cift yapar. Okuyucu numarayi once ve sonra okur; degismis ya da tekse
+    yeniden dener. Yarim yazilmis kayit gorulmez, yazici hic beklemez.
+
+    Parametreler:
+      codec  : Decode edilmemis mesajlar icin JSON codec
+      clock  : Verilirse kayit zamani sunucu saatine gore duzeltilir (`ws.clock`)
+      fields : Kanal → (kayit sinifi, alan → mesaj anahtarlari); DEFAULT_FIELDS'i ezer
+    """
+
+    def __init__(
+        self,
+        *,
+        codec: Optional[Codec] = None,
+        clock: Optional["ClockSync"] = None,
+        fields: Optional[Dict[str, Tuple[Type[Any], Dict[str, Tuple[str, ...]]]]] = None
+    ):
+        self.codec = codec or default_codec
+        self.clock = clock
+        self.symbols = SymbolTable()
+        spec = dict(DEFAULT_FIELDS)
+        spec.update(fields or {})
+        self._stores: Dict[str, _Store] = {ch: _Store(rec, f) for ch, (rec, f) in spec.items()}
+        self._capacity = 0
+        self._grow_lock = threading.Lock()
+        # last_price icin hazir sutunlar (kanal tanimlari degistirildiyse None)
+        self._trade, self._trade_price = self._column("T", "price")
+        self._summary, self._summary_last = self._column("Y", "last")
+
+        # Istatistikler
+        self.ignored = 0
+        self.invalid = 0
+        self.retries = 0
+
+    def _column(self, channel: str, field: str) -> Tuple[Optional[_Store], Any]:
+        store = self._stores.get(channel)
+        if store is None or field not in store.names:
+            return None, None
+        return store, store.columns[store.names.index(field)]
+
+    # ——— Besleme ———
+    def attach(self, ws: "WebSocket"):
+        """WebSocket dispatcher'ina async handler ekler; yazimlar WS loop'unda yapilir."""
+        async def handler(message: WSMessage):
+            self.on_message(message)
+        ws.add_handler(handler)
+        if self.clock is None:
+            self.clock = ws.clock
+
+    def on_message(self, message: WSMessage):
+        """Dispatcher mesajini isler; `data` yoksa ham metni cozer."""
+        data = message.data
+        if data is None:
+            try:
+                data = self.codec.loads(message.raw)
+            except ValueError:
+                self.invalid += 1
+                return
+        self.update(data)
+
+    def update(self, data: Any) -> bool:
+        """
+        Decode edilmis bir mesaji (ya da mesaj listesini) depoya yazar.
+        T/D/Y disindaki ve sembolsuz mesajlar sayilip atlanir. Ayni kanal ve
+        sembol icin tek yazici olmalidir.
+        """
+        if not isinstance(data, dict):
+            if isinstance(data, list):
+                written = False
+                for item in data:
+                    written = self.update(item) or written
+                return written
+            self.ignored += 1
+            return False
+        store = self._stores.get(data.get("Type") or data.get("type"))
+        symbol = data.get("Symbol") or data.get("symbol")
+        if store is None or not symbol:
+            self.ignored += 1
+            return False
+        sid = self.symbols.get(symbol)
+        if sid is None:
+            sid = self.symbols.intern(symbol)
+        if sid >= self._capacity:
+            self._grow(sid + 1)
+        ts = self.clock.now() if self.clock is not None else time.time()
+        store.write(sid, data, ts)
+        return True
+
+    def _grow(self, needed: int):
+        with self._grow_lock:
+            if needed <= self._capacity:
+                return
+            capacity = max(64, self._capacity * 2, needed)
+            for store in self._stores.values():
+                store.grow(capacity)
+            self._capacity = capacity
+
+    # ——— Okuma (kilitsiz) ———
+    def _read(self, store: _Store, sid: int) -> Optional[Record]:
+        seq = store.seq
+        if sid >= len(seq):
+            return None
+        columns = store.columns
+        while True:
+            before = seq[sid]
+            if before & 1:
+                # Yazici yaziyor; GIL'i birakip tekrar dene
+                self.retries += 1
+                time.sleep(0)
+                continue
+            values = [column[sid] for column in columns]
+            ts = store.time[sid]
+            if seq[sid] == before:
+                break
+            self.retries += 1
+        if not before:
+            return None
+        return store.record(self.symbols.name(sid), before >> 1, ts, *values)
+
+    def _read_value(self, store: _Store, sid: int, column: "array[float]") -> Optional[float]:
+        seq = store.seq
+        if sid >= len(seq):
+            return None
+        while True:
+            before = seq[sid]
+            if before & 1:
+                self.retries += 1
+                time.sleep(0)
+                continue
+            value = column[sid]
+            if seq[sid] == before:
+                break
+            self.retries += 1
+        return value if before and value == value else None
+
+    def _store(self, channel: str) -> _Store:
+        store = self._stores.get(channel)
+        if store is None:
+            raise ValueError(f"Bilinmeyen kanal: {channel!r} (beklenen: {', '.join(self._stores)})")
+        return store
+
+    def get_last(self, symbol: str, channel: str = "T") -> Optional[Record]:
+        """`symbol` icin `channel` kanalindaki son kayit; hic gelmediyse None."""
+        store = self._store(channel)
+        sid = self.symbols.get(symbol)
+        return None if sid is None else self._read(store, sid)
+
+    def snapshot(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        channel: str = "T"
+    ) -> Dict[str, Record]:
+        """
+        Sembol → son kayit. `symbols` verilmezse kanalda verisi olan tum
+        semboller. Her kayit kendi icinde tutarlidir; kayitlar arasi ayni an
+        garanti edilmez.
+        """
+        store = self._store(channel)
+        if symbols is None:
+            ids: Sequence[int] = range(len(self.symbols))
+        else:
+            ids = [sid for sid in map(self.symbols.get, symbols) if sid is not None]
+        out: Dict[str, Record] = {}
+        for sid in ids:
+            record = self._read(store, sid)
+            if record is not None:
+                out[record.symbol] = record
+        return out
+
+    def value(self, symbol: str, field: str, channel: str = "T") -> Optional[float]:
+        """Tek alanin son degeri (kayit olusturmadan); yoksa ya da nan ise None."""
+        store = self._store(channel)
+        sid = self.symbols.get(symbol)
+        if sid is None:
+            return None
+        return self._read_value(store, sid, store.columns[store.names.index(field)])
+
+    def last_price(self, symbol: str) -> Optional[float]:
+        """Son islem fiyati; islem yoksa Y ozetindeki son fiyat."""
+        sid = self.symbols.get(symbol)
+        if sid is None:
+            return None
+        price = self._read_value(self._trade, sid, self._trade_price) if self._trade else None
+        if price is None and self._summary is not None:
+            price = self._read_value(self._summary, sid, self._summary_last)
+        return price
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "symbols":  len(self.symbols),
+            "capacity": self._capacity,
+            "updates":  {ch: store.updates for ch, store in self._stores.items()},
+            "ignored":  self.ignored,
+            "invalid":  self.invalid,
+            "retries":  self.retries,
+        }
@@ -0,0 +1,349 @@
+"""
+models.py
+
+REST yanitlari icin hafif, tipli modeller ve sutunlu tablo gorunumu.
+
+Endpoint metodlari ham `Dict[str, Any]` donmeye devam eder; bu modul
+istege bagli bir katmandir:
+
+- Modeller (`Order`, `StockPosition`, `FuturePosition`, `AccountSummary`,
+  `CashBalance`) `__slots__` kullanir ve ham sozlugu kopyalamadan sarar.
+  Alanlar ilk erisimde ham sozlukten okunup donusturulur ve sonuc nesne
+  uzerinde saklanir; hic okunmayan alan icin is yapilmaz. Ham sozluk
+  tutuldugu icin modeller bellegi azaltmaz, sarmalayici kadar artirir
+  (bench_models: 20000 emirde ~23.6 MiB, ham sozlukler ~20.8 MiB).
+- Modelde tanimli olmayan alanlara `model["alanAdi"]` ya da `model.raw`
+  ile ulasilir.
+- `Table`, liste yanitlarini satir sozlukleri yerine sutunlar halinde tutar.
+  Tamamen sayisal sutunlar `array`, metin sutunlari intern edilmis
+  string listeleri olarak saklanir; binlerce kucuk sozluk yerine birkac
+  dizi kalir. Bellek tasarrufu yalnizca burada vardir (ayni yanit ~3.8 MiB).
+
+    resp = api.get_stock_order_list(
+        portfolio_number=123, order_status=None, order_direction=None,
+        order_method=None, order_duration=None, equity_code=None,
+        equity_type=None, page_number=1, descending_order=True
+    )
+    orders = Order.list_from(resp)
+    print(orders[0].equity_code, orders[0].price)
+
+    table = Table.from_response(resp, columns=["equityCode", "price", "quantity"])
+    total = sum(p * q for p, q in zip(table["price"], table["quantity"]))
+"""
+
+import sys
+from array import array
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Type, TypeVar, Union
+)
+
+M = TypeVar("M", bound="Model")
+
+_UNSET = object()
+
+# config.ORDER_STATUS_MAP icindeki sonuclanmis durumlar
+TERMINAL_STATUSES = frozenset({"REALIZED", "CANCELLED", "INVALID", "EXPIRED"})
+
+
+def page_items(resp: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Liste yanitindan kayitlari cikarir (`data` listesi ya da icindeki ilk liste)."""
+    data = resp.get("data")
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for value in data.values():
+            if isinstance(value, list):
+                return value
+    return []
+
+
+def _number(value: Any) -> Any:
+    """Sayi ya da sayisal string'i float'a cevirir; cevrilemeyen deger aynen doner."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _text(value: Any) -> Any:
+    return value if isinstance(value, str) else str(value)
+
+
+def _flag(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes")
+    return bool(value)
+
+
+# ——————————————————————————————————————————————————————————————————————————————
+# Modeller
+# ——————————————————————————————————————————————————————————————————————————————
+
+class Field:
+    """
+    Ham sozlukteki `key` alanini ilk erisimde `convert` ile donusturen
+    descriptor. Sonuc, sinifa metaclass tarafindan eklenen slot'ta saklanir.
+    """
+    __slots__ = ("key", "convert", "slot")
+
+    def __init__(self, key: str, convert: Optional[Callable[[Any], Any]] = None):
+        self.key = key
+        self.convert = convert
+        self.slot = ""
+
+    def __get__(self, obj: Any, owner: Any = None) -> Any:
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot, _UNSET)
+        if value is _UNSET:
+            value = obj._raw.get(self.key)
+            if value is not None and self.convert is not None:
+                value = self.convert(value)
+            setattr(obj, self.slot, value)
+        return value
+
+
+class _ModelMeta(type):
+    """`Field` tanimlarindan `__slots__` ve alan listesini uretir."""
+
+    def __new__(mcs, name, bases, namespace):
+        fields = {k: v for k, v in namespace.items() if isinstance(v, Field)}
+        slots = []
+        for attr, field in fields.items():
+            field.slot = "_v_" + attr
+            slots.append(field.slot)
+        namespace["__slots__"] = tuple(slots) if bases else ("_raw",) + tuple(slots)
+        cls = super().__new__(mcs, name, bases, namespace)
+        inherited: Dict[str, str] = {}
+        for base in reversed(cls.__mro__[1:]):
+            inherited.update(getattr(base, "FIELDS", {}))
+        inherited.update({attr: field.key for attr, field in fields.items()})
+        cls.FIELDS = inherited
+        return cls
+
+
+class Model(metaclass=_ModelMeta):
+    """
+    Ham yanit kaydini saran temel model.
+
+    `FIELDS`: python adi → JSON anahtari. Ham sozluk kopyalanmaz; uzerinde
+    degisiklik yapilirsa henuz okunmamis alanlara yansir.
+    """
+    FIELDS: Dict[str, str] = {}
+
+    def __init__(self, raw: Dict[str, Any]):
+        self._raw = raw
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """Sarilan ham sozluk."""
+        return self._raw
+
+    def __getitem__(self, key: str) -> Any:
+        return self._raw[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._raw.get(key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Tanimli alanlari donusturulmus halleriyle sozluk olarak doner."""
+        return {attr: getattr(self, attr) for attr in self.FIELDS}
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._raw == other._raw
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        shown = ", ".join(f"{a}={getattr(self, a)!r}" for a in list(self.FIELDS)[:4])
+        return f"{type(self).__name__}({shown})"
+
+    @classmethod
+    def wrap(cls: Type[M], rows: Iterable[Dict[str, Any]]) -> Iterator[M]:
+        """Kayitlari tek tek sarar (iter_stock_orders gibi akislar icin)."""
+        for row in rows:
+            yield cls(row)
+
+    @classmethod
+    def list_from(cls: Type[M], resp: Dict[str, Any]) -> List[M]:
+        """Liste yanitindaki kayitlari model listesine cevirir."""
+        return [cls(row) for row in page_items(resp)]
+
+    @classmethod
+    def from_response(cls: Type[M], resp: Dict[str, Any]) -> Optional[M]:
+        """Tek kayitlik yaniti (`data` sozlugu) modele cevirir; veri yoksa None."""
+        data = resp.get("data")
+        if isinstance(data, dict):
+            return cls(data)
+        if isinstance(data, list) and data:
+            return cls(data[0])
+        return None
+
+
+class Order(Model):
+    """Pay ya da vadeli emir kaydi."""
+    order_ref         = Field("orderRef", _text)
+    portfolio_number  = Field("portfolioNumber")
+    equity_code       = Field("equityCode")
+    contract_code     = Field("contractCode")
+    direction         = Field("direction")
+    long_short        = Field("longShort")
+    quantity          = Field("quantity", _number)
+    realized_quantity = Field("realizedQuantity", _number)
+    price             = Field("price", _number)
+    order_method      = Field("orderMethod")
+    order_duration    = Field("orderDuration")
+    order_status      = Field("orderStatus")
+    order_date        = Field("orderDate")
+
+
+class StockPosition(Model):
+    """Pay pozisyonu."""
+    equity_code    = Field("equityCode")
+    equity_type    = Field("equityType")
+    quantity       = Field("quantity", _number)
+    cost           = Field("cost", _number)
+    last_price     = Field("lastPrice", _number)
+    market_value   = Field("marketValue", _number)
+    profit_loss    = Field("profitLoss", _number)
+
+
+class FuturePosition(Model):
+    """Vadeli pozisyon."""
+    contract_code  = Field("contractCode")
+    contract_type  = Field("contractType")
+    long_short     = Field("longShort")
+    quantity       = Field("quantity", _number)
+    cost           = Field("cost", _number)
+    last_price     = Field("lastPrice", _number)
+    profit_loss    = Field("profitLoss", _number)
+
+
+class AccountSummary(Model):
+    """Hesap ozeti."""
+    portfolio_number = Field("portfolioNumber")
+    total_asset      = Field("totalAsset", _number)
+    cash             = Field("cash", _number)
+    stock_value      = Field("stockValue", _number)
+    credit           = Field("credit", _number)
+    is_credit        = Field("isCredit", _flag)
+
+
+class CashBalance(Model):
+    """Nakit bakiye (T0/T1/T2)."""
+    portfolio_number = Field("portfolioNumber")
+    t0               = Field("t0", _number)
+    t1               = Field("t1", _number)
+    t2               = Field("t2", _number)
+    withdrawable     = Field("withdrawable", _number)
+
+
+# ——————————————————————————————————————————————————————————————————————————————
+# Sutunlu tablo
+# ——————————————————————————————————————————————————————————————————————————————
+
+Column = Union[array, List[Any]]
+
+
+def _pack(values: List[Any]) -> Column:
+    """
+    Sutunu mumkun olan en kucuk bicimde saklar: yalnizca int → array('q'),
+    yalnizca float → array('d'); karisik ya da None iceren sutunlar liste kalir.
+    """
+    if values:
+        kinds = {type(v) for v in values}
+        try:
+            if kinds == {int}:
+                return array("q", values)
+            if kinds == {float}:
+                return array("d", values)
+        except OverflowError:
+            pass
+    return [sys.intern(v) if type(v) is str else v for v in values]
+
+
+class Table:
+    """
+    Liste yanitlarinin sutunlu gorunumu.
+
+    `table["price"]` tum sutunu, `table[i]` i. satiri sozluk olarak,
+    `table.models(Order)` satirlari model olarak doner.
+    """
+    __slots__ = ("columns", "_length")
+
+    def __init__(self, columns: Dict[str, Column]):
+        lengths = {len(c) for c in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Tum sutunlar ayni uzunlukta olmali")
+        self.columns = columns
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[Dict[str, Any]],
+        columns: Optional[Sequence[str]] = None
+    ) -> "Table":
+        """
+        Satir sozluklerinden tablo kurar. `columns` verilmezse ilk satirdaki
+        anahtarlar (ve sonradan gorulen yeni anahtarlar) kullanilir; eksik
+        hucreler None olur.
+        """
+        if columns is None:
+            names: Dict[str, None] = {}
+            for row in rows:
+                for key in row:
+                    if key not in names:
+                        names[key] = None
+            columns = list(names)
+        return cls({name: _pack([row.get(name) for row in rows]) for name in columns})
+
+    @classmethod
+    def from_response(
+        cls,
+        resp: Dict[str, Any],
+        columns: Optional[Sequence[str]] = None
+    ) -> "Table":
+        """Liste yanitindan tablo kurar."""
+        return cls.from_rows(page_items(resp), columns)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key: Union[str, int]) -> Any:
+        if isinstance(key, str):
+            return self.columns[key]
+        return {name: col[key] for name, col in self.columns.items()}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        names = list(self.columns)
+        for values in zip(*self.columns.values()):
+            yield dict(zip(names, values))
+
+    def column(self, name: str) -> Column:
+        return self.columns[name]
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Ham satir sozluklerini yeniden uretir."""
+        return list(self)
+
+    def models(self, model: Type[M]) -> Iterator[M]:
+        """Satirlari verilen model tipinde doner."""
+        for row in self:
+            yield model(row)
+
+    def where(self, name: str, predicate: Callable[[Any], bool]) -> "Table":
+        """`predicate(deger)` True olan satirlardan yeni tablo doner."""
+        keep = [i for i, v in enumerate(self.columns[name]) if predicate(v)]
+        return Table({
+            n: (array(c.typecode, (c[i] for i in keep)) if isinstance(c, array)
+                else [c[i] for i in keep])
+            for n, c in self.columns.items()
+        })
+
+    def __repr__(self) -> str:
+        return f"Table(rows={self._length}, columns={list(self.columns)})"
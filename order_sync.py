@@ -0,0 +1,214 @@
+"""
+order_sync.py
+
+Emir listesi icin artimli (delta) senkronizasyon.
+
+`OrderSync`, emirlerin yerel bir kopyasini `orderRef` anahtariyla tutar ve
+her `sync()` cagrisinda yalnizca degisenleri bulur:
+
+- Pay emirleri `descendingOrder=True` ile yeniden eskiye taranir. Tarama,
+  bilinen ve degismemis bir emre gelindiginde ve onceki kopyadaki tum acik
+  (sonuclanmamis) emirler goruldugunde durur. Boylece her turun maliyeti
+  tum emir gecmisiyle degil, yalnizca yeni hareketle buyur.
+- Listeden tamamen kaybolan emirler yalnizca taranan bolgede fark edilir;
+  arada bir `sync(full=True)` ile tam tarama yapilabilir.
+- Vadeli emir listesinde sayfalama olmadigindan liste tek istekte alinir ve
+  ayni fark mantigi uygulanir.
+
+Her degisiklik `OrderEvent("added" | "changed" | "removed", ...)` olarak
+doner ve varsa `on_event` callback'ine iletilir.
+"""
+
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Union
+
+from api_client import API, AsyncAPI
+from models import TERMINAL_STATUSES
+
+
+class OrderEvent(NamedTuple):
+    """Tek bir emir degisikligi."""
+    kind: str                          # "added" | "changed" | "removed"
+    order_ref: str
+    order: Optional[Dict[str, Any]]    # guncel hali (removed icin None)
+    previous: Optional[Dict[str, Any]] # onceki hali (added icin None)
+
+
+class _Scan:
+    """Tek bir senkronizasyon turunun tarama durumu."""
+
+    def __init__(self, sync: "OrderSync", incremental: bool):
+        self.sync = sync
+        self.incremental = incremental
+        self.seen: Dict[str, Dict[str, Any]] = {}
+        self.boundary: Optional[str] = None
+        self.pending_open: Set[str] = {
+            ref for ref, order in sync._snapshot.items() if not sync._is_terminal(order)
+        }
+
+    def feed(self, order: Dict[str, Any]) -> bool:
+        """Emri kaydeder; taramanin durabilecegi noktaya gelindiyse True doner."""
+        ref = str(order.get(self.sync.key_field))
+        self.seen[ref] = order
+        self.pending_open.discard(ref)
+        if not self.incremental:
+            return False
+        previous = self.sync._snapshot.get(ref)
+        if previous is not None and previous == order and not self.pending_open:
+            self.boundary = ref
+            return True
+        return False
+
+
+class OrderSync:
+    """
+    Emir listesi icin delta senkronizasyon motoru.
+
+    Parametreler:
+      api          : API ya da AsyncAPI nesnesi
+      portfolio    : Portfoy numarasi
+      market       : "stock" (sayfali, artimli) ya da "future" (tam liste)
+      filters      : get_stock_order_list / get_future_order_list filtreleri
+      on_event     : Her OrderEvent icin cagrilacak fonksiyon
+      key_field    : Emir anahtari alani
+      status_field : Emir durumu alani
+
+        sync = OrderSync(api, 123, on_event=print)
+        sync.sync()            # ilk tur: tam liste
+        events = sync.sync()   # sonraki turlar: yalnizca yeni hareket
+    """
+
+    def __init__(
+        self,
+        api: Union[API, AsyncAPI],
+        portfolio: int,
+        *,
+        market: str = "stock",
+        filters: Optional[Dict[str, Any]] = None,
+        on_event: Optional[Callable[[OrderEvent], None]] = None,
+        key_field: str = "orderRef",
+        status_field: str = "orderStatus"
+    ):
+        if market not in ("stock", "future"):
+            raise ValueError("market 'stock' ya da 'future' olmali")
+        self.api = api
+        self.portfolio = portfolio
+        self.market = market
+        self.filters = dict(filters or {})
+        # Artimli tarama yeniden eskiye siralamaya dayanir
+        self.filters.pop("descending_order", None)
+        self.on_event = on_event
+        self.key_field = key_field
+        self.status_field = status_field
+
+        self._snapshot: Dict[str, Dict[str, Any]] = {}
+        self._refs: List[str] = []   # son bilinen sira (yeniden eskiye)
+        self._synced = False
+
+        # Istatistikler
+        self.syncs = 0
+        self.last_scanned = 0
+        self.total_scanned = 0
+
+    @property
+    def orders(self) -> Dict[str, Dict[str, Any]]:
+        """orderRef → emir; son senkronizasyondaki yerel kopya."""
+        return self._snapshot
+
+    def _is_terminal(self, order: Dict[str, Any]) -> bool:
+        return order.get(self.status_field) in TERMINAL_STATUSES
+
+    def _future_kwargs(self) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = dict.fromkeys((
+            "order_validity_date", "contract_code", "contract_type", "long_short",
+            "pending_orders", "untransmitted_orders", "partially_executed_orders",
+            "cancelled_orders", "after_hour_session_valid"))
+        kwargs.update(self.filters)
+        return kwargs
+
+    # ——— Senkron ———
+    def _incremental(self, full: bool) -> bool:
+        return self._synced and not full and self.market == "stock"
+
+    def sync(self, full: bool = False) -> List[OrderEvent]:
+        """
+        Bir senkronizasyon turu calistirir ve olaylari doner (API).
+        `full=True` erken durmadan tum listeyi tarar.
+        """
+        scan = _Scan(self, self._incremental(full))
+        if self.market == "stock":
+            orders = self.api.iter_stock_orders(self.portfolio, descending_order=True,
+                                                **self.filters)
+            try:
+                for order in orders:
+                    if scan.feed(order):
+                        break
+            finally:
+                orders.close()
+        else:
+            resp = self.api.get_future_order_list(self.portfolio, **self._future_kwargs())
+            for order in self.api._page_items(resp):
+                scan.feed(order)
+        return self._apply(scan)
+
+    # ——— Asenkron ———
+    async def sync_async(self, full: bool = False) -> List[OrderEvent]:
+        """`sync` ile ayni; AsyncAPI ile kullanilir."""
+        scan = _Scan(self, self._incremental(full))
+        if self.market == "stock":
+            orders = self.api.iter_stock_orders(self.portfolio, descending_order=True,
+                                                **self.filters)
+            try:
+                async for order in orders:
+                    if scan.feed(order):
+                        break
+            finally:
+                await orders.aclose()
+        else:
+            resp = await self.api.get_future_order_list(self.portfolio, **self._future_kwargs())
+            for order in self.api._page_items(resp):
+                scan.feed(order)
+        return self._apply(scan)
+
+    # ——— Fark hesaplama ———
+    def _apply(self, scan: _Scan) -> List[OrderEvent]:
+        events: List[OrderEvent] = []
+        previous_refs = self._refs
+
+        # Taranan bolge: tam taramada tum liste, artimli taramada sinira kadar
+        if scan.boundary is None:
+            covered = previous_refs
+            tail: List[str] = []
+        else:
+            cut = previous_refs.index(scan.boundary) + 1
+            covered = previous_refs[:cut]
+            tail = previous_refs[cut:]
+
+        for ref, order in scan.seen.items():
+            previous = self._snapshot.get(ref)
+            if previous is None:
+                events.append(OrderEvent("added", ref, order, None))
+            elif previous != order:
+                events.append(OrderEvent("changed", ref, order, previous))
+
+        for ref in covered:
+            if ref not in scan.seen:
+                events.append(OrderEvent("removed", ref, None, self._snapshot[ref]))
+
+        snapshot = dict(scan.seen)
+        refs = list(scan.seen)
+        for ref in tail:
+            if ref not in snapshot:
+                snapshot[ref] = self._snapshot[ref]
+                refs.append(ref)
+        self._snapshot = snapshot
+        self._refs = refs
+        self._synced = True
+
+        self.syncs += 1
+        self.last_scanned = len(scan.seen)
+        self.total_scanned += len(scan.seen)
+
+        if self.on_event is not None:
+            for event in events:
+                self.on_event(event)
+        return events
@@ -0,0 +1,303 @@
+"""
+rate_limit.py
+
+REST istekleri icin thread-safe token bucket hiz sinirlayici.
+
+- Her endpoint grubu (Identity, Portfolio, Stock, Future) kendi kovasina
+  sahiptir; kova `rate` (sn basina token) hiziyla dolar ve en fazla
+  `burst` token biriktirir.
+- Bekleyenler kova basina tek bir oncelik kuyrugunda sira alir: once
+  `Priority` (CANCEL > ORDER > READ > BACKGROUND), esit oncelikte FIFO.
+  Kuyruk hem thread'leri (`acquire`) hem coroutine'leri (`acquire_async`)
+  ayni sirada tutar; sirasi gelmeyen bekleyici uyandirilana kadar uyur.
+- Bir bekleyici `deadline` tasiyabilir; kuyruktayken suresi dolarsa istek
+  gonderilmez, `DeadlineExceeded` firlatilir.
+- Her istegin kuyrukta bekledigi sure doner ve grup bazinda istatistik
+  olarak tutulur.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from errors import DeadlineExceeded
+
+if TYPE_CHECKING:
+    import asyncio
+
+DEFAULT_GROUPS = ("Identity", "Portfolio", "Stock", "Future")
+
+
+class Priority(IntEnum):
+    """Istek oncelik katmanlari; kucuk deger once gonderilir."""
+    CANCEL     = 0   # *DeleteOrder
+    ORDER      = 1   # *CreateOrder, *ReplaceOrder, Identity
+    READ       = 2   # Portfolio ve liste/pozisyon okumalari
+    BACKGROUND = 3   # Session yenileme gibi arka plan istekleri
+
+
+class _Ticket:
+    """Kuyruktaki tek bir bekleyici (thread ya da coroutine)."""
+    __slots__ = ("priority", "seq", "deadline", "_event", "_loop")
+
+    def __init__(
+        self,
+        priority: int,
+        seq: int,
+        deadline: Optional[float],
+        loop: Optional["asyncio.AbstractEventLoop"] = None
+    ):
+        self.priority = priority
+        self.seq = seq
+        self.deadline = deadline
+        self._loop = loop
+        if loop is None:
+            self._event: Any = threading.Event()
+        else:
+            import asyncio
+            self._event = asyncio.Event()
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def wake(self):
+        if self._loop is None:
+            self._event.set()
+        else:
+            self._loop.call_soon_threadsafe(self._event.set)
+
+
+class TokenBucket:
+    """
+    Tek bir endpoint grubu icin token bucket.
+
+    Parametreler:
+      rate  : Saniyede eklenen token sayisi (or. 2.0 → 2 istek/sn)
+      burst : Kovada birikebilecek en fazla token
+      name  : Istatistik ve loglar icin grup adi
+    """
+
+    def __init__(self, rate: float, burst: int = 1, name: str = ""):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate > 0 ve burst >= 1 olmali")
+        self.rate  = float(rate)
+        self.burst = int(burst)
+        self.name  = name
+
+        self._tokens = float(burst)
+        self._stamp  = time.monotonic()
+        self._lock   = threading.Lock()
+        self._waiters: List[_Ticket] = []
+        self._seq    = itertools.count()
+
+        # Istatistikler
+        self.count      = 0
+        self.total_wait = 0.0
+        self.max_wait   = 0.0
+        self.last_wait  = 0.0
+        self.expired    = 0
+
+    # ——— Ic yardimcilar (kilit altinda cagrilir) ———
+    def _refill(self, now: float):
+        elapsed = now - self._stamp
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._stamp = now
+
+    def _enqueue(
+        self,
+        priority: int,
+        timeout: Optional[float],
+        loop: Optional["asyncio.AbstractEventLoop"] = None
+    ) -> _Ticket:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ticket = _Ticket(int(priority), next(self._seq), deadline, loop)
+        with self._lock:
+            heapq.heappush(self._waiters, ticket)
+        return ticket
+
+    def _poll(self, ticket: _Ticket) -> Tuple[bool, Optional[float]]:
+        """
+        Sira bu bekleyicideyse ve token varsa token'i verir: (True, None).
+        Aksi halde (False, uyku suresi) doner; sure None ise bekleyici
+        uyandirilana kadar uyur. Deadline dolduysa DeadlineExceeded firlatir.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if ticket.deadline is not None and now >= ticket.deadline:
+                self.expired += 1
+                raise DeadlineExceeded(
+                    f"{self.name}: istek {now - ticket.deadline:.3f} sn gec kaldi, gonderilmedi"
+                )
+            delay: Optional[float] = None
+            if self._waiters[0] is ticket:
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    heapq.heappop(self._waiters)
+                    if self._waiters:
+                        self._waiters[0].wake()
+                    return True, None
+                delay = (1.0 - self._tokens) / self.rate
+            if ticket.deadline is not None:
+                remaining = ticket.deadline - now
+                delay = remaining if delay is None else min(delay, remaining)
+            return False, delay
+
+    def _abandon(self, ticket: _Ticket):
+        """Izin alamadan cikan (iptal/hata) bekleyiciyi kuyruktan siler."""
+        with self._lock:
+            try:
+                self._waiters.remove(ticket)
+            except ValueError:
+                return
+            heapq.heapify(self._waiters)
+            if self._waiters:
+                self._waiters[0].wake()
+
+    def _record(self, waited: float) -> float:
+        with self._lock:
+            self.count += 1
+            self.total_wait += waited
+            self.last_wait = waited
+            if waited > self.max_wait:
+                self.max_wait = waited
+        return waited
+
+    # ——— Public API ———
+    def acquire(
+        self,
+        priority: int = Priority.READ,
+        timeout: Optional[float] = None
+    ) -> float:
+        """
+        Thread'i token alinana kadar bekletir. `timeout` sn icinde sira
+        gelmezse DeadlineExceeded firlatir.
+        Donus: kuyrukta beklenen sure (sn).
+        """
+        start = time.monotonic()
+        ticket = self._enqueue(priority, timeout)
+        granted = False
+        try:
+            while True:
+                granted, delay = self._poll(ticket)
+                if granted:
+                    break
+                ticket._event.wait(delay)
+                ticket._event.clear()
+        finally:
+            if not granted:
+                self._abandon(ticket)
+        return self._record(time.monotonic() - start)
+
+    async def acquire_async(
+        self,
+        priority: int = Priority.READ,
+        timeout: Optional[float] = None
+    ) -> float:
+        """
+        Coroutine'i token alinana kadar bekletir (event loop bloklanmaz).
+        `timeout` sn icinde sira gelmezse DeadlineExceeded firlatir.
+        Donus: kuyrukta beklenen sure (sn).
+        """
+        import asyncio
+        start = time.monotonic()
+        ticket = self._enqueue(priority, timeout, asyncio.get_running_loop())
+        granted = False
+        try:
+            while True:
+                granted, delay = self._poll(ticket)
+                if granted:
+                    break
+                try:
+                    await asyncio.wait_for(ticket._event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                ticket._event.clear()
+        finally:
+            if not granted:
+                self._abandon(ticket)
+        return self._record(time.monotonic() - start)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "rate":       self.rate,
+                "burst":      self.burst,
+                "count":      self.count,
+                "waiting":    len(self._waiters),
+                "total_wait": self.total_wait,
+                "avg_wait":   self.total_wait / self.count if self.count else 0.0,
+                "max_wait":   self.max_wait,
+                "last_wait":  self.last_wait,
+                "expired":    self.expired,
+            }
+
+
+class RateLimiter:
+    """
+    Endpoint gruplarina gore token bucket'lari yoneten sinirlayici.
+
+    Grup, istek yolunun ilk parcasidir ("/Stock/StockCreateOrder" → "Stock").
+    `limits` ile grup bazinda (rate, burst) verilir; listede olmayan gruplar
+    `default` limitini kullanir.
+
+        limiter = RateLimiter({"Stock": (5, 5), "Portfolio": (2, 4)})
+        waited = limiter.acquire("/Stock/StockCreateOrder")
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        *,
+        default: Tuple[float, int] = (1.0, 1)
+    ):
+        self.default = default
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        limits = dict(limits or {})
+        for group in DEFAULT_GROUPS:
+            limits.setdefault(group, default)
+        for group, (rate, burst) in limits.items():
+            self._buckets[group] = TokenBucket(rate, burst, name=group)
+
+    @staticmethod
+    def group_for(path: str) -> str:
+        """Istek yolundan endpoint grubunu cikarir."""
+        return path.lstrip("/").split("/", 1)[0]
+
+    def bucket(self, path: str) -> TokenBucket:
+        group = self.group_for(path)
+        bucket = self._buckets.get(group)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(group)
+                if bucket is None:
+                    rate, burst = self.default
+                    bucket = self._buckets[group] = TokenBucket(rate, burst, name=group)
+        return bucket
+
+    def acquire(
+        self,
+        path: str,
+        priority: int = Priority.READ,
+        timeout: Optional[float] = None
+    ) -> float:
+        """Yolun grubundan bir token alir (thread). Beklenen sureyi doner."""
+        return self.bucket(path).acquire(priority, timeout)
+
+    async def acquire_async(
+        self,
+        path: str,
+        priority: int = Priority.READ,
+        timeout: Optional[float] = None
+    ) -> float:
+        """Yolun grubundan bir token alir (coroutine). Beklenen sureyi doner."""
+        return await self.bucket(path).acquire_async(priority, timeout)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Grup bazinda istek sayisi ve bekleme istatistikleri."""
+        return {name: b.stats() for name, b in list(self._buckets.items())}
@@ -0,0 +1,199 @@
+"""
+resilience.py
+
+REST istek hattinin tekrar deneme ve devre kesici politikalari.
+
+- `RetryPolicy`: yeniden denenebilir hatalarda (baglanti hatasi, zaman
+  asimi, 5xx, 429) "full jitter" ustel geri cekilme ile tekrar dener.
+  Yalnizca idempotent istekler tekrar denenir: okumalar ve emir silme.
+  Emir gonderme/duzeltme ve Identity istekleri (OTP, login) `retry_writes`
+  acikca verilmedikce tekrar gonderilmez; ilk istek sunucuya ulasmis ama
+  yanit kaybolmus olabilir.
+- `CircuitBreaker`: ayni endpoint'te ard arda `failure_threshold` kez
+  baglanti hatasi / 5xx alinirsa devre acilir ve `reset_timeout` sn boyunca
+  istekler gonderilmeden `CircuitOpenError` ile reddedilir. Sure dolunca tek
+  bir deneme istegine izin verilir; basariliysa devre kapanir.
+- `CircuitBreakers`: endpoint yolu → kesici eslemesi ve istatistikler.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from errors import (
+    APIError, CircuitOpenError, HTTPStatusError, RateLimitError, ServerError, TransportError
+)
+
+# retry_writes=False iken tekrar gonderilmeyen endpoint'ler
+_NON_IDEMPOTENT_SUFFIXES = ("CreateOrder", "ReplaceOrder")
+
+
+def is_idempotent(path: str) -> bool:
+    """Ayni istegi iki kez gondermek guvenli mi?"""
+    return not (path.endswith(_NON_IDEMPOTENT_SUFFIXES) or "Identity/" in path)
+
+
+class RetryPolicy:
+    """
+    Parametreler:
+      max_attempts : Ilk deneme dahil en fazla deneme sayisi (1 → tekrar yok)
+      base_delay   : Ilk geri cekilmenin ust siniri (sn)
+      max_delay    : Geri cekilme ust siniri (sn)
+      retry_writes : True ise emir gonderme/duzeltme de tekrar denenir
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 5.0,
+        retry_writes: bool = False
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts >= 1 olmali")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_writes = retry_writes
+
+        # Istatistikler
+        self.retries = 0
+        self.gave_up = 0
+
+    def backoff(self, path: str, error: APIError, attempt: int) -> Optional[float]:
+        """
+        `attempt`. deneme `error` ile bittiyse beklenecek sureyi doner;
+        tekrar denenmeyecekse None.
+        """
+        if not error.retryable or attempt >= self.max_attempts:
+            if error.retryable:
+                self.gave_up += 1
+            return None
+        if not self.retry_writes and not is_idempotent(path):
+            return None
+        # Full jitter: [0, min(max_delay, base * 2^(n-1))]
+        delay = random.uniform(0.0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if isinstance(error, RateLimitError) and error.retry_after is not None:
+            delay = max(delay, min(error.retry_after, self.max_delay))
+        self.retries += 1
+        return delay
+
+
+# Hic tekrar denemeyen politika
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+class CircuitBreaker:
+    """
+    Tek bir endpoint icin devre kesici.
+
+    Durumlar: "closed" (normal), "open" (reddet), "half_open" (tek deneme).
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 10.0, name: str = ""):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+        # Istatistikler
+        self.opened = 0
+        self.rejected = 0
+
+    @staticmethod
+    def counts(error: BaseException) -> bool:
+        """Hata, endpoint'in bozuldugunu mu gosteriyor? (4xx ve 429 sayilmaz)"""
+        return isinstance(error, (TransportError, ServerError))
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return self._state
+
+    def before(self):
+        """Istek oncesi cagrilir; devre aciksa CircuitOpenError firlatir."""
+        with self._lock:
+            if self._state == "closed":
+                return
+            now = time.monotonic()
+            remaining = self.reset_timeout - (now - self._opened_at)
+            if self._state == "open" and remaining <= 0:
+                self._state = "half_open"
+            if self._state == "half_open" and not self._probing:
+                self._probing = True
+                return
+            self.rejected += 1
+            raise CircuitOpenError(
+                f"{self.name}: devre acik, {max(0.0, remaining):.1f} sn sonra tekrar denenecek",
+                path=self.name, retry_after=max(0.0, remaining)
+            )
+
+    def success(self):
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._probing = False
+
+    def failure(self, error: BaseException):
+        """
+        before()'dan sonra istek hatayla bittiginde cagrilir. Yalnizca `counts`
+        hatalari sayilir; 4xx sunucunun cevap verdigini gosterir, gonderilmeden
+        biten istekler (or. DeadlineExceeded) devreyi etkilemez.
+        """
+        with self._lock:
+            if not self.counts(error):
+                if isinstance(error, HTTPStatusError):
+                    # Sunucu cevap verdi; ard arda hata serisi bozuldu
+                    self._state = "closed"
+                    self._failures = 0
+                self._probing = False
+                return
+            self._failures += 1
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                if self._state != "open":
+                    self.opened += 1
+                self._state = "open"
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state":    self.state,
+            "failures": self._failures,
+            "opened":   self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class CircuitBreakers:
+    """
+    Endpoint yolu bazinda devre kesiciler.
+
+        breakers = CircuitBreakers(failure_threshold=5, reset_timeout=10)
+        breakers.get("/Stock/StockOrderList").before()
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, path: str) -> CircuitBreaker:
+        breaker = self._breakers.get(path)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    path, CircuitBreaker(self.failure_threshold, self.reset_timeout, name=path))
+        return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {path: b.stats() for path, b in list(self._breakers.items())}
@@ -0,0 +1,159 @@
+"""
+response_cache.py
+
+Salt-okunur Portfolio endpoint'leri icin TTL + LRU yanit onbellegi.
+
+- Her endpoint kendi TTL suresine sahiptir (`DEFAULT_TTLS`); listede
+  olmayan endpoint'ler onbellege alinmaz.
+- Anahtar: (path, istek govdesi). Kayitlar ayrica portfoy numarasina
+  gore indekslenir; bir portfoyde emir gonderme/duzeltme/silme oldugunda
+  o portfoyun tum kayitlari `invalidate(portfolio)` ile silinir.
+- `invalidate` portfoyun nesil sayacini artirir. Okuma istek oncesi
+  `generation(portfolio)` alir ve `put`'a verir; arada yazma olduysa yanit
+  yazmadan onceki durumu gosterebilir, onbellege yazilmaz.
+- Boyut `maxsize` ile sinirlidir; dolunca en uzun sure kullanilmayan
+  kayit atilir.
+
+Onbellekten donen sozluk tum cagiranlar arasinda paylasilir; uzerinde
+degisiklik yapilmamalidir.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+DEFAULT_TTLS: Dict[str, float] = {
+    "/Portfolio/SubAccounts":     30.0,
+    "/Portfolio/AccountSummary":   5.0,
+    "/Portfolio/CashAssets":       5.0,
+    "/Portfolio/CashBalance":      5.0,
+    "/Portfolio/AccountOverall":   5.0,
+}
+
+_Key = Tuple[str, Hashable]
+
+
+class ResponseCache:
+    """
+    Thread-safe, endpoint bazli TTL'li LRU onbellek.
+
+    Parametreler:
+      maxsize : Tutulacak en fazla kayit
+      ttls    : path → TTL (sn). None ise DEFAULT_TTLS kullanilir.
+    """
+
+    def __init__(self, maxsize: int = 256, ttls: Optional[Dict[str, float]] = None):
+        self.maxsize = maxsize
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[_Key, Tuple[float, Optional[int], Any]]" = OrderedDict()
+        self._by_portfolio: Dict[Optional[int], Set[_Key]] = {}
+        # invalidate sayaclari: tum onbellek ve portfoy bazinda
+        self._epoch = 0
+        self._generations: Dict[Optional[int], int] = {}
+
+        # Istatistikler
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    @staticmethod
+    def _key(path: str, payload: Dict[str, Any]) -> _Key:
+        # Portfolio govdeleri duz skaler degerlerden olusur
+        return path, tuple(sorted(payload.items()))
+
+    def ttl_for(self, path: str) -> float:
+        """Endpoint'in TTL'i; 0 ise onbellege alinmaz."""
+        return self.ttls.get(path, 0.0)
+
+    def _drop(self, key: _Key):
+        _, portfolio, _ = self._entries.pop(key)
+        keys = self._by_portfolio.get(portfolio)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_portfolio[portfolio]
+
+    def get(self, path: str, payload: Dict[str, Any]) -> Optional[Any]:
+        """Gecerli kayit varsa doner, yoksa None."""
+        key = self._key(path, payload)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[2]
+                self._drop(key)
+            self.misses += 1
+            return None
+
+    def generation(self, portfolio: Optional[int]) -> Tuple[int, int]:
+        """Portfoyun su anki nesli; istek gonderilmeden once alinir."""
+        with self._lock:
+            return self._epoch, self._generations.get(portfolio, 0)
+
+    def put(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        value: Any,
+        generation: Optional[Tuple[int, int]] = None
+    ):
+        """
+        Yaniti onbellege yazar. `generation` verilir ve o zamandan beri
+        portfoy invalidate edildiyse yanit eski olabilir; yazilmaz.
+        """
+        ttl = self.ttl_for(path)
+        if ttl <= 0:
+            return
+        key = self._key(path, payload)
+        portfolio = payload.get("portfolioNumber")
+        with self._lock:
+            if generation is not None and generation != (
+                self._epoch, self._generations.get(portfolio, 0)
+            ):
+                self.stale_puts += 1
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, portfolio, value)
+            self._by_portfolio.setdefault(portfolio, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate(self, portfolio: Optional[int] = None):
+        """
+        Verilen portfoyun kayitlarini siler. SubAccounts gibi portfoyden
+        bagimsiz kayitlar da silinir. portfolio=None ise tum onbellek bosalir.
+        """
+        with self._lock:
+            if portfolio is None:
+                self._entries.clear()
+                self._by_portfolio.clear()
+                self._epoch += 1
+            else:
+                for owner in (portfolio, None):
+                    for key in list(self._by_portfolio.get(owner, ())):
+                        self._drop(key)
+                    self._generations[owner] = self._generations.get(owner, 0) + 1
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size":          len(self._entries),
+                "maxsize":       self.maxsize,
+                "hits":          self.hits,
+                "misses":        self.misses,
+                "hit_ratio":     self.hits / lookups if lookups else 0.0,
+                "evictions":     self.evictions,
+                "invalidations": self.invalidations,
+                "stale_puts":    self.stale_puts,
+            }
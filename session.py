@@ -0,0 +1,209 @@
+"""
+session.py
+
+Oturumu yalnizca gerektiginde canli tutan session yoneticisi (`SessionKeeper`):
+- Oturum `idle_timeout - margin` sn istek gormezse `get_subaccounts()` ile yenilenir
+- Suresi dolmus JWT (`exp`) icin istek atilmaz
+"""
+
+import base64
+import json
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    import asyncio
+
+from rate_limit import Priority
+
+logger = logging.getLogger("api_client")
+
+
+def jwt_claims(token: str) -> Dict[str, Any]:
+    """
+    JWT payload'ini imza dogrulamadan cozer. "Bearer " oneki kabul edilir.
+    Cozulemeyen token icin bos sozluk doner.
+    """
+    if token.startswith("Bearer "):
+        token = token[7:]
+    parts = token.split(".")
+    if len(parts) != 3:
+        return {}
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except (ValueError, TypeError):
+        return {}
+    return claims if isinstance(claims, dict) else {}
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """Token'in `exp` zamani (epoch sn); claim yoksa None."""
+    exp = jwt_claims(token).get("exp")
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+class SessionKeeper:
+    """
+    Bosta kalma suresine ve JWT bitis zamanina gore oturum yenileyici.
+
+    Parametreler:
+      api          : API ya da AsyncAPI nesnesi
+      idle_timeout : Sunucunun bos oturumu dusurdugu varsayilan sure (sn)
+      margin       : Zaman asimindan bu kadar sn once yenilenir
+    """
+
+    def __init__(self, api: Any, *, idle_timeout: float = 90.0, margin: float = 30.0):
+        if margin >= idle_timeout:
+            raise ValueError("margin, idle_timeout'tan kucuk olmali")
+        self.api = api
+        self.idle_timeout = idle_timeout
+        self.margin = margin
+
+        self._last_activity = time.monotonic()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._expired_logged = False
+
+        # Istatistikler
+        self.refreshes = 0
+        self.failures = 0
+        self.skipped = 0
+        self.refresh_time = 0.0
+
+    # ——— Durum ———
+    @property
+    def refresh_after(self) -> float:
+        """Bu kadar sn istek yapilmazsa yenileme yapilir."""
+        return self.idle_timeout - self.margin
+
+    def touch(self):
+        """Basarili bir kimlikli istek yapildigini kaydeder."""
+        self._last_activity = time.monotonic()
+
+    def idle_for(self) -> float:
+        return time.monotonic() - self._last_activity
+
+    def expires_in(self) -> Optional[float]:
+        """JWT'nin bitmesine kalan sn; token yoksa ya da exp yoksa None."""
+        token = self.api._jwt_token
+        if not token:
+            return None
+        exp = jwt_expiry(token)
+        return None if exp is None else exp - time.time()
+
+    def _token_usable(self) -> bool:
+        """Token var ve suresi dolmamis mi."""
+        if not self.api._jwt_token:
+            return False
+        remaining = self.expires_in()
+        return remaining is None or remaining > 0
+
+    def _next_wait(self) -> float:
+        # Token yoksa (login bekleniyor) ya da suresi dolduysa bosta kalma suresi
+        # anlamsizdir; 0 donmek dongunun bos yere donmesine yol acar. Tam bir
+        # tur beklenir, login sonrasi ilk uyanista normal akisa donulur.
+        if not self._token_usable():
+            return self.refresh_after
+        return max(0.0, self.refresh_after - self.idle_for())
+
+    def _should_refresh(self) -> bool:
+        """Uyanista yenileme gerekip gerekmedigine karar verir."""
+        if not self.api._jwt_token:
+            return False
+        if not self._token_usable():
+            if not self._expired_logged:
+                logger.warning(
+                    "⏰ JWT suresi doldu; session yenilemesi durduruldu, yeniden login gerekli."
+                )
+                self._expired_logged = True
+            return False
+        self._expired_logged = False
+        if self.idle_for() < self.refresh_after:
+            self.skipped += 1
+            return False
+        return True
+
+    def _record(self, resp: Any, started: float):
+        self.refresh_time += time.monotonic() - started
+        if isinstance(resp, dict) and resp.get("statusCode", resp.get("status")) == 200:
+            self.refreshes += 1
+            if self.api.verbose:
+                logger.info("🔄 Session refreshed via get_subaccounts()")
+        else:
+            self.failures += 1
+            # Ard arda deneme yapmamak icin bir sonraki tur bekletilir
+            self.touch()
+            logger.warning("❌ Session refresh failed: %s", resp)
+
+    # ——— Thread (API) ———
+    def _refresh(self):
+        started = time.monotonic()
+        try:
+            with self.api.request_options(priority=Priority.BACKGROUND, cache=False):
+                resp = self.api.get_subaccounts()
+        except Exception as e:
+            resp = e
+        self._record(resp, started)
+
+    def _run(self):
+        while not self._stop.wait(self._next_wait()):
+            if self._should_refresh():
+                self._refresh()
+
+    def start(self):
+        """Yenileyici thread'i baslatir (API)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="session-keeper", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """Yenileyiciyi durdurur; thread ya da task bitene kadar bekler."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    # ——— asyncio (AsyncAPI) ———
+    async def _run_async(self):
+        import asyncio
+        while not self._stop.is_set():
+            await asyncio.sleep(self._next_wait())
+            if self._stop.is_set() or not self._should_refresh():
+                continue
+            started = time.monotonic()
+            try:
+                with self.api.request_options(priority=Priority.BACKGROUND, cache=False):
+                    resp = await self.api.get_subaccounts()
+            except Exception as e:
+                resp = e
+            self._record(resp, started)
+
+    def start_async(self) -> "asyncio.Task[None]":
+        """Yenileyiciyi calisan event loop'ta task olarak baslatir (AsyncAPI)."""
+        import asyncio
+        if self._task is None or self._task.done():
+            self._stop.clear()
+            self._task = asyncio.ensure_future(self._run_async())
+        return self._task
+
+    # ——— Istatistik ———
+    def stats(self) -> Dict[str, Any]:
+        """Yenileme ve atlanan tur sayilari, ortalama yenileme gecikmesi (sn)."""
+        attempts = self.refreshes + self.failures
+        return {
+            "refreshes":   self.refreshes,
+            "failures":    self.failures,
+            "skipped":     self.skipped,
+            "avg_latency": self.refresh_time / attempts if attempts else 0.0,
+            "idle_for":    self.idle_for(),
+            "expires_in":  self.expires_in(),
+        }
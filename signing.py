@@ -0,0 +1,99 @@
+"""
+signing.py
+
+REST ve WebSocket isteklerinin ortak HMAC imzalayicisi ve endpoint bazli
+istek sablonlari:
+- Imza: base64(HMAC-SHA256(secret, "{client_key}|{path}|{body}|{timestamp}"))
+- `Signer` anahtarlanmis HMAC durumunu bir kez hazirlar, imzalar `.copy()` ile baslar
+- `RequestTemplate` endpoint'in URL'sini, sabit header'larini ve path onekli
+  HMAC durumunu tutar; istek basina yalnizca govde ve zaman damgasi eklenir
+"""
+
+import hashlib
+import hmac
+import threading
+from binascii import b2a_base64
+from typing import Dict, Optional
+
+# Her istekte degismeyen header'lar
+STATIC_HEADERS: Dict[str, str] = {
+    "Content-Type": "application/json; charset=utf-8",
+    "Accept":       "application/json; charset=utf-8",
+}
+
+
+def _b64(mac: bytes) -> str:
+    return b2a_base64(mac, newline=False).decode("ascii")
+
+
+class RequestTemplate:
+    """
+    Tek endpoint icin hazir istek parcalari. `Signer.template()` ile alinir.
+
+    Ozellikler:
+      path : "/Portfolio/AccountSummary" gibi imzalanan yol
+      url  : api_url + path
+    """
+
+    __slots__ = ("path", "url", "_mac", "_static")
+
+    def __init__(self, path: str, url: str, mac: "hmac.HMAC", static: Dict[str, str]):
+        self.path = path
+        self.url = url
+        self._mac = mac
+        self._static = static
+
+    def sign(self, body: bytes, timestamp: str) -> str:
+        """Govde ve zaman damgasini hazir onek durumuna ekleyip imzalar."""
+        mac = self._mac.copy()
+        mac.update(body)
+        mac.update(b"|" + timestamp.encode("ascii"))
+        return _b64(mac.digest())
+
+    def headers(self, body: bytes, timestamp: str, jwt_token: str = "") -> Dict[str, str]:
+        """Imzali header sozlugu; `jwt_token` verilirse Authorization eklenir."""
+        headers = self._static.copy()
+        headers["X-Timestamp"] = timestamp
+        headers["X-Signature"] = self.sign(body, timestamp)
+        if jwt_token:
+            headers["Authorization"] = f"Bearer {jwt_token}"
+        return headers
+
+
+class Signer:
+    """
+    Anahtari bir kez hazirlanmis HMAC-SHA256 imzalayici; thread-safe.
+
+    Parametreler:
+      client_key : X-ClientKey (imza girdisinin ilk parcasi)
+      secret_key : HMAC secret
+    """
+
+    def __init__(self, client_key: str, secret_key: str):
+        self.client_key = client_key
+        self._base = hmac.new(secret_key.encode("utf-8"),
+                              f"{client_key}|".encode("utf-8"),
+                              digestmod=hashlib.sha256)
+        self._static = {"X-ClientKey": client_key, **STATIC_HEADERS}
+        self._lock = threading.Lock()
+        self._templates: Dict[str, RequestTemplate] = {}
+
+    def sign(self, path: str, body: bytes, timestamp: str) -> str:
+        """Sablonsuz imza (or. WebSocket el sikismasi); `body` UTF-8 bayt."""
+        mac = self._base.copy()
+        mac.update(path.encode("utf-8") + b"|" + body + b"|" + timestamp.encode("ascii"))
+        return _b64(mac.digest())
+
+    def template(self, path: str, base_url: str = "") -> RequestTemplate:
+        """
+        `path` icin sablon; ilk cagrida olusturulur, sonra ayni nesne doner.
+        Ayni Signer tek bir base_url ile kullanilmalidir.
+        """
+        tpl: Optional[RequestTemplate] = self._templates.get(path)
+        if tpl is None:
+            mac = self._base.copy()
+            mac.update(path.encode("utf-8") + b"|")
+            with self._lock:
+                tpl = self._templates.setdefault(
+                    path, RequestTemplate(path, f"{base_url}{path}", mac, self._static))
+        return tpl
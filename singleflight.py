@@ -0,0 +1,162 @@
+"""
+singleflight.py
+
+Ayni anda yapilan ozdes okuma isteklerini tek bir ag istegine indirger
+(`SingleFlight`):
+- Ayni anahtar (path + oncelik + govde) icin ilk cagri ("lider") istegi yapar;
+  lider bitene kadar gelenler ("takipci") onun sonucunu ya da hatasini alir
+- Yalnizca devam eden istekler birlestirilir; sonuc saklanmaz (`ResponseCache`)
+- Donen sozluk cagiranlar arasinda paylasilir; degistirilmemelidir
+"""
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from errors import DeadlineExceeded
+
+if TYPE_CHECKING:
+    import asyncio
+
+_Key = Tuple[str, int, Hashable]
+
+
+def flight_key(path: str, payload: Dict[str, Any], priority: int) -> _Key:
+    """
+    (path, oncelik, sirali govde alanlari); `ResponseCache` anahtariyla ayni
+    bicim. Alan sirasi anahtari degistirmez; {"a": 1, "b": 2} ile
+    {"b": 2, "a": 1} ayni istektir. Govde burada serilestirilmez.
+    """
+    # Okuma govdeleri duz skaler degerlerden olusur
+    return path, int(priority), tuple(sorted(payload.items()))
+
+
+def _expired(key: _Key) -> DeadlineExceeded:
+    return DeadlineExceeded(f"{key[0]}: deadline ortak istek bitmeden doldu", path=key[0])
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Anahtar bazli devam eden istek tablosu; thread ve coroutine'ler icin.
+
+    - Senkron (`do`) ve asenkron (`do_async`) cagrilar ayri tutulur; bir
+      thread bir coroutine'in sonucunu beklemez. Asenkron lider iptal edilse
+      bile istek takipciler icin task olarak tamamlanir.
+    - `expires` (mutlak `time.monotonic()`) veren cagri devam eden istege
+      yalnizca kalan suresi kadar bekler, sonra `DeadlineExceeded` firlatir.
+      Boyle bir cagri lider olmaz; deadline'i olmayan takipciler onun sure
+      asimini devralmaz.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[_Key, _Call] = {}
+        self._tasks: Dict[_Key, "asyncio.Task[Any]"] = {}
+
+        # Istatistikler
+        self.leaders = 0
+        self.collapsed = 0
+        self.solo = 0
+        self.expired = 0
+
+    # ——— Senkron ———
+    def do(self, key: _Key, fn: Callable[[], Any], expires: Optional[float] = None) -> Any:
+        """
+        `key` icin devam eden bir cagri varsa onun sonucunu bekler; yoksa
+        `fn()`'i calistirir ve sonucu bekleyen herkese dagitir. `expires`
+        verilirse en fazla o ana kadar beklenir ve cagri lider olmaz.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None and expires is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            elif call is not None:
+                self.collapsed += 1
+            else:
+                self.solo += 1
+
+        if call is None:
+            return fn()
+        if not leader:
+            timeout = None if expires is None else max(0.0, expires - time.monotonic())
+            if not call.done.wait(timeout):
+                with self._lock:
+                    self.expired += 1
+                raise _expired(key)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    # ——— asyncio ———
+    async def do_async(
+        self, key: _Key, fn: Callable[[], Awaitable[Any]], expires: Optional[float] = None
+    ) -> Any:
+        """`do` ile ayni; `fn()` bir coroutine doner ve task olarak calistirilir."""
+        import asyncio
+        with self._lock:
+            task = self._tasks.get(key)
+            if task is None and expires is not None:
+                self.solo += 1
+            elif task is None:
+                task = asyncio.ensure_future(fn())
+                self._tasks[key] = task
+                self.leaders += 1
+
+                def _forget(t: "asyncio.Task[Any]", key: _Key = key):
+                    with self._lock:
+                        if self._tasks.get(key) is t:
+                            del self._tasks[key]
+                    # Bekleyen kalmadiysa "exception never retrieved" uyarisi cikmasin
+                    if not t.cancelled():
+                        t.exception()
+
+                task.add_done_callback(_forget)
+            else:
+                self.collapsed += 1
+        if task is None:
+            return await fn()
+        # shield: bekleyenlerden biri iptal edilirse ortak istek iptal olmaz
+        if expires is None:
+            return await asyncio.shield(task)
+        try:
+            timeout = max(0.0, expires - time.monotonic())
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.expired += 1
+            raise _expired(key) from None
+
+    # ——— Istatistik ———
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = self.leaders + self.collapsed
+            return {
+                "in_flight":      len(self._calls) + len(self._tasks),
+                "leaders":        self.leaders,
+                "collapsed":      self.collapsed,
+                "solo":           self.solo,
+                "expired":        self.expired,
+                "collapse_ratio": self.collapsed / calls if calls else 0.0,
+            }
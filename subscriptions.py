@@ -0,0 +1,168 @@
+"""
+subscriptions.py
+
+WebSocket abonelik yoneticisi (`SubscriptionManager`):
+- Kanal (T, D, Y) basina istenen sembol kumesini tutar
+- `window` sn icindeki istekleri birlestirir; aktif kumeyle yalnizca farki
+  kanal basina tek RemoveX / AddX mesajiyla gonderir
+- Uzun listeleri `max_symbols`'luk parcalara boler (`chunked`)
+"""
+
+from typing import (
+    TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set
+)
+
+if TYPE_CHECKING:
+    import asyncio
+    from api_client import WebSocket
+
+# T: islem (trade), D: derinlik, Y: ozet
+CHANNELS = ("T", "D", "Y")
+
+# Tek abonelik mesajindaki en fazla sembol
+MAX_SYMBOLS_PER_MESSAGE = 500
+
+
+def chunked(symbols: Sequence[str], size: int = MAX_SYMBOLS_PER_MESSAGE) -> Iterator[List[str]]:
+    """Sembol listesini en fazla `size` elemanli parcalara boler."""
+    for i in range(0, len(symbols), size):
+        yield list(symbols[i:i + size])
+
+
+class SubscriptionManager:
+    """
+    Metotlar WebSocket'in event loop'unda calisir; baska thread'den
+    `asyncio.run_coroutine_threadsafe(subs.subscribe("T", ["GARAN"]), loop)`.
+
+    Parametreler:
+      ws          : Mesajlari gonderen WebSocket (aktif kume `ws.subscriptions`)
+      window      : Isteklerin tek mesajda birlestirildigi pencere (sn)
+      max_symbols : Mesaj basina en fazla sembol
+    """
+
+    def __init__(
+        self,
+        ws: "WebSocket",
+        *,
+        window: float = 0.05,
+        max_symbols: int = MAX_SYMBOLS_PER_MESSAGE
+    ):
+        if max_symbols < 1:
+            raise ValueError("max_symbols >= 1 olmali")
+        self.ws = ws
+        self.window = window
+        self.max_symbols = max_symbols
+        # Baslangicta istenen kume aktif kumedir; disaridan gonderilmis abonelikler korunur
+        self._desired: Dict[str, Set[str]] = {c: set() for c in CHANNELS}
+        for channel, symbols in ws.subscriptions.items():
+            self._desired.setdefault(channel, set()).update(symbols)
+        self._flush: Optional["asyncio.Future[None]"] = None
+
+        # Istatistikler
+        self.requests = 0
+        self.messages = 0
+        self.added = 0
+        self.removed = 0
+        self.redundant = 0
+        self.coalesced = 0
+
+    # ——— Istekler ———
+    async def subscribe(self, channel: str, symbols: Iterable[str]) -> List[str]:
+        """
+        `channel` kanalina abone olur; pencere gonderilene kadar bekler.
+        Istenen kumeye yeni eklenen sembolleri doner (zaten istenenler atlanir).
+        """
+        desired = self._channel(channel)
+        changed = [s for s in dict.fromkeys(symbols) if s not in desired]
+        desired.update(changed)
+        return await self._request(changed)
+
+    async def unsubscribe(self, channel: str, symbols: Iterable[str]) -> List[str]:
+        """`channel` aboneliginden cikar; istenen kumeden cikarilan sembolleri doner."""
+        desired = self._channel(channel)
+        changed = [s for s in dict.fromkeys(symbols) if s in desired]
+        desired.difference_update(changed)
+        return await self._request(changed)
+
+    async def replace(self, channel: str, symbols: Iterable[str]) -> List[str]:
+        """`channel` icin istenen kumeyi `symbols` yapar; degisen sembolleri doner."""
+        desired = self._channel(channel)
+        target = set(symbols)
+        changed = sorted(desired ^ target)
+        desired.clear()
+        desired.update(target)
+        return await self._request(changed)
+
+    def _channel(self, channel: str) -> Set[str]:
+        if channel not in self._desired:
+            raise ValueError(f"Bilinmeyen kanal: {channel!r} (beklenen: {', '.join(CHANNELS)})")
+        return self._desired[channel]
+
+    async def _request(self, changed: List[str]) -> List[str]:
+        import asyncio
+        self.requests += 1
+        if not changed:
+            self.redundant += 1
+            # Daha once istenmis ama henuz gonderilmemis bir degisiklik olabilir
+            if self._flush is not None:
+                await asyncio.shield(self._flush)
+            return changed
+        if self._flush is None:
+            self._flush = asyncio.ensure_future(self._flush_after(self.window))
+        else:
+            self.coalesced += 1
+        await asyncio.shield(self._flush)
+        return changed
+
+    async def _flush_after(self, delay: float):
+        import asyncio
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            # Bu noktadan sonra gelen istekler yeni bir pencere acar
+            self._flush = None
+        await self.sync()
+
+    # ——— Gonderim ———
+    def diff(self) -> Dict[str, Dict[str, List[str]]]:
+        """Kanal → {"add": [...], "remove": [...]}; istenen ile aktif kume arasindaki fark."""
+        active = self.ws.subscriptions
+        changes: Dict[str, Dict[str, List[str]]] = {}
+        for channel, desired in self._desired.items():
+            current = active.get(channel, set())
+            add = sorted(desired - current)
+            remove = sorted(current - desired)
+            if add or remove:
+                changes[channel] = {"add": add, "remove": remove}
+        return changes
+
+    async def sync(self):
+        """Farki hemen gonderir: once RemoveX, sonra AddX mesajlari."""
+        changes = self.diff()
+        token = self.ws._jwt_token
+        for action, key in (("Remove", "remove"), ("Add", "add")):
+            for channel, change in changes.items():
+                for part in chunked(change[key], self.max_symbols):
+                    message = {"Token": token, "Type": f"{action}{channel}", "Symbols": part}
+                    await self.ws._send(message)
+                    self.messages += 1
+                if key == "add":
+                    self.added += len(change[key])
+                else:
+                    self.removed += len(change[key])
+
+    # ——— Durum ———
+    @property
+    def desired(self) -> Dict[str, Set[str]]:
+        return {c: set(s) for c, s in self._desired.items() if s}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests":  self.requests,
+            "messages":  self.messages,
+            "added":     self.added,
+            "removed":   self.removed,
+            "redundant": self.redundant,
+            "coalesced": self.coalesced,
+            "desired":   {c: len(s) for c, s in self._desired.items() if s},
+        }
@@ -11,7 +11,6 @@ from datetime import datetime
 from typing import Optional, cast
 
 # ── Üçüncü parti ────────────────────────────────────────────────────────
-from requests.exceptions import RequestException
 from rich.console import Console
 from rich.theme import Theme
 from rich.syntax import Syntax
@@ -22,6 +21,10 @@ from rich.table import Table
 
 # ── Yerel modüller ───────────────────────────────────────────────────────
 from api_client import API, WebSocket
+from subscriptions import SubscriptionManager
+from market_data import MarketData
+from errors import APIError, HTTPStatusError
+from log_setup import configure_logging
 from config import (
     API_URL, API_KEY, API_SECRET, USERNAME, PASSWORD,
     DIRECTION_MAP, ORDER_METHOD_MAP, ORDER_DURATION_MAP,
@@ -54,6 +57,8 @@ console = Console(theme=theme)
 # ── Global nesneler ──────────────────────────────────────────────────────
 api: Optional[API]                      = None
 ws: Optional[WebSocket]                 = None
+subs: Optional[SubscriptionManager]     = None
+market: Optional[MarketData]            = None
 loop: Optional[asyncio.AbstractEventLoop] = None
 ws_thread: Optional[threading.Thread]   = None
 logger_proc: Optional[subprocess.Popen] = None
@@ -96,7 +101,7 @@ def _run_ws_loop(ws: WebSocket, evloop: asyncio.AbstractEventLoop):
 
 def start_websocket() -> None:
     """WS client + logger’ı tek seferde hazırlar."""
-    global ws, loop, ws_thread, logger_proc
+    global ws, subs, market, loop, ws_thread, logger_proc
     if ws:  # zaten başlatılmış
         return
 
@@ -123,9 +128,15 @@ def start_websocket() -> None:
         secret_key         = API_SECRET,
         jwt_token          = api._jwt_token,        # type: ignore[attr-defined]
         heartbeat_interval = 300,
-        verbose            = False
+        verbose            = False,
+        clock              = api.clock              # type: ignore[attr-defined]
     )
     ws.on_message = on_message
+    # Abonelikler bu yönetici üzerinden: fark alınır, pencere içindeki istekler birleşir
+    subs = SubscriptionManager(ws)
+    # Sembol başına son fiyat; menüden JSON çözmeden okunur
+    market = MarketData()
+    market.attach(ws)
 
     # 3) Event-loop + thread
     loop = asyncio.new_event_loop()
@@ -164,7 +175,7 @@ def rich_login():
     if not getattr(api, "_jwt_token", None):
         try:
             otp = api.send_otp(USERNAME or "", PASSWORD or "")
-        except RequestException as e:
+        except APIError as e:
             console.print("[error]OTP isteği hatası:[/error]", e)
             sys.exit(1)
 
@@ -178,7 +189,7 @@ def rich_login():
 
         try:
             login_resp = api.login(token, code)
-        except RequestException as e:
+        except APIError as e:
             console.print("[error]Giriş hatası:[/error]", e)
             sys.exit(1)
 
@@ -529,6 +540,17 @@ def get_future_positions():
  # ════════════════════════════════════════════════════════════════════════
 
 
+def run_endpoint(action) -> None:
+    """Endpoint çağrısını çalıştırır; API hatasını menüyü kapatmadan gösterir."""
+    try:
+        action()
+    except HTTPStatusError as e:
+        console.print(f"[error]{e}[/error]")
+        if e.data is not None:
+            json_panel(e.data, title=f"HTTP {e.status}")
+    except APIError as e:
+        console.print(f"[error]İstek başarısız: {e}[/error]")
+
 # ════════════════════════════════════════════════════════════════════════
 # Menü yapısı
 # ------------------------------------------------------------------------
@@ -567,11 +589,11 @@ def portfolio_menu() -> None:
             ("0", "Ana Menü"),
         ])
         if choice == "0": return
-        elif choice == "1": get_subaccounts()
-        elif choice == "2": get_account_summary()
-        elif choice == "3": get_cash_assets()
-        elif choice == "4": get_cash_balance()
-        elif choice == "5": get_account_overall()
+        elif choice == "1": run_endpoint(get_subaccounts)
+        elif choice == "2": run_endpoint(get_account_summary)
+        elif choice == "3": run_endpoint(get_cash_assets)
+        elif choice == "4": run_endpoint(get_cash_balance)
+        elif choice == "5": run_endpoint(get_account_overall)
         else: console.print("[warning]Geçersiz seçim.[/warning]")
 
 def stock_menu() -> None:
@@ -585,11 +607,11 @@ def stock_menu() -> None:
             ("0", "Ana Menü"),
         ])
         if choice == "0": return
-        elif choice == "1": get_stock_create_order()
-        elif choice == "2": get_stock_replace_order()
-        elif choice == "3": get_stock_delete_order()
-        elif choice == "4": get_stock_order_list()
-        elif choice == "5": get_stock_positions()
+        elif choice == "1": run_endpoint(get_stock_create_order)
+        elif choice == "2": run_endpoint(get_stock_replace_order)
+        elif choice == "3": run_endpoint(get_stock_delete_order)
+        elif choice == "4": run_endpoint(get_stock_order_list)
+        elif choice == "5": run_endpoint(get_stock_positions)
         else: console.print("[warning]Geçersiz seçim.[/warning]")
 
 def future_menu() -> None:
@@ -603,25 +625,57 @@ def future_menu() -> None:
             ("0", "Ana Menü"),
         ])
         if choice == "0": return
-        elif choice == "1": get_future_create_order()
-        elif choice == "2": get_future_replace_order()
-        elif choice == "3": get_future_delete_order()
-        elif choice == "4": get_future_order_list()
-        elif choice == "5": get_future_positions()
+        elif choice == "1": run_endpoint(get_future_create_order)
+        elif choice == "2": run_endpoint(get_future_replace_order)
+        elif choice == "3": run_endpoint(get_future_delete_order)
+        elif choice == "4": run_endpoint(get_future_order_list)
+        elif choice == "5": run_endpoint(get_future_positions)
         else: console.print("[warning]Geçersiz seçim.[/warning]")
 
+def show_last_prices():
+    """Abone olunan sembollerin son işlem ve kademe bilgisini tablo olarak gösterir."""
+    trades = market.snapshot(channel="T")   # type: ignore[union-attr]
+    quotes = market.snapshot(channel="D")   # type: ignore[union-attr]
+    if not trades and not quotes:
+        console.print("[warning]Henüz fiyat verisi gelmedi.[/warning]")
+        return
+
+    def fmt(value: float) -> str:
+        return "-" if value != value else f"{value:,.2f}"
+
+    table = Table(title="Son Fiyatlar", border_style="cyan")
+    for column in ("Sembol", "Son", "Adet", "Alış", "Satış", "Güncelleme"):
+        table.add_column(column)
+    for symbol in sorted(set(trades) | set(quotes)):
+        trade, quote = trades.get(symbol), quotes.get(symbol)
+        updated = max(r.time for r in (trade, quote) if r is not None)
+        table.add_row(
+            symbol,
+            fmt(trade.price) if trade else "-",
+            fmt(trade.size) if trade else "-",
+            fmt(quote.bid) if quote else "-",
+            fmt(quote.ask) if quote else "-",
+            datetime.fromtimestamp(updated).strftime("%H:%M:%S"),
+        )
+    console.print(table)
+
 def websocket_menu():
     start_websocket()
     while True:
         choice = select_from_menu("WebSocket Abonelik Menüsü", [
             ("1", "Abone Ol"),
             ("2", "Abonelikten Çık"),
+            ("3", "Son Fiyatlar"),
             ("0", "Ana Menü"),
         ])
 
         if choice == "0":
             return
 
+        elif choice == "3":
+            show_last_prices()
+            continue
+
         elif choice == "1":  # Abone ol
             type_map = WEBSOCKET_SUBSCRIBE
             action = "Abonelik"
@@ -645,17 +699,20 @@ def websocket_menu():
             console.print("[warning]Geçerli sembol girilmedi.[/warning]")
             continue
 
-        # WebSocket mesajı oluştur
-        payload = {
-            "Token": ws._jwt_token,  # type: ignore[attr-defined]
-            "Type": typ,
-            "Symbols": symbols,
-        }
+        # Abonelik yöneticisi zaten aktif olanları atlar, yalnızca farkı gönderir
+        channel = typ[-1]  # AddT / RemoveT → T
+        request = subs.subscribe if choice == "1" else subs.unsubscribe  # type: ignore[union-attr]
 
         try:
-            fut = asyncio.run_coroutine_threadsafe(ws._send(payload), loop)  # type: ignore[arg-type]
-            fut.result(timeout=5)
-            console.print(f"[success]✅ {action} başarılı:[/success]")
+            coro = request(channel, symbols)
+            fut = asyncio.run_coroutine_threadsafe(coro, loop)  # type: ignore[arg-type]
+            changed = fut.result(timeout=5)
+            console.print(f"[success]✅ {action} başarılı:[/success] {', '.join(changed) or '-'}")
+            skipped = [s for s in symbols if s not in changed]
+            if skipped:
+                console.print(
+                    f"[info]Değişiklik yok (zaten bu durumda): {', '.join(skipped)}[/info]"
+                )
         except Exception as e:
             console.print(f"[error]❌ Gönderim hatası:[/error] {e}")
 
@@ -663,6 +720,7 @@ def websocket_menu():
 # Uygulama giriş noktası
 # ------------------------------------------------------------------------
 def main():
+    configure_logging("logs.log")
     console.clear()
     show_api_info()
     rich_login()
@@ -0,0 +1,8 @@
+"""Testler depo kokundeki modulleri dogrudan import eder (benchmarks/_common.py gibi)."""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,66 @@
+"""request_options(deadline=...) cagri basina mutlak sure; tekrar denemeler sureyi yenilememeli."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from api_client import API, AsyncAPI  # noqa: E402
+from errors import DeadlineExceeded  # noqa: E402
+from mock_server import MockServer  # noqa: E402
+from rate_limit import RateLimiter  # noqa: E402
+from resilience import RetryPolicy  # noqa: E402
+from token_store import TokenStore  # noqa: E402
+
+DEADLINE = 0.1
+# Her deneme en az 0.04 sn surer: deadline icinde en fazla uc gonderim sigar
+# (deadline her denemede yenilenseydi 10). Sunucunun gordugu zaman yuk altinda
+# deadline'i gecebildiginden zaman degil gonderim sayisi olculur.
+MAX_SENDS = 3
+
+
+def _server(sent):
+    def route(payload):
+        sent.append(payload)
+        time.sleep(0.04)
+        return 503, {"statusCode": 503}
+    return MockServer(routes={"/Portfolio/CashBalance": route})
+
+
+def _options(tmp_path):
+    return dict(api_key="k", secret_key="s", verbose=False,
+                token_store=TokenStore(str(tmp_path / "api_settings.json")),
+                retry=RetryPolicy(max_attempts=10, base_delay=0.03, max_delay=0.03),
+                limiter=RateLimiter({"Portfolio": (1e6, 1000)}))
+
+
+def test_sync_retries_stay_inside_deadline(tmp_path):
+    sent = []
+    with _server(sent) as server:
+        api = API(api_url=server.url, validate="lazy", **_options(tmp_path))
+        try:
+            with api.request_options(deadline=DEADLINE), pytest.raises(DeadlineExceeded):
+                api.get_cash_balance(1)
+        finally:
+            api.close()
+    assert 1 <= len(sent) <= MAX_SENDS
+
+
+def test_async_retries_stay_inside_deadline(tmp_path):
+    sent = []
+
+    async def run():
+        async with AsyncAPI(api_url=server.url, **_options(tmp_path)) as api:
+            with api.request_options(deadline=DEADLINE):
+                with pytest.raises(DeadlineExceeded):
+                    await api.get_cash_balance(1)
+
+    with _server(sent) as server:
+        asyncio.run(run())
+    assert 1 <= len(sent) <= MAX_SENDS
@@ -0,0 +1,20 @@
+"""configure_logging: kuyruga atilan kayit, cagiran sonradan degistirdigi sozlugu yazmamali."""
+
+import io
+import logging
+
+from log_setup import configure_logging, shutdown_logging
+
+
+def test_message_is_snapshotted_before_queueing():
+    out = io.StringIO()
+    configure_logging(handler=logging.StreamHandler(out), fmt="%(message)s",
+                      logger_name="test_log_setup")
+    try:
+        logger = logging.getLogger("test_log_setup")
+        data = {"balance": 1}
+        logger.info("[RESP] %s", data)
+        data["balance"] = 2
+    finally:
+        shutdown_logging()
+    assert out.getvalue().splitlines() == ["[RESP] {'balance': 1}"]
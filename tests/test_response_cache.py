@@ -0,0 +1,60 @@
+"""ResponseCache: yazmadan once baslayip sonra biten okuma onbellege eski veri koymamali."""
+
+import os
+import sys
+import threading
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from api_client import API  # noqa: E402
+from mock_server import MockServer  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from token_store import TokenStore  # noqa: E402
+
+PATH = "/Portfolio/CashBalance"
+
+
+def test_put_skipped_after_invalidate():
+    cache = ResponseCache()
+    before = cache.generation(1)
+    other = cache.generation(None)
+    cache.invalidate(1)
+    cache.put(PATH, {"portfolioNumber": 1}, {"old": True}, before)
+    # Portfoyden bagimsiz kayitlar da her invalidate'te silinir
+    cache.put("/Portfolio/SubAccounts", {}, {"old": True}, other)
+    assert cache.get(PATH, {"portfolioNumber": 1}) is None
+    assert cache.get("/Portfolio/SubAccounts", {}) is None
+    assert cache.stats()["stale_puts"] == 2
+
+    # Baska portfoyun nesli degismedi
+    cache.put(PATH, {"portfolioNumber": 2}, {"ok": True}, cache.generation(2))
+    assert cache.get(PATH, {"portfolioNumber": 2}) == {"ok": True}
+
+
+def test_read_racing_a_write_is_not_cached(tmp_path):
+    arrived = threading.Event()
+    release = threading.Event()
+
+    def route(payload):
+        arrived.set()
+        release.wait(2)
+        return 200, {"statusCode": 200, "data": {"balance": 1}}
+
+    with MockServer(routes={PATH: route}) as server:
+        api = API(api_key="k", secret_key="s", api_url=server.url, verbose=False,
+                  validate="lazy", token_store=TokenStore(str(tmp_path / "api_settings.json")))
+        try:
+            reader = threading.Thread(target=api.get_cash_balance, args=(1,))
+            reader.start()
+            assert arrived.wait(2)
+            # Okuma suruyorken ayni portfoyde emir gonderildi
+            api.cache.invalidate(1)
+            release.set()
+            reader.join()
+            stats = api.cache.stats()
+        finally:
+            api.close()
+    assert stats["stale_puts"] == 1
+    assert stats["size"] == 0
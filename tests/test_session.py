@@ -0,0 +1,67 @@
+"""SessionKeeper: token yokken ya da suresi dolmusken dongu bos yere donmemeli."""
+
+import base64
+import json
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from session import SessionKeeper
+
+
+def _jwt(exp: float) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).rstrip(b"=").decode()
+    return f"e30.{payload}.sig"
+
+
+class FakeAPI:
+    verbose = False
+
+    def __init__(self, token):
+        self._jwt_token = token
+        self.calls = 0
+
+    @contextmanager
+    def request_options(self, **_):
+        yield
+
+    def get_subaccounts(self):
+        self.calls += 1
+        return {"statusCode": 200}
+
+
+@pytest.mark.parametrize("token", [None, _jwt(time.time() - 60)], ids=["no-token", "expired"])
+def test_keeper_waits_full_interval_without_usable_token(token):
+    api = FakeAPI(token)
+    keeper = SessionKeeper(api, idle_timeout=0.2, margin=0.1)
+    # Bosta kalma suresi refresh_after'i coktan gecmis
+    keeper._last_activity -= 10
+    assert keeper._next_wait() == pytest.approx(keeper.refresh_after)
+
+    wakeups = 0
+    should_refresh = keeper._should_refresh
+
+    def counting():
+        nonlocal wakeups
+        wakeups += 1
+        return should_refresh()
+
+    keeper._should_refresh = counting  # type: ignore[method-assign]
+    keeper.start()
+    time.sleep(0.5)
+    keeper.stop()
+    # 0.1 sn aralikla ~5 uyanis; eski hata binlerce tur donuyordu
+    assert wakeups <= 10
+    assert api.calls == 0
+
+
+def test_keeper_refreshes_idle_session_with_valid_token():
+    api = FakeAPI(_jwt(time.time() + 3600))
+    keeper = SessionKeeper(api, idle_timeout=0.2, margin=0.1)
+    keeper._last_activity -= 10
+    assert keeper._next_wait() == 0.0
+    keeper.start()
+    time.sleep(0.35)
+    keeper.stop()
+    assert api.calls >= 1
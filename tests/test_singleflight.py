@@ -0,0 +1,77 @@
+"""SingleFlight: takipci kendi deadline'inden fazla beklememeli; oncelik anahtarin parcasi."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from errors import DeadlineExceeded
+from rate_limit import Priority
+from singleflight import SingleFlight, flight_key
+
+KEY = flight_key("Portfolio/CashBalance", {"portfolioNumber": 1}, Priority.READ)
+
+
+def _slow(release: threading.Event):
+    def fn():
+        release.wait(2)
+        return {"ok": True}
+    return fn
+
+
+def test_follower_waits_only_for_its_deadline():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader = threading.Thread(target=flight.do, args=(KEY, _slow(release)))
+    leader.start()
+    while not flight.stats()["in_flight"]:
+        time.sleep(0.001)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        flight.do(KEY, lambda: pytest.fail("takipci istek atmamali"), time.monotonic() + 0.1)
+    assert time.monotonic() - start < 0.3
+    release.set()
+    leader.join()
+    assert flight.stats()["expired"] == 1
+
+
+def test_deadline_caller_does_not_lead():
+    flight = SingleFlight()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return len(calls)
+
+    assert flight.do(KEY, fn, time.monotonic() + 1) == 1
+    assert flight.stats()["in_flight"] == 0
+    assert flight.stats()["solo"] == 1
+
+
+def test_priority_is_part_of_the_key():
+    background = flight_key("Portfolio/SubAccounts", {}, Priority.BACKGROUND)
+    read = flight_key("Portfolio/SubAccounts", {}, Priority.READ)
+    assert background != read
+    ab = flight_key("P", {"a": 1, "b": 2}, Priority.READ)
+    assert ab == flight_key("P", {"b": 2, "a": 1}, Priority.READ)
+
+
+def test_async_follower_waits_only_for_its_deadline():
+    flight = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(1)
+        return {"ok": True}
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do_async(KEY, slow))
+        await asyncio.sleep(0)
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            await flight.do_async(KEY, slow, time.monotonic() + 0.1)
+        elapsed = time.monotonic() - start
+        leader.cancel()
+        return elapsed
+
+    assert asyncio.run(run()) < 0.3
@@ -0,0 +1,76 @@
+"""TickRecorder: acik segment sayisi `max_open` ile sinirli, dosya isleri yazici thread'de."""
+
+import os
+import random
+import threading
+import time
+
+import pytest
+
+from tick_recorder import TickRecorder, load_columns, segments
+
+
+def _trade(symbol, price):
+    return {"Type": "T", "Symbol": symbol, "Price": price, "Quantity": 1, "Side": "BUY"}
+
+
+def test_open_segments_are_capped(tmp_path):
+    numpy = pytest.importorskip("numpy")
+    rnd = random.Random(1)
+    recorder = TickRecorder(str(tmp_path), segment_rows=100, max_open=4, rollover=None)
+    expected = {}
+    for i in range(3000):
+        symbol = f"S{rnd.randrange(20)}"
+        if recorder.record(_trade(symbol, i)):
+            expected.setdefault(symbol, []).append(float(i))
+        assert len(recorder._open) <= 4
+    assert recorder.stats()["evicted"] > 0
+    recorder.close()
+
+    # Kapatilan seriler sonraki tick'te yeni segmentle devam eder; kabul edilen tick kaybolmaz
+    for symbol, prices in expected.items():
+        paths = segments(str(tmp_path), symbol, "T")
+        got = numpy.concatenate([load_columns(p)["price"] for p in paths])
+        assert got.tolist() == prices
+    assert not os.path.exists(tmp_path / ".spare")
+
+
+def test_rollover_uses_spare_segments(tmp_path):
+    recorder = TickRecorder(str(tmp_path), segment_rows=10, spares=4, rollover=None)
+    recorder.record(_trade("GARAN", 1))
+    recorder._jobs.join()
+    for i in range(200):
+        recorder.record(_trade("GARAN", i))
+        if i % 10 == 0:
+            # Yazici havuzu doldurmaya yetissin
+            recorder._jobs.join()
+    stats = recorder.stats()
+    recorder.close()
+    # Yalnizca ilk segment havuz dolmadan acildi
+    assert stats["sync_opens"] <= 1
+    assert stats["segments"] == 21
+    assert len(segments(str(tmp_path), "GARAN", "T")) == 21
+
+
+def test_backlogged_writer_never_blocks_recording(tmp_path):
+    release = threading.Event()
+
+    class _Blocker:
+        def place(self, path):
+            release.wait(5)
+
+    recorder = TickRecorder(str(tmp_path), segment_rows=1, max_open=4, spares=0, rollover=None)
+    # Yazici thread'i tut; her tick segmenti doldurur ve kapanis isi birakir
+    recorder._jobs.put(("place", _Blocker(), None))
+    start = time.monotonic()
+    for i in range(50):
+        recorder.record(_trade("GARAN", i))
+    elapsed = time.monotonic() - start
+    stats = recorder.stats()
+    release.set()
+    recorder.close()
+    assert elapsed < 1
+    assert stats["dropped"] > 0
+    assert stats["closing"] <= 4
+    assert stats["ticks"] + stats["dropped"] == 50
+    assert len(segments(str(tmp_path), "GARAN", "T")) == stats["ticks"]
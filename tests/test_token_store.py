@@ -0,0 +1,53 @@
+"""TokenStore: kilit ve gecici dosyalar geride kalmamali, kilit yine de dislayici olmali."""
+
+import os
+import threading
+import time
+
+import pytest
+
+import token_store
+from token_store import TokenStore
+
+
+def test_no_leftover_files(tmp_path):
+    store = TokenStore.for_credential("https://example.test", "key", str(tmp_path))
+    # Cokmus bir yazmadan kalan gecici dosya
+    stale = tmp_path / f".{os.path.basename(store.path)}.abc123.tmp"
+    stale.write_text("{}")
+    store.save("tok")
+    assert store.load() == "tok"
+    names = os.listdir(tmp_path)
+    if token_store.fcntl is not None:
+        assert names == [os.path.basename(store.path)]
+    else:
+        expected = [os.path.basename(store.path), os.path.basename(store.lock_path)]
+        assert sorted(names) == sorted(expected)
+    store.clear()
+    assert not os.path.exists(store.path)
+
+
+@pytest.mark.skipif(token_store.fcntl is None, reason="flock yok")
+def test_lock_stays_exclusive_when_file_is_removed(tmp_path):
+    path = str(tmp_path / "api_settings.json")
+    inside = []
+    overlaps = []
+
+    def worker():
+        # Her thread ayri dosya tanimlayicisi acar; flock surecler arasi gibi davranir
+        store = TokenStore(path)
+        for _ in range(20):
+            with store.locked():
+                inside.append(1)
+                if len(inside) > 1:
+                    overlaps.append(1)
+                time.sleep(0.001)
+                inside.pop()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not overlaps
+    assert not os.path.exists(path + ".lock")
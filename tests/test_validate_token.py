@@ -0,0 +1,61 @@
+"""validate_token yalnizca 401/403'te token'i silmeli; 429 ve diger hatalarda korumali."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from api_client import API, AsyncAPI  # noqa: E402
+from mock_server import MockServer  # noqa: E402
+from rate_limit import RateLimiter  # noqa: E402
+from resilience import NO_RETRY  # noqa: E402
+from token_store import TokenStore  # noqa: E402
+
+TOKEN = "header.payload.sig"
+CASES = [(401, False), (403, False), (429, True), (400, True), (404, True), (500, True)]
+
+
+def _server(status: int) -> MockServer:
+    return MockServer(routes={
+        "/Portfolio/SubAccounts": lambda payload: (status, {"statusCode": status}),
+    })
+
+
+def _options(tmp_path):
+    store = TokenStore(str(tmp_path / "api_settings.json"))
+    store.save(TOKEN)
+    return store, dict(api_key="k", secret_key="s", verbose=False, token_store=store,
+                       retry=NO_RETRY, limiter=RateLimiter({"Portfolio": (1e6, 1000)}))
+
+
+@pytest.mark.parametrize("status,kept", CASES)
+def test_sync_validate_token(tmp_path, status, kept):
+    store, options = _options(tmp_path)
+    with _server(status) as server:
+        api = API(api_url=server.url, validate="lazy", **options)
+        try:
+            assert api.validate_token() is False
+        finally:
+            api.close()
+    assert (api._jwt_token == TOKEN) is kept
+    assert os.path.exists(store.path) is kept
+
+
+@pytest.mark.parametrize("status,kept", CASES)
+def test_async_validate_token(tmp_path, status, kept):
+    store, options = _options(tmp_path)
+
+    async def run():
+        async with AsyncAPI(api_url=server.url, **options) as api:
+            assert await api.validate_token() is False
+            return api._jwt_token
+
+    with _server(status) as server:
+        token = asyncio.run(run())
+    assert (token == TOKEN) is kept
+    assert os.path.exists(store.path) is kept
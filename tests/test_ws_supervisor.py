@@ -0,0 +1,53 @@
+"""WebSocket denetcisi: ag hatasinda yeniden baglanir, beklenmedik hatayi loglayip durur."""
+
+import asyncio
+import logging
+
+import pytest
+
+from api_client import WebSocket
+
+
+def _socket(receive_errors):
+    ws = WebSocket("https://example.test", "k", "s", "jwt", verbose=False,
+                   reconnect_delay=0.0, max_reconnect_delay=0.0)
+    errors = iter(receive_errors)
+
+    async def receive_loop():
+        raise next(errors)
+
+    async def send_loop():
+        await asyncio.sleep(10)
+
+    async def nothing():
+        pass
+
+    ws._receive_loop = receive_loop
+    ws._send_loop = send_loop
+    ws._open = nothing
+    ws._resubscribe = nothing
+    return ws
+
+
+def test_unexpected_loop_error_stops_supervisor(caplog):
+    ws = _socket([ConnectionResetError("koptu"), KeyError("bug")])
+    with caplog.at_level(logging.WARNING, logger="api_client"):
+        with pytest.raises(KeyError):
+            asyncio.run(ws._supervise())
+    assert ws.reconnects == 1
+    errors = [r for r in caplog.records if r.levelno == logging.ERROR]
+    assert len(errors) == 1 and errors[0].exc_info is not None
+
+
+def test_unexpected_reconnect_error_is_logged(caplog):
+    ws = _socket([ConnectionResetError("koptu")])
+
+    async def broken_open():
+        raise RuntimeError("bug")
+
+    ws._open = broken_open
+    with caplog.at_level(logging.WARNING, logger="api_client"):
+        with pytest.raises(RuntimeError):
+            asyncio.run(ws._supervise())
+    assert ws.reconnect_failures == 0
+    assert any(r.levelno == logging.ERROR and r.exc_info for r in caplog.records)
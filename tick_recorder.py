@@ -0,0 +1,498 @@
+"""
+tick_recorder.py
+
+WebSocket'ten gelen T/D/Y mesajlarini sembol basina sutunlu `.npy`
+segmentlerine kaydeder (`TickRecorder`):
+- Dizin yapisi: `<root>/<sembol>/<kanal>-<segment no>.npy`; float64, sekil
+  (sutun, satir), sutunlar `time` + market_data kayit alanlari
+- Segmentler `mmap` ile eslenir; dosya olusturma, tasima ve kapatma
+  `tick-recorder` yazici thread'inde yapilir
+- `load` / `load_columns` segmenti NumPy ile kopyasiz acar
+"""
+
+import itertools
+import logging
+import mmap
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple, Type
+
+from codec import Codec, default_codec
+from market_data import DEFAULT_FIELDS, FieldReader
+from ws_dispatch import WSMessage
+
+if TYPE_CHECKING:
+    import numpy
+    from api_client import WebSocket
+    from clock_sync import ClockSync
+
+logger = logging.getLogger("api_client")
+
+_MAGIC = b"\x93NUMPY\x01\x00"
+# Header sabit uzunlukta tutulur; kapanista ayni yere daha kisa sekil yazilir
+HEADER_SIZE = 128
+_DESCR = "<f8" if sys.byteorder == "little" else ">f8"
+
+
+def _header(columns: int, rows: int) -> bytes:
+    text = f"{{'descr': '{_DESCR}', 'fortran_order': False, 'shape': ({columns}, {rows}), }}"
+    pad = HEADER_SIZE - len(_MAGIC) - 2 - len(text) - 1
+    if pad < 0:
+        raise ValueError("npy header sigmiyor")
+    body = (text + " " * pad + "\n").encode("latin1")
+    return _MAGIC + len(body).to_bytes(2, "little") + body
+
+
+def _safe_name(symbol: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in symbol) or "_"
+
+
+def columns_for(
+    channel: str,
+    fields: Optional[Dict[str, Tuple[Type[Any], Any]]] = None
+) -> Tuple[str, ...]:
+    """Kanal segmentlerinin sutun adlari: ("time", <kayit alanlari>...)."""
+    record, _ = (fields or DEFAULT_FIELDS)[channel]
+    return ("time",) + tuple(record._fields[3:])
+
+
+class _Segment:
+    """
+    Tek segment: mmap'lenmis `.npy`, sutun basina `capacity` satir. Yazici
+    thread'de yedek olarak olusturulur; seriye verildikten sonra `place` ile
+    yerine tasinir.
+    """
+
+    __slots__ = (
+        "path", "columns", "capacity", "rows", "deadline", "_mm", "_views", "_time", "_fields"
+    )
+
+    def __init__(self, path: str, columns: int, capacity: int):
+        self.path = path
+        self.columns = columns
+        self.capacity = capacity
+        self.rows = 0
+        # Bu zamandan sonraki ilk tick segmenti kapatir (rollover)
+        self.deadline = float("inf")
+        size = HEADER_SIZE + columns * capacity * 8
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            # Seyrek dosya: diskte yalnizca yazilan sayfalar yer kaplar
+            os.ftruncate(fd, size)
+            self._mm = mmap.mmap(fd, size)
+        finally:
+            # mmap kendi tanimlayicisini tutar; segment basina tek fd kalir
+            os.close(fd)
+        self._mm[:HEADER_SIZE] = _header(columns, capacity)
+        view = memoryview(self._mm)[HEADER_SIZE:].cast("d")
+        # Sutun basina ayri gorunum: satir yazimi yalnizca indeksli atama
+        self._views = [view] + [view[i * capacity:(i + 1) * capacity] for i in range(columns)]
+        self._time = self._views[1]
+        self._fields = self._views[2:]
+        # Her sutunun ilk sayfasi burada (yazici thread'de) ayrilir; ilk tick'te sayfa hatasi olmaz
+        for column in self._views[1:]:
+            column[0] = 0.0
+
+    def place(self, path: str):
+        """Dosyayi seri adina tasir; acik mmap etkilenmez."""
+        os.rename(self.path, path)
+        self.path = path
+
+    def append(self, ts: float, values: List[float]) -> bool:
+        """Satir ekler; segment dolduysa True doner."""
+        row = self.rows
+        self._time[row] = ts
+        for column, value in zip(self._fields, values):
+            column[row] = value
+        self.rows = row = row + 1
+        return row >= self.capacity
+
+    def close(self) -> int:
+        """Sutunlari sikistirir, header'i gercek sekille yazar, dosyayi kisaltir."""
+        rows, capacity = self.rows, self.capacity
+        self._release()
+        mm = self._mm
+        if 0 < rows < capacity:
+            # Sutun i [i*capacity, ...) → [i*rows, ...); hedef her zaman kaynagin
+            # solunda, sonraki sutunlarin kaynagina degmez
+            for i in range(1, self.columns):
+                mm.move(HEADER_SIZE + i * rows * 8, HEADER_SIZE + i * capacity * 8, rows * 8)
+        mm[:HEADER_SIZE] = _header(self.columns, rows)
+        # msync yapilmaz; kirli sayfalari cekirdek yazar (surec coksa da kaybolmaz)
+        mm.close()
+        if rows:
+            os.truncate(self.path, HEADER_SIZE + self.columns * rows * 8)
+        else:
+            os.remove(self.path)
+        return rows
+
+    def _release(self):
+        # mmap, uzerindeki gorunumler birakilmadan kapatilamaz
+        for view in reversed(self._views):
+            view.release()
+
+    def discard(self):
+        """Kullanilmamis yedegi siler."""
+        self._release()
+        self._mm.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class _Series:
+    """Tek (sembol, kanal) icin segment sirasi."""
+
+    __slots__ = ("directory", "channel", "reader", "columns", "segment", "index", "closed")
+
+    def __init__(self, directory: str, channel: str, reader: FieldReader, index: int):
+        self.directory = directory
+        self.channel = channel
+        self.reader = reader
+        self.columns = len(reader.names) + 1
+        self.segment: Optional[_Segment] = None
+        self.index = index
+        # Kapanmis segmentler; yalnizca yazici thread degistirir
+        self.closed: List[str] = []
+
+    def path(self, index: int) -> str:
+        return os.path.join(self.directory, f"{self.channel}-{index:06d}.npy")
+
+
+_Key = Tuple[str, str]
+
+
+class TickRecorder:
+    """
+    Kayit yolu (WS loop) tick basina yalnizca dizi atamasi yapar:
+
+    - Yazici `<root>/.spare/` altinda kolon sayisi basina en az `spares` bos
+      segment hazir tutar; yeni segment bir yedegi devralir. Havuz bossa
+      segment yerinde olusturulur (`sync_opens`) ve havuz `max_open // 4`'e
+      kadar buyutulur.
+    - Segment dolunca ya da `rollover` sn eskiyince yaziciya verilir:
+      sutunlar gercek satir sayisina gore sikistirilir, header yeniden
+      yazilir, dosya kisaltilir. Kapatilmamis segmentin header'i tam
+      kapasiteyi gosterir; yazilmamis satirlarin `time` degeri 0'dir.
+    - En fazla `max_open` segment acik kalir; sinir asilinca en uzun suredir
+      tick almayan serinin segmenti kapatilir (`evicted`).
+    - Kayit yolu yaziciyi beklemez: kapanmayi bekleyen segment sayisi
+      `max_open`'a ulasirsa yeni segment acilmaz; acik segmenti olan seri ona
+      yazmaya devam eder (rollover ertelenir), olmayanin tick'i atilir (`dropped`).
+
+    Parametreler:
+      root         : Kayit dizini
+      segment_rows : Segment basina en fazla satir
+      rollover     : Segment en fazla bu kadar sn acik kalir (None: yalnizca dolunca)
+      keep         : Sembol/kanal basina tutulan en fazla kapali segment (None: hepsi)
+      max_open     : Ayni anda acik (mmap'li) en fazla segment; asilinca en uzun
+                     suredir tick almayan serinin segmenti kapatilir
+      spares       : Kolon sayisi basina hazir tutulan en az yedek segment
+                     (0: yedek yok, her segment kayit yolunda olusturulur)
+      channels     : Kaydedilecek kanallar (varsayilan: T, D, Y)
+      codec        : Decode edilmemis mesajlar icin JSON codec
+      clock        : Verilirse zaman damgasi sunucu saatine gore duzeltilir
+      fields       : market_data.DEFAULT_FIELDS bicimi; alan anahtarlarini ezer
+    """
+
+    def __init__(
+        self,
+        root: str,
+        *,
+        segment_rows: int = 1 << 14,
+        rollover: Optional[float] = 900.0,
+        keep: Optional[int] = None,
+        max_open: int = 256,
+        spares: int = 2,
+        channels: Tuple[str, ...] = ("T", "D", "Y"),
+        codec: Optional[Codec] = None,
+        clock: Optional["ClockSync"] = None,
+        fields: Optional[Dict[str, Tuple[Type[Any], Dict[str, Tuple[str, ...]]]]] = None
+    ):
+        if segment_rows < 1 or max_open < 1 or spares < 0:
+            raise ValueError("segment_rows >= 1, max_open >= 1 ve spares >= 0 olmali")
+        self.root = root
+        self.segment_rows = segment_rows
+        self.rollover = rollover
+        self.keep = keep
+        self.max_open = max_open
+        self.codec = codec or default_codec
+        self.clock = clock
+        spec = dict(DEFAULT_FIELDS)
+        spec.update(fields or {})
+        self._spec = {ch: spec[ch] for ch in channels}
+        self._series: Dict[_Key, _Series] = {}
+        # Acik segmenti olan seriler; sondaki en son tick alan (LRU)
+        self._open: "OrderedDict[_Key, _Series]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Yedek segmentler yazici thread'de olusturulur; kayit yolu yalnizca devralir
+        self._spare_dir = os.path.join(root, ".spare")
+        os.makedirs(self._spare_dir, exist_ok=True)
+        for name in os.listdir(self._spare_dir):
+            # Onceki surecten kalan kullanilmamis yedekler
+            os.remove(os.path.join(self._spare_dir, name))
+        self._spares: Dict[int, Deque[_Segment]] = {}
+        self._spare_target: Dict[int, int] = {}
+        self._spare_limit = max(spares, max_open // 4) if spares else 0
+        self._spare_ids = itertools.count()
+        # Kapanmayi bekleyen segmentler = retired - finished; her sayaci tek thread artirir
+        self._retired = 0
+        self._finished = 0
+        self._jobs: "queue.Queue[Optional[Tuple[Any, ...]]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="tick-recorder", daemon=True)
+        self._writer.start()
+        for columns in {len(record._fields) - 2 for record, _ in self._spec.values()}:
+            self._spares[columns] = deque()
+            self._spare_target[columns] = spares
+            for _ in range(spares):
+                self._jobs.put(("spare", columns))
+
+        # Istatistikler
+        self.ticks = 0
+        self.ignored = 0
+        self.invalid = 0
+        self.segments = 0
+        self.sync_opens = 0
+        self.dropped = 0
+        self.evicted = 0
+        self.rows_written = 0
+        self.write_errors = 0
+
+    # ——— Besleme ———
+    def attach(self, ws: "WebSocket"):
+        """WebSocket dispatcher'ina async handler ekler; kayit WS loop'unda yapilir."""
+        async def handler(message: WSMessage):
+            self.on_message(message)
+        ws.add_handler(handler)
+        if self.clock is None:
+            self.clock = ws.clock
+
+    def on_message(self, message: WSMessage):
+        data = message.data
+        if data is None:
+            try:
+                data = self.codec.loads(message.raw)
+            except ValueError:
+                self.invalid += 1
+                return
+        self.record(data)
+
+    def record(self, data: Any) -> bool:
+        """
+        Decode edilmis mesaji (ya da listeyi) kaydeder; T/D/Y disindakiler
+        atlanir. Tek yazici (WS loop) varsayilir.
+        """
+        if not isinstance(data, dict):
+            if isinstance(data, list):
+                written = False
+                for item in data:
+                    written = self.record(item) or written
+                return written
+            self.ignored += 1
+            return False
+        key = (data.get("Symbol") or data.get("symbol"), data.get("Type") or data.get("type"))
+        series = self._series.get(key)
+        if series is None or self._closed:
+            if key[1] not in self._spec or not key[0] or self._closed:
+                self.ignored += 1
+                return False
+            series = self._open_series(key)
+        ts = self.clock.now() if self.clock is not None else time.time()
+        segment = series.segment
+        if segment is not None and ts < segment.deadline:
+            self._open.move_to_end(key)
+        elif self._retired - self._finished < self.max_open:
+            segment = self._roll(key, series, ts)
+        elif segment is not None:
+            # Yazici geride: rollover ertelenir, acik segmente yazmaya devam
+            self._open.move_to_end(key)
+        else:
+            # Yazici geride ve seri segmentsiz: yeni fd acilmaz, tick atilir
+            self.dropped += 1
+            return False
+        if segment.append(ts, series.reader.read(data)):
+            # Doldu; sonraki tick yeni segment alir
+            self._retire(key, series)
+        self.ticks += 1
+        return True
+
+    # ——— Segmentler (kayit yolu) ———
+    def _open_series(self, key: _Key) -> _Series:
+        symbol, channel = key
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Seri basina bir kez: dizin ve mevcut segment numaralari
+                directory = os.path.join(self.root, _safe_name(symbol))
+                os.makedirs(directory, exist_ok=True)
+                # Yeniden baslatmada mevcut segmentlerin uzerine yazilmaz
+                prefix = f"{channel}-"
+                numbers = [
+                    name[len(prefix):-4] for name in os.listdir(directory)
+                    if name.startswith(prefix) and name.endswith(".npy")
+                ]
+                existing = sorted(int(n) for n in numbers if n.isdigit())
+                record, keys = self._spec[channel]
+                series = _Series(directory, channel, FieldReader(record, keys),
+                                 existing[-1] + 1 if existing else 0)
+                series.closed = [series.path(i) for i in existing]
+                self._series[key] = series
+        return series
+
+    def _roll(self, key: _Key, series: _Series, ts: float) -> _Segment:
+        """Serinin segmentini kapatmaya gonderir ve yedek bir segmenti devralir."""
+        if series.segment is not None:
+            self._retire(key, series)
+        while len(self._open) >= self.max_open:
+            old_key, old = self._open.popitem(last=False)
+            self._retire(old_key, old)
+            self.evicted += 1
+        pool = self._spares[series.columns]
+        try:
+            segment = pool.popleft()
+            self._jobs.put(("spare", series.columns))
+        except IndexError:
+            # Havuz bos (yazici yetisemedi): kayit yolunda olustur ve havuzu buyut
+            segment = self._new_spare(series.columns)
+            self.sync_opens += 1
+            if self._spare_target[series.columns] < self._spare_limit:
+                self._spare_target[series.columns] += 1
+                self._jobs.put(("spare", series.columns))
+        deadline = ts + self.rollover if self.rollover is not None else float("inf")
+        segment.deadline = deadline
+        self._jobs.put(("place", segment, series.path(series.index)))
+        series.segment = segment
+        series.index += 1
+        self._open[key] = series
+        self.segments += 1
+        return segment
+
+    def _retire(self, key: _Key, series: _Series):
+        segment, series.segment = series.segment, None
+        self._open.pop(key, None)
+        if segment is not None:
+            self._retired += 1
+            self._jobs.put(("finish", series, segment))
+
+    # ——— Yazici thread ———
+    def _new_spare(self, columns: int) -> _Segment:
+        path = os.path.join(self._spare_dir, f"{columns}-{next(self._spare_ids)}.npy")
+        return _Segment(path, columns, self.segment_rows)
+
+    def _write_loop(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is None:
+                    return
+                kind = job[0]
+                if kind == "spare":
+                    self._spares[job[1]].append(self._new_spare(job[1]))
+                elif kind == "place":
+                    job[1].place(job[2])
+                else:
+                    try:
+                        self._finish(job[1], job[2])
+                    finally:
+                        self._finished += 1
+            except Exception:
+                self.write_errors += 1
+                logger.exception("Tick kaydi yazici hatasi: %s", job[0] if job else job)
+            finally:
+                self._jobs.task_done()
+
+    def _finish(self, series: _Series, segment: _Segment):
+        rows = segment.close()
+        self.rows_written += rows
+        if rows:
+            series.closed.append(segment.path)
+        if self.keep is not None:
+            while len(series.closed) > self.keep:
+                old = series.closed.pop(0)
+                try:
+                    os.remove(old)
+                except OSError as e:
+                    logger.warning("Eski segment silinemedi: %s (%s)", old, e)
+
+    # ——— Kapatma ———
+    def flush(self):
+        """
+        Acik segmentleri kapatir ve yazici bitirene kadar bekler; sonraki
+        tick'ler yeni segmentlere yazilir. Kayit yolunun thread'inden (WS loop)
+        ya da WS kapandiktan sonra cagrilmali.
+        """
+        for key, series in list(self._open.items()):
+            self._retire(key, series)
+        self._jobs.join()
+
+    def close(self):
+        """Tum segmentleri kapatir, yazici thread'i durdurur, yedekleri siler."""
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+        self._jobs.put(None)
+        self._writer.join()
+        for pool in self._spares.values():
+            while pool:
+                pool.popleft().discard()
+        try:
+            os.rmdir(self._spare_dir)
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "series":       len(self._series),
+            "open":         len(self._open),
+            "spares":       sum(len(p) for p in self._spares.values()),
+            "pending":      self._jobs.qsize(),
+            "closing":      self._retired - self._finished,
+            "segments":     self.segments,
+            "sync_opens":   self.sync_opens,
+            "dropped":      self.dropped,
+            "evicted":      self.evicted,
+            "ticks":        self.ticks,
+            "rows_written": self.rows_written,
+            "write_errors": self.write_errors,
+            "ignored":      self.ignored,
+            "invalid":      self.invalid,
+        }
+
+
+# ——————————————————————————————————————————————————————————————————————————————
+# Okuma (NumPy)
+# ——————————————————————————————————————————————————————————————————————————————
+
+def load(path: str) -> "numpy.ndarray":
+    """Segmenti kopyasiz acar: (sutun, satir) sekilli salt-okunur memmap."""
+    import numpy
+    return numpy.load(path, mmap_mode="r")
+
+
+def load_columns(path: str, channel: Optional[str] = None) -> Dict[str, "numpy.ndarray"]:
+    """
+    Segmenti sutun adi → 1-boyutlu gorunum olarak acar; kanal dosya adindan
+    ("T-000001.npy") alinir.
+    """
+    if channel is None:
+        channel = os.path.basename(path).split("-", 1)[0]
+    data = load(path)
+    return dict(zip(columns_for(channel), data))
+
+
+def segments(root: str, symbol: str, channel: str = "T") -> List[str]:
+    """Sembolun kanal segmentleri, eskiden yeniye."""
+    directory = os.path.join(root, _safe_name(symbol))
+    if not os.path.isdir(directory):
+        return []
+    prefix = f"{channel}-"
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if name.startswith(prefix) and name.endswith(".npy")]
@@ -0,0 +1,293 @@
+"""
+token_store.py
+
+JWT token'inin diskte, surecler arasi guvenli saklanmasi.
+
+Her `API` / `AsyncAPI` nesnesi kendi `TokenStore`'una sahiptir. Tek hesapla
+calisirken varsayilan dosya calisma dizinindeki `api_settings.json`'dur;
+`ClientRegistry` ise her kimlik bilgisi icin ayri bir dosya kullanir
+(`TokenStore.for_credential`), boylece farkli hesaplarin token'lari
+birbirinin uzerine yazilmaz.
+
+Ayni dosyayi kullanan cok sayida surec icin:
+
+- Yazmalar gecici dosyaya yapilip `os.replace` ile atomik olarak yerine
+  konur; okuyan surec hicbir zaman yarim yazilmis dosya gormez, bu yuzden
+  okumalar kilit almaz.
+- Yazma, silme ve yenileme `<dosya>.lock` uzerinde ozel kilit altinda
+  yapilir (POSIX'te fcntl.flock, Windows'ta msvcrt.locking). POSIX'te kilit
+  dosyasi birakilirken silinir; kilidi eski dosyada alan surec dosyanin
+  degistigini gorup yeniden dener. Windows'ta acik dosya silinemedigi icin
+  kilit dosyasi kalir (.gitignore: `api_settings*.json.lock`).
+- Cokmus bir yazmadan kalan gecici dosyalar (`.<dosya>.*.tmp`) sonraki
+  yazmada kilit altinda silinir.
+- `load()` son okunan icerigi dosyanin inode/mtime/boyutuyla birlikte bellekte
+  tutar; dosya degismediyse diske tekrar gidilmez.
+- `refresh(stale, fetch)`: kilidi alan tek surec login olur; kilidi
+  bekleyenler, dosyada yeni token buldugunda login yapmadan onu kullanir.
+- `clear(expected=token)`: dosyayi yalnizca hala ayni gecersiz token'i
+  iceriyorsa siler; baska surecin yeni kaydettigi token korunur.
+
+Dosya bicimi: {"jwtToken": "<token>"}
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Tuple
+
+try:
+    import fcntl  # type: ignore
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt  # type: ignore
+
+logger = logging.getLogger("api_client")
+
+DEFAULT_TOKEN_FILE = "api_settings.json"
+
+
+def credential_id(api_url: str, api_key: str) -> str:
+    """(host, api_key) ciftinden dosya adinda kullanilabilecek kisa bir ozet uretir."""
+    raw = f"{api_url.rstrip('/')}|{api_key}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def _lock_fd(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    # msvcrt.locking bloklayan modda ~10 sn sonra vazgecer; kilit alinana kadar dene
+    while True:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            time.sleep(0.05)
+
+
+def _unlock_fd(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class TokenStore:
+    """
+    Tek bir JSON dosyasinda tutulan, surecler arasi paylasilabilen JWT token.
+
+    Parametreler:
+      path : Token dosyasinin yolu (kilit dosyasi: path + ".lock")
+    """
+
+    def __init__(self, path: str = DEFAULT_TOKEN_FILE):
+        self.path = path
+        self.lock_path = path + ".lock"
+
+        # Ayni surecteki thread'ler icin; dosya kilidi yeniden girilebilir
+        # olsun diye derinlik tutulur
+        self._rlock = threading.RLock()
+        self._depth = 0
+        self._lock_fd: Optional[int] = None
+
+        # load() onbellegi: ((inode, mtime_ns, boyut), token)
+        self._cached: Optional[Tuple[Tuple[int, int, int], str]] = None
+
+        # Istatistikler
+        self.reads = 0
+        self.cache_hits = 0
+        self.refreshes = 0
+        self.reused = 0
+
+    @classmethod
+    def for_credential(
+        cls,
+        api_url: str,
+        api_key: str,
+        directory: Optional[str] = None
+    ) -> "TokenStore":
+        """
+        Kimlik bilgisine ozel dosya: `<directory>/api_settings.<ozet>.json`.
+        API anahtari dosya adina acik yazilmaz.
+        """
+        name = f"api_settings.{credential_id(api_url, api_key)}.json"
+        return cls(os.path.join(directory or ".", name))
+
+    # ——— Kilit ———
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """
+        Dosya uzerinde surecler arasi ozel kilit. Ayni thread icinde ic ice
+        kullanilabilir (or. refresh icinde cagrilan login → save).
+        """
+        with self._rlock:
+            if self._depth == 0:
+                self._lock_fd = self._acquire()
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0 and self._lock_fd is not None:
+                    fd, self._lock_fd = self._lock_fd, None
+                    try:
+                        if fcntl is not None:
+                            # Kilit altindayken silinir; bekleyenler _acquire'da yeniden dener
+                            try:
+                                os.remove(self.lock_path)
+                            except FileNotFoundError:
+                                pass
+                        _unlock_fd(fd)
+                    finally:
+                        os.close(fd)
+
+    def _acquire(self) -> int:
+        while True:
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                _lock_fd(fd)
+                if fcntl is None or self._is_lock_file(fd):
+                    return fd
+            except BaseException:
+                os.close(fd)
+                raise
+            # Onceki sahip dosyayi silip kilidi birakti; yeni dosyada tekrar dene
+            os.close(fd)
+
+    def _is_lock_file(self, fd: int) -> bool:
+        try:
+            current = os.stat(self.lock_path)
+        except FileNotFoundError:
+            return False
+        st = os.fstat(fd)
+        return (st.st_dev, st.st_ino) == (current.st_dev, current.st_ino)
+
+    # ——— Okuma / yazma ———
+    def _stamp(self) -> Optional[Tuple[int, int, int]]:
+        # os.replace yeni inode getirir; ayni boyutlu token'lar mtime cozunurlugu
+        # icinde yazilsa bile degisiklik fark edilir
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def load(self) -> str:
+        """
+        Kayitli token'i doner; dosya yoksa ya da okunamiyorsa "".
+        Dosya son okumadan beri degismediyse bellekteki deger kullanilir.
+        """
+        stamp = self._stamp()
+        if stamp is None:
+            self._cached = None
+            return ""
+        cached = self._cached
+        if cached is not None and cached[0] == stamp:
+            self.cache_hits += 1
+            return cached[1]
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            token = data.get("jwtToken", "") if isinstance(data, dict) else ""
+        except FileNotFoundError:
+            return ""
+        except Exception as e:
+            # Atomik yazmayla olusmamali; bir sonraki save() dosyayi duzeltir
+            logger.warning("Hata olustu: %s. Token dosyasi okunamadi.", e)
+            return ""
+        self.reads += 1
+        self._cached = (stamp, token)
+        return token
+
+    def _temp_prefix(self) -> str:
+        return f".{os.path.basename(self.path)}."
+
+    def _remove_stale_temps(self, directory: str):
+        # Kilit altinda cagrilir: bu dosyaya ait baska yazma suruyor olamaz
+        prefix = self._temp_prefix()
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return
+        for name in names:
+            if name.startswith(prefix) and name.endswith(".tmp"):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    def _write(self, token: str):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        self._remove_stale_temps(directory)
+        fd, tmp = tempfile.mkstemp(prefix=self._temp_prefix(), suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"jwtToken": token}, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+        self._cached = None
+
+    def save(self, token: str):
+        """Token'i kilit altinda atomik olarak yazar."""
+        with self.locked():
+            self._write(token)
+
+    def clear(self, expected: Optional[str] = None) -> str:
+        """
+        Token dosyasini siler ve "" doner. `expected` verilirse dosya yalnizca
+        hala bu token'i iceriyorsa silinir; baska bir surec bu arada yeni
+        token kaydettiyse dosyaya dokunulmaz ve o token doner.
+        """
+        with self.locked():
+            if expected is not None:
+                current = self.load()
+                if current and current != expected:
+                    return current
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self._cached = None
+            return ""
+
+    def refresh(self, stale: str, fetch: Callable[[], str]) -> str:
+        """
+        Gecersiz `stale` token'i yeniler. Kilit alindiktan sonra dosyada
+        farkli (baska surecin yazdigi) bir token varsa `fetch` cagrilmadan o
+        doner; yoksa `fetch()` ile yeni token alinir, kaydedilir ve doner.
+        """
+        with self.locked():
+            current = self.load()
+            if current and current != stale:
+                self.reused += 1
+                return current
+            token = fetch()
+            if token:
+                self._write(token)
+            self.refreshes += 1
+            return token
+
+    def stats(self) -> dict:
+        return {
+            "reads":      self.reads,
+            "cache_hits": self.cache_hits,
+            "refreshes":  self.refreshes,
+            "reused":     self.reused,
+        }
+
+    def __repr__(self) -> str:
+        return f"TokenStore({self.path!r})"
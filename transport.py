@@ -0,0 +1,239 @@
+"""
+transport.py
+
+REST istemcisinin HTTP katmani: `API` nesnesine ait, kalici (keep-alive)
+baglanti havuzu kullanan tasiyici.
+
+Her istekte yeni bir TCP + TLS el sikismasi yapmak yerine baglantilar
+havuzda tutulur ve tekrar kullanilir. Varsayilan olarak `requests.Session`
+kullanilir; `http2=True` verilirse `httpx` (ve `h2`) ile HTTP/2 acilir.
+
+`requests`/`httpx` import'u ve havuzun kurulmasi ilk istege kadar ertelenir;
+kisa omurlu script'ler istemciyi olustururken bu maliyeti odemez.
+
+Kutuphane istisnalari `errors.RequestTimeout` / `errors.TransportError`
+olarak yeniden firlatilir; ust katman requests/httpx'e bagimli degildir.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from errors import RequestTimeout, TransportError
+
+if TYPE_CHECKING:
+    import requests
+
+
+class HTTPTransport:
+    """
+    Baglanti havuzlu, senkron HTTP tasiyicisi.
+
+    Parametreler:
+      pool_connections : Havuzda tutulacak farkli host sayisi
+      pool_maxsize     : Host basina acik tutulacak en fazla baglanti
+      keep_alive       : False ise her istekten sonra baglanti kapatilir
+      connect_timeout  : Baglanti kurma zaman asimi (sn)
+      read_timeout     : Yanit okuma zaman asimi (sn)
+      http2            : True ise httpx uzerinden HTTP/2 kullanilir
+      verify           : TLS sertifika dogrulamasi
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        keep_alive: bool = True,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 60.0,
+        http2: bool = False,
+        verify: bool = True
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize     = pool_maxsize
+        self.keep_alive       = keep_alive
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.http2            = http2
+        self.verify           = verify
+
+        self._extra_headers: Dict[str, str] = {}
+        if not keep_alive:
+            self._extra_headers["Connection"] = "close"
+
+        # Havuz ilk istekte _open() ile kurulur
+        self._client: Any = None
+        self._session: Optional["requests.Session"] = None
+        self._open_lock = threading.Lock()
+
+    def _open(self):
+        with self._open_lock:
+            if self._client is None and self._session is None:
+                if self.http2:
+                    self._client = self._make_httpx_client()
+                else:
+                    self._session = self._make_session()
+
+    def _make_session(self) -> "requests.Session":
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        if not self.verify:
+            import urllib3
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=0
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _make_httpx_client(self) -> Any:
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                "http2=True icin 'httpx[http2]' paketi gerekli: pip install 'httpx[http2]'"
+            ) from e
+        connect, read = self.timeout
+        limits = httpx.Limits(
+            max_connections=self.pool_maxsize,
+            max_keepalive_connections=self.pool_maxsize if self.keep_alive else 0
+        )
+        return httpx.Client(
+            http2=True,
+            limits=limits,
+            timeout=httpx.Timeout(read, connect=connect),
+            verify=self.verify
+        )
+
+    def post(
+        self,
+        url: str,
+        data: bytes,
+        headers: Dict[str, str],
+        timeout: Optional[Tuple[float, float]] = None
+    ) -> Any:
+        """
+        POST istegini havuzdaki bir baglanti uzerinden gonderir.
+        Donen nesne `status_code`, `headers`, `content` ve `json()` saglar.
+        """
+        if self._extra_headers:
+            headers = {**headers, **self._extra_headers}
+        if self._client is None and self._session is None:
+            self._open()
+        if self._client is not None:
+            import httpx
+            try:
+                if timeout is None:
+                    return self._client.post(url, content=data, headers=headers)
+                connect, read = timeout
+                return self._client.post(url, content=data, headers=headers,
+                                         timeout=httpx.Timeout(read, connect=connect))
+            except httpx.TimeoutException as e:
+                raise RequestTimeout(f"{url}: {e}") from e
+            except httpx.TransportError as e:
+                raise TransportError(f"{url}: {e}") from e
+        assert self._session is not None
+        import requests
+        try:
+            # verify istek bazinda verilir; aksi halde REQUESTS_CA_BUNDLE gibi
+            # ortam degiskenleri session.verify degerini ezer.
+            return self._session.post(url, data=data, headers=headers,
+                                      timeout=timeout or self.timeout,
+                                      verify=self.verify)
+        except requests.Timeout as e:
+            raise RequestTimeout(f"{url}: {e}") from e
+        except requests.RequestException as e:
+            raise TransportError(f"{url}: {e}") from e
+
+    def close(self):
+        """Havuzdaki tum baglantilari kapatir."""
+        if self._client is not None:
+            self._client.close()
+        if self._session is not None:
+            self._session.close()
+
+    def __enter__(self) -> "HTTPTransport":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncHTTPTransport:
+    """
+    Baglanti havuzlu, asyncio tabanli HTTP tasiyicisi (`httpx.AsyncClient`).
+
+    `HTTPTransport` ile ayni ayarlari alir. Tek bir havuz, ayni event loop
+    uzerindeki tum es zamanli isteklere hizmet eder.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_maxsize: int = 100,
+        keep_alive: bool = True,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 60.0,
+        http2: bool = False,
+        verify: bool = True
+    ):
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                "AsyncHTTPTransport icin 'httpx' paketi gerekli: pip install httpx"
+            ) from e
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive   = keep_alive
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.http2        = http2
+        self.verify       = verify
+
+        limits = httpx.Limits(
+            max_connections=pool_maxsize,
+            max_keepalive_connections=pool_maxsize if keep_alive else 0
+        )
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            limits=limits,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            verify=verify
+        )
+
+    async def post(
+        self,
+        url: str,
+        data: bytes,
+        headers: Dict[str, str],
+        timeout: Optional[Tuple[float, float]] = None
+    ) -> Any:
+        """
+        POST istegini havuzdaki bir baglanti uzerinden gonderir.
+        Donen nesne `status_code`, `headers`, `content` ve `json()` saglar.
+        """
+        import httpx
+        try:
+            if timeout is None:
+                return await self._client.post(url, content=data, headers=headers)
+            connect, read = timeout
+            return await self._client.post(url, content=data, headers=headers,
+                                           timeout=httpx.Timeout(read, connect=connect))
+        except httpx.TimeoutException as e:
+            raise RequestTimeout(f"{url}: {e}") from e
+        except httpx.TransportError as e:
+            raise TransportError(f"{url}: {e}") from e
+
+    async def aclose(self):
+        """Havuzdaki tum baglantilari kapatir."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncHTTPTransport":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
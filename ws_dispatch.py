@@ -0,0 +1,275 @@
+"""
+ws_dispatch.py
+
+WebSocket okuma dongusu ile mesaj tuketicileri arasindaki dagitim katmani
+(`Dispatcher`):
+- Okuma dongusu mesaji sinirli bir kuyruga birakir, handler'lari beklemez
+- Kuyruk doluyken `Overflow` politikasi uygulanir
+- Senkron handler'lar sembol basina sirayi koruyan thread seritlerinde,
+  async handler'lar event loop'ta calisir
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import (
+    TYPE_CHECKING, Any, Callable, Deque, Dict, Hashable, List, NamedTuple, Optional
+)
+
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("api_client")
+
+
+class Overflow(str, Enum):
+    """
+    Kuyruk doluyken uygulanacak politika.
+
+    BLOCK       : yer acilana kadar okuma bekler (geri basinc, kayip yok)
+    DROP_OLDEST : en eski mesaj atilir
+    CONFLATE    : ayni anahtarli (varsayilan: Type + Symbol) bekleyen mesaj
+                  yenisiyle degistirilir; dolu kuyrukta yeni anahtar gelirse
+                  en eski atilir
+    """
+    BLOCK       = "block"
+    DROP_OLDEST = "drop_oldest"
+    CONFLATE    = "conflate"
+
+
+class WSMessage(NamedTuple):
+    """Okuma dongusunden gelen tek mesaj: ham metin ve (decode edildiyse) icerik."""
+    raw: str
+    data: Any = None
+
+
+def symbol_key(message: WSMessage) -> Optional[Hashable]:
+    """Varsayilan anahtar: (Type, Symbol). Sembolsuz mesajlar (ack, heartbeat) icin None."""
+    data = message.data
+    if not isinstance(data, dict):
+        return None
+    symbol = data.get("Symbol", data.get("symbol"))
+    if symbol is None:
+        return None
+    return data.get("Type", data.get("type")), symbol
+
+
+class _Entry:
+    __slots__ = ("key", "message")
+
+    def __init__(self, key: Optional[Hashable], message: WSMessage):
+        self.key = key
+        self.message = message
+
+
+class Dispatcher:
+    """
+    Sinirli kuyruklu mesaj dagiticisi; WebSocket'in event loop'unda calisir.
+
+    Parametreler:
+      maxsize : Kuyrukta bekleyebilecek en fazla mesaj
+      policy  : Overflow.BLOCK | DROP_OLDEST | CONFLATE
+      workers : Senkron handler'lar icin serit (thread) sayisi
+      key     : Mesajdan sembol anahtari cikaran fonksiyon (serit secimi ve conflation)
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 10_000,
+        policy: Overflow = Overflow.BLOCK,
+        workers: int = 4,
+        key: Callable[[WSMessage], Optional[Hashable]] = symbol_key
+    ):
+        if maxsize < 1 or workers < 1:
+            raise ValueError("maxsize >= 1 ve workers >= 1 olmali")
+        self.maxsize = maxsize
+        self.policy = Overflow(policy)
+        self.workers = workers
+        self.key = key
+
+        self._handlers: List[Callable[[WSMessage], Any]] = []
+        self._queue: Deque[_Entry] = deque()
+        self._pending: Dict[Hashable, _Entry] = {}
+        self._lanes: List["ThreadPoolExecutor"] = []
+        self._loop: Optional["asyncio.AbstractEventLoop"] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._not_empty: Optional["asyncio.Event"] = None
+        self._not_full: Optional["asyncio.Event"] = None
+        self._inflight: Optional["asyncio.Semaphore"] = None
+        self._closing = False
+        self._errors_lock = threading.Lock()
+
+        # Istatistikler
+        self.received = 0
+        self.dispatched = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.blocked = 0
+        self.blocked_time = 0.0
+        self.max_depth = 0
+        self.handler_errors = 0
+
+    # ——— Kayit ———
+    def subscribe(self, handler: Callable[[WSMessage], Any]):
+        """Handler ekler; `async def` ise loop'ta beklenir, degilse thread havuzunda calisir."""
+        self._handlers.append(handler)
+
+    def unsubscribe(self, handler: Callable[[WSMessage], Any]):
+        self._handlers.remove(handler)
+
+    @property
+    def handler_count(self) -> int:
+        return len(self._handlers)
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    # ——— Yasam dongusu ———
+    def start(self) -> "asyncio.Task[None]":
+        """Dagitim task'ini calisan event loop'ta baslatir; zaten calisiyorsa aynisini doner."""
+        import asyncio
+        if self._task is not None and not self._task.done():
+            return self._task
+        if not self._lanes:
+            from concurrent.futures import ThreadPoolExecutor
+            self._lanes = [ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"ws-dispatch-{i}")
+                           for i in range(self.workers)]
+        self._loop = asyncio.get_running_loop()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        # Her serit icin en fazla iki mesaj havuzda bekler; fazlasi kuyrukta kalir
+        self._inflight = asyncio.Semaphore(self.workers * 2)
+        self._closing = False
+        if self._queue:
+            self._not_empty.set()
+        self._task = asyncio.ensure_future(self._run())
+        return self._task
+
+    async def stop(self, drain: bool = True):
+        """
+        Dagitimi durdurur. `drain=True` ise kuyruktaki mesajlar once teslim
+        edilir; aksi halde atilir. Thread seritleri kapatilir.
+        """
+        self._closing = True
+        if not drain:
+            self.dropped += len(self._queue)
+            self._queue.clear()
+            self._pending.clear()
+        if self._not_empty is not None:
+            self._not_empty.set()
+        if self._not_full is not None:
+            self._not_full.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        for lane in self._lanes:
+            lane.shutdown(wait=False)
+        self._lanes = []
+
+    # ——— Uretici (okuma dongusu) ———
+    async def put(self, message: WSMessage):
+        """Mesaji kuyruga koyar; BLOCK politikasinda kuyruk doluysa bekler."""
+        self.received += 1
+        key = self.key(message)
+        if self.policy is Overflow.CONFLATE and key is not None:
+            entry = self._pending.get(key)
+            if entry is not None:
+                entry.message = message
+                self.conflated += 1
+                return
+
+        while len(self._queue) >= self.maxsize and not self._closing:
+            if self.policy is Overflow.BLOCK:
+                assert self._not_full is not None
+                self._not_full.clear()
+                self.blocked += 1
+                started = time.monotonic()
+                await self._not_full.wait()
+                self.blocked_time += time.monotonic() - started
+            else:
+                self._forget(self._queue.popleft())
+                self.dropped += 1
+
+        entry = _Entry(key, message)
+        self._queue.append(entry)
+        if self.policy is Overflow.CONFLATE and key is not None:
+            self._pending[key] = entry
+        if len(self._queue) > self.max_depth:
+            self.max_depth = len(self._queue)
+        if self._not_empty is not None:
+            self._not_empty.set()
+
+    def _forget(self, entry: _Entry):
+        if entry.key is not None and self._pending.get(entry.key) is entry:
+            del self._pending[entry.key]
+
+    # ——— Tuketici ———
+    async def _run(self):
+        assert self._not_empty is not None and self._not_full is not None
+        while True:
+            if not self._queue:
+                if self._closing:
+                    return
+                self._not_empty.clear()
+                await self._not_empty.wait()
+                continue
+            entry = self._queue.popleft()
+            self._forget(entry)
+            self._not_full.set()
+            await self._dispatch(entry.key, entry.message)
+
+    async def _dispatch(self, key: Optional[Hashable], message: WSMessage):
+        import asyncio
+        assert self._inflight is not None and self._loop is not None
+        self.dispatched += 1
+        for handler in list(self._handlers):
+            if asyncio.iscoroutinefunction(handler):
+                try:
+                    await handler(message)
+                except Exception:
+                    self._handler_failed(handler)
+                continue
+            await self._inflight.acquire()
+            # Anahtarsiz mesajlar ilk seritte, sirayla calisir
+            lane = self._lanes[hash(key) % len(self._lanes) if key is not None else 0]
+            lane.submit(self._call, handler, message).add_done_callback(self._release)
+
+    def _release(self, _future: Any):
+        assert self._loop is not None and self._inflight is not None
+        try:
+            self._loop.call_soon_threadsafe(self._inflight.release)
+        except RuntimeError:
+            pass  # loop kapandi
+
+    def _call(self, handler: Callable[[WSMessage], Any], message: WSMessage):
+        try:
+            handler(message)
+        except Exception:
+            self._handler_failed(handler)
+
+    def _handler_failed(self, handler: Callable[..., Any]):
+        with self._errors_lock:
+            self.handler_errors += 1
+        logger.exception("WS handler hatasi: %r", handler)
+
+    # ——— Istatistik ———
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth":          len(self._queue),
+            "max_depth":      self.max_depth,
+            "maxsize":        self.maxsize,
+            "policy":         self.policy.value,
+            "received":       self.received,
+            "dispatched":     self.dispatched,
+            "dropped":        self.dropped,
+            "conflated":      self.conflated,
+            "blocked":        self.blocked,
+            "blocked_time":   self.blocked_time,
+            "handler_errors": self.handler_errors,
+        }
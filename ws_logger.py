@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 # ws_logger.py
 
-import sys, json
+import sys
 from datetime import datetime
 from rich.console import Console
 from rich.panel import Panel
 
+from codec import default_codec
+
 console = Console()
 
 def main():
@@ -15,12 +17,12 @@ def main():
         if not raw:
             continue
         try:
-            data = json.loads(raw)
+            data = default_codec.loads(raw)
             ts = datetime.now().strftime("%H:%M:%S")
             title = f"[bold green]📩 {ts}[/bold green]"
-            pretty = json.dumps(data, indent=2, ensure_ascii=False)
+            pretty = default_codec.dumps_pretty(data)
             console.print(Panel.fit(pretty, title=title, border_style="green"))
-        except json.JSONDecodeError:
+        except ValueError:
             console.print(f"[red]⚠ JSON parse hatası[/red]: {raw}")
 
 if __name__ == "__main__":